@@ -1,26 +1,70 @@
+import argparse
+import os
+import sys
 from flask import Flask
 from flask_cors import CORS
 from config import Config
+from database import get_pool_stats
+from database_async import get_async_pool_stats
+from utils.passwords import get_password_pool_stats
+from utils.container_logs import get_log_writer_stats
 from routes import register_blueprints
+from commands import register_commands
+from utils.codes import init_codes
+from utils.json_provider import init_json_provider
+from utils.compression import init_compression
 
 app = Flask(__name__)
 app.config.from_object(Config)
+init_json_provider(app)
+init_compression(app)
 app.url_map.strict_slashes = False
 CORS(app)
 
 # Blueprint 등록
 register_blueprints(app)
 
+# CLI 명령어 등록
+register_commands(app)
+
+# 공통코드 사전 적재
+init_codes(app)
+
 # 헬스체크
 @app.route('/api/health', methods=['GET'])
 def health_check():
     return {'status': 'ok', 'message': 'API 서버가 정상 작동 중입니다'}
 
+# DB 커넥션 풀 상태 (모니터링용)
+@app.route('/api/health/db', methods=['GET'])
+def db_pool_stats():
+    return {'status': 'ok', 'pool': get_pool_stats(), 'async_pool': get_async_pool_stats()}
+
+# 비밀번호 해시 워커 풀 상태 (모니터링용)
+@app.route('/api/health/passwords', methods=['GET'])
+def password_pool_stats():
+    return {'status': 'ok', 'pool': get_password_pool_stats()}
+
+# 컨테이너 이력 기록 상태 (모니터링용, outbox / queue 모드의 적체 확인)
+@app.route('/api/health/logs', methods=['GET'])
+def container_log_stats():
+    return {'status': 'ok', 'writer': get_log_writer_stats()}
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--mode', choices=['dev', 'prod'], default=os.environ.get('APP_MODE', Config.SERVER_MODE))
+    args = parser.parse_args()
+
     print("=" * 50)
-    print("🚀 Flask API 서버 시작")
+    print(f"🚀 Flask API 서버 시작 ({args.mode})")
     print("=" * 50)
-    print("📍 서버 주소: http://0.0.0.0:3001")
+    print(f"📍 서버 주소: http://{Config.SERVER_HOST}:{Config.SERVER_PORT}")
     print("=" * 50)
     
-    app.run(host='0.0.0.0', port=3001, debug=True)
\ No newline at end of file
+    if args.mode == 'prod':
+        # gunicorn으로 프로세스 교체 (PM2는 같은 PID로 계속 관리)
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        os.chdir(base_dir)
+        os.execvp(sys.executable, [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'])
+    
+    app.run(host=Config.SERVER_HOST, port=Config.SERVER_PORT, debug=True)
\ No newline at end of file
@@ -0,0 +1,82 @@
+import click
+from database import get_db
+from utils.container_logs import flush_outbox
+from utils.log_partitions import ensure_partitions, rollup_recent, archive_partitions
+from utils.container_tree import prune_tombstones
+
+# 관리용 CLI 명령어
+# 사용법: flask --app App <명령어>
+
+
+def register_commands(app):
+
+    # 컨테이너 계층 경로(path) 백필 / 재계산
+    @app.cli.command('rebuild-container-paths')
+    def rebuild_container_paths():
+        with get_db() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT rebuild_container_paths()")
+            updated_count = cur.fetchone()[0]
+            conn.commit()
+
+        click.echo(f'컨테이너 경로 재계산 완료: {updated_count}건 갱신')
+
+    # 집별 집계(member_count, container_count) 정합성 점검 및 복구
+    @app.cli.command('reconcile-house-counters')
+    def reconcile_house_counters():
+        with get_db() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT reconcile_house_counters()")
+            fixed_count = cur.fetchone()[0]
+            conn.commit()
+
+        click.echo(f'집계 정합성 점검 완료: {fixed_count}개 집 보정')
+
+    # 컨테이너 하위 항목 수(child_count) 정합성 점검 및 복구
+    @app.cli.command('reconcile-child-counts')
+    def reconcile_child_counts():
+        with get_db() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT reconcile_container_child_counts()")
+            fixed_count = cur.fetchone()[0]
+            conn.commit()
+
+        click.echo(f'하위 항목 수 정합성 점검 완료: {fixed_count}개 컨테이너 보정')
+
+    # container_log_outbox에 쌓인 이력을 container_logs로 옮김 (outbox 모드, cron 등으로 보조 실행 가능)
+    @app.cli.command('flush-container-logs')
+    def flush_container_logs():
+        total = 0
+        while True:
+            moved = flush_outbox()
+            total += moved
+            if moved == 0:
+                break
+
+        click.echo(f'컨테이너 이력 기록 완료: {total}건')
+
+    # 이력 월별 파티션 미리 생성 + 최근 일간 집계 (cron 매일)
+    @app.cli.command('maintain-container-logs')
+    def maintain_container_logs():
+        created_count = ensure_partitions()
+        rolled_count = rollup_recent()
+
+        click.echo(f'이력 파티션 점검 완료: 파티션 {created_count}개 생성, 일간 집계 {rolled_count}행')
+
+    # 보관 기간이 지난 이력 파티션을 압축 파일로 내보낸 뒤 분리/삭제
+    @app.cli.command('archive-container-logs')
+    @click.option('--months', type=int, default=None, help='보관 개월 수 (기본: CONTAINER_LOG_RETENTION_MONTHS)')
+    def archive_container_logs(months):
+        archived = archive_partitions(retention_months=months)
+
+        for name in archived:
+            click.echo(f'아카이브: {name}')
+        click.echo(f'이력 아카이브 완료: {len(archived)}개 파티션')
+
+    # 보관 기간이 지난 컨테이너 삭제 기록 정리 (트리 변경분 조회용, cron 매일)
+    @app.cli.command('prune-container-tombstones')
+    @click.option('--days', type=int, default=None, help='보관 일수 (기본: TREE_SYNC_TOMBSTONE_DAYS)')
+    def prune_container_tombstones(days):
+        deleted_count = prune_tombstones(days=days)
+
+        click.echo(f'삭제 기록 정리 완료: {deleted_count}건')
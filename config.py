@@ -1,9 +1,113 @@
 class Config:
     SECRET_KEY = 'your-secret-key-change-this'
+    SYSTEM_ADMIN_USER_ID = '0000000000'
     
     # Database
     DB_HOST = 'localhost'
     DB_PORT = 5432
     DB_NAME = 'postgres'
     DB_USER = 'postgres'
-    DB_PASSWORD = '(whdtjd12?)'
\ No newline at end of file
+    DB_PASSWORD = '(whdtjd12?)'
+
+    # Database Connection Pool
+    DB_POOL_MIN_SIZE = 1
+    DB_POOL_MAX_SIZE = 10
+    DB_POOL_ACQUIRE_TIMEOUT = 5.0     # 초
+    DB_POOL_MAX_LIFETIME = 1800.0     # 초 (30분)
+    DB_POOL_MAX_IDLE = 300.0          # 초 (5분)
+    DB_POOL_HEALTH_CHECK = True
+    DB_POOL_HEALTH_CHECK_AFTER = 10.0  # 초 (이 시간 이상 유휴였던 커넥션만 검사)
+
+    # 집 구성원 권한 캐시
+    MEMBERSHIP_CACHE_TTL = 30         # 초 (0이면 캐시 사용 안 함)
+                                      # 무효화는 프로세스 단위라 다른 워커의 조회 API는 최대 이 시간 동안 이전 권한 사용
+                                      # (변경 API는 캐시를 쓰지 않음)
+    MEMBERSHIP_CACHE_MAX_SIZE = 10000
+
+    # 사용자 표시 이름 캐시 (응답의 owner_name / creator_name 등)
+    USER_NAME_CACHE_TTL = 300         # 초 (0이면 캐시 사용 안 함)
+    USER_NAME_CACHE_MAX_SIZE = 10000
+
+    # 컨테이너 검색
+    SEARCH_SIMILARITY_THRESHOLD = 0.3       # 이름 전체 유사도 (오타 허용)
+    SEARCH_WORD_SIMILARITY_THRESHOLD = 0.5  # 이름 일부(단어) 유사도
+    SEARCH_MAX_LIMIT = 100
+
+    # 컨테이너 일괄 등록
+    BULK_IMPORT_MAX_ROWS = 50000
+    BULK_INSERT_PAGE_SIZE = 1000
+
+    # 컨테이너 이동
+    MOVE_LOG_DESCENDANTS = True       # 집 간 이동 시 하위 항목마다 이동 로그 기록 (한 문장으로 일괄 INSERT)
+
+    # 컨테이너 일괄 수정 / 이동
+    BATCH_UPDATE_MAX_OPERATIONS = 500
+
+    # 집 전체 트리 스냅샷 / 변경분 (utils/container_tree.py)
+    TREE_SYNC_MAX_CHANGES = 5000      # 변경분이 이보다 많으면 스냅샷을 다시 받도록 reset 응답
+    TREE_SYNC_TOMBSTONE_DAYS = 30     # 삭제 기록 보관 일수 (이보다 오래된 토큰은 reset)
+
+    # 컨테이너 이력 기록 (utils/container_logs.py)
+    CONTAINER_LOG_MODE = 'sync'            # 'sync' | 'outbox' | 'queue'
+    CONTAINER_LOG_BATCH_SIZE = 1000        # 한 번에 기록할 최대 행 수
+    CONTAINER_LOG_FLUSH_INTERVAL = 1.0     # 초 (백그라운드 기록 주기)
+    CONTAINER_LOG_QUEUE_MAX_SIZE = 100000  # queue 모드 메모리 큐 최대 행 수 (가득 차면 요청이 대기)
+
+    # 컨테이너 이력 파티션 / 보관 (utils/log_partitions.py)
+    CONTAINER_LOG_PARTITION_MONTHS_AHEAD = 3        # 미리 만들어 둘 월별 파티션 수
+    CONTAINER_LOG_ROLLUP_DAYS = 3                   # 매일 다시 집계할 최근 일수 (늦게 기록된 이력 반영)
+    CONTAINER_LOG_RETENTION_MONTHS = 0              # 보관 개월 수 (0이면 아카이브하지 않음)
+    CONTAINER_LOG_ARCHIVE_DIR = 'archive/container_logs'
+
+    # 집 전체 내보내기
+    EXPORT_FETCH_SIZE = 2000          # 서버 측 커서에서 한 번에 가져올 행 수 (= 응답 청크 크기)
+
+    # 공통코드 사전
+    CODE_NOTIFY_ENABLED = False       # True면 com_code_d 변경 시 LISTEN/NOTIFY로 즉시 재적재
+    CODE_MISS_RELOAD_INTERVAL = 60    # 초 (사전에 없는 코드를 만났을 때 재적재 최소 간격)
+
+    # 비밀번호 해시 (bcrypt)
+    BCRYPT_ROUNDS = 12                # 변경 시 기존 사용자는 다음 로그인 때 자동으로 다시 해시
+    PASSWORD_HASH_WORKERS = 2         # 해시 전용 스레드 수 (CPU 코어 수 이하 권장)
+    PASSWORD_HASH_MAX_QUEUE = 8       # 대기 가능한 작업 수 (초과 시 429)
+    PASSWORD_HASH_QUEUE_TIMEOUT = 0.5  # 초 (대기열 자리를 기다리는 최대 시간)
+
+    # JWT
+    # 키 교체: 새 키를 JWT_SIGNING_KEYS에 추가하고 JWT_ACTIVE_KID를 바꾼 뒤,
+    #          기존 키는 그 키로 발급된 토큰이 모두 만료될 때까지 남겨둠
+    JWT_SIGNING_KEYS = {'default': SECRET_KEY}
+    JWT_ACTIVE_KID = 'default'
+    JWT_ACCESS_TOKEN_EXPIRES = 60 * 60 * 24         # 초 (refresh 토큰 사용 시 15분 정도로 줄이는 것을 권장)
+    JWT_REFRESH_TOKEN_ENABLED = False
+    JWT_REFRESH_TOKEN_EXPIRES = 60 * 60 * 24 * 14   # 초
+    JWT_CACHE_MAX_SIZE = 10000        # 검증된 토큰 캐시 크기 (0이면 캐시 사용 안 함)
+
+    # 서버 실행 모드 (python3 App.py --mode dev|prod, 환경변수 APP_MODE로도 지정 가능)
+    SERVER_MODE = 'dev'               # dev: Flask 개발 서버, prod: gunicorn 멀티 워커
+    SERVER_HOST = '0.0.0.0'
+    SERVER_PORT = 3001
+    SERVER_WORKERS = 0                # 0이면 CPU 코어 수 * 2 + 1 (DB 커넥션 상한으로 워커당 최소 커넥션을 줄 수 없으면 자동으로 줄임)
+    SERVER_THREADS = 4                # 워커당 요청 처리 스레드 수
+    SERVER_DB_CONNECTIONS_TOTAL = 40  # 전체 워커의 DB 커넥션 합계 상한 (동기 + 비동기 풀, PostgreSQL max_connections보다 작게)
+    SERVER_TIMEOUT = 60               # 초 (응답 없는 워커 재시작)
+    SERVER_GRACEFUL_TIMEOUT = 30      # 초 (재시작/종료 시 처리 중인 요청 대기)
+    SERVER_MAX_REQUESTS = 5000        # 워커당 처리 요청 수 도달 시 교체
+
+    # 비동기 조회 (psycopg 3 비동기 풀, 컨테이너 조회 API 전용)
+    ASYNC_READS = False               # True면 컨테이너 목록/상세/검색/히스토리를 비동기 경로로 조회
+    ASYNC_DB_POOL_MIN_SIZE = 1
+    ASYNC_DB_POOL_MAX_SIZE = 20       # 요청 안의 독립 쿼리들이 동시에 커넥션을 사용하므로 동기 풀보다 크게
+                                      # (prod 모드에서는 워커당 SERVER_DB_CONNECTIONS_TOTAL 몫의 절반 이내로 줄어듦)
+
+    # JSON 응답 직렬화
+    JSON_PROVIDER = 'orjson'          # orjson / default (orjson 미설치 시 자동으로 default)
+    JSON_DATETIME_FORMAT = 'http'     # http: 'Wed, 01 Jan 2025 00:00:00 GMT' (기존 형식) / iso: ISO 8601
+
+    # HTTP 캐시 (집 단위 ETag = 집 버전 + 사용자 이름/공통코드 버전, 변경 없으면 304)
+    HTTP_CACHE_ENABLED = True
+
+    # 응답 압축 (Accept-Encoding: br / gzip)
+    COMPRESS_ENABLED = True
+    COMPRESS_MIN_SIZE = 1024          # 바이트 (이보다 작은 응답은 압축하지 않음)
+    COMPRESS_GZIP_LEVEL = 6
+    COMPRESS_BROTLI_QUALITY = 5
@@ -1,8 +1,297 @@
+import threading
+import time
+from contextlib import contextmanager
+
 import psycopg2
+import psycopg2.extensions
 from psycopg2.extras import RealDictCursor
 from config import Config
 
+
+class PoolTimeoutError(Exception):
+    """커넥션 풀에서 제한 시간 내에 커넥션을 얻지 못했을 때"""
+    pass
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """풀에서 관리되는 커넥션 (생성/반납 시각 기록, 커밋 후 실행할 작업 등록)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool_created_at = time.monotonic()
+        self.pool_released_at = self.pool_created_at
+        self._after_commit = []
+
+    def on_commit(self, callback):
+        """현재 트랜잭션이 커밋된 뒤 실행할 함수 등록 (롤백되면 버려짐)"""
+        self._after_commit.append(callback)
+
+    def commit(self):
+        super().commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    def rollback(self):
+        self._after_commit = []
+        super().rollback()
+
+
+class ConnectionPool:
+    """
+    스레드 안전한 PostgreSQL 커넥션 풀
+
+    - min_size / max_size : 유지할 최소 커넥션 수 / 최대 커넥션 수
+    - acquire_timeout      : 커넥션을 기다리는 최대 시간 (초)
+    - max_lifetime         : 커넥션 최대 수명 (초, 초과 시 재생성)
+    - max_idle             : 유휴 상태 최대 시간 (초, 초과 시 재생성)
+    - health_check         : 대여 시 SELECT 1 로 상태 확인 여부
+    - health_check_after   : 이 시간(초) 이상 유휴였던 커넥션만 상태 확인
+    """
+
+    def __init__(self, dsn_kwargs, min_size=1, max_size=10, acquire_timeout=5.0,
+                 max_lifetime=1800.0, max_idle=300.0, health_check=True,
+                 health_check_after=10.0):
+        self.dsn_kwargs = dsn_kwargs
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.health_check = health_check
+        self.health_check_after = health_check_after
+
+        self._idle = []
+        self._in_use = set()
+        self._waiting = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+        # 통계
+        self._acquire_count = 0
+        self._timeout_count = 0
+        self._recycled_count = 0
+        self._acquire_time_total = 0.0
+        self._acquire_time_max = 0.0
+
+        for _ in range(min_size):
+            self._idle.append(self._connect())
+
+    def _connect(self):
+        return psycopg2.connect(connection_factory=PooledConnection, **self.dsn_kwargs)
+
+    def _is_expired(self, conn, now):
+        if conn.closed:
+            return True
+        if self.max_lifetime and now - conn.pool_created_at > self.max_lifetime:
+            return True
+        if self.max_idle and now - conn.pool_released_at > self.max_idle:
+            return True
+        return False
+
+    def _is_healthy(self, conn, now):
+        if not self.health_check:
+            return True
+        # 방금 반납된 커넥션은 확인 생략 (대여마다 왕복이 생기지 않도록)
+        if now - conn.pool_released_at < self.health_check_after:
+            return True
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def getconn(self):
+        started = time.monotonic()
+        deadline = started + self.acquire_timeout
+
+        with self._cond:
+            if self._closed:
+                raise PoolTimeoutError('커넥션 풀이 종료되었습니다')
+
+            self._waiting += 1
+            try:
+                while not self._idle and len(self._in_use) >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeout_count += 1
+                        raise PoolTimeoutError('DB 커넥션을 얻지 못했습니다 (대기 시간 초과)')
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+
+            conn = self._idle.pop() if self._idle else None
+            # 자리 예약 (커넥션 생성/검사 중 다른 스레드가 max_size를 넘지 않도록)
+            placeholder = object()
+            self._in_use.add(placeholder)
+
+        try:
+            if conn is not None:
+                now = time.monotonic()
+                if self._is_expired(conn, now) or not self._is_healthy(conn, now):
+                    self._discard(conn)
+                    with self._cond:
+                        self._recycled_count += 1
+                    conn = None
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._in_use.discard(placeholder)
+                self._cond.notify()
+            raise
+
+        elapsed = time.monotonic() - started
+        with self._cond:
+            self._in_use.discard(placeholder)
+            self._in_use.add(conn)
+            self._acquire_count += 1
+            self._acquire_time_total += elapsed
+            self._acquire_time_max = max(self._acquire_time_max, elapsed)
+
+        return conn
+
+    def putconn(self, conn):
+        # 진행 중인 트랜잭션 정리 후 반납
+        conn._after_commit = []
+        try:
+            if not conn.closed and conn.status != psycopg2.extensions.STATUS_READY:
+                conn.rollback()
+        except psycopg2.Error:
+            self._discard(conn)
+
+        with self._cond:
+            self._in_use.discard(conn)
+            if self._closed or conn.closed:
+                self._discard(conn)
+            else:
+                conn.pool_released_at = time.monotonic()
+                self._idle.append(conn)
+            self._cond.notify()
+
+    def closeall(self):
+        with self._cond:
+            self._closed = True
+            for conn in self._idle:
+                self._discard(conn)
+            self._idle = []
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'in_use': len(self._in_use),
+                'idle': len(self._idle),
+                'waiting': self._waiting,
+                'acquire_count': self._acquire_count,
+                'timeout_count': self._timeout_count,
+                'recycled_count': self._recycled_count,
+                'acquire_ms_avg': round(self._acquire_time_total / self._acquire_count * 1000, 3)
+                                  if self._acquire_count else 0.0,
+                'acquire_ms_max': round(self._acquire_time_max * 1000, 3)
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    dsn_kwargs={
+                        'host': Config.DB_HOST,
+                        'port': Config.DB_PORT,
+                        'database': Config.DB_NAME,
+                        'user': Config.DB_USER,
+                        'password': Config.DB_PASSWORD
+                    },
+                    min_size=Config.DB_POOL_MIN_SIZE,
+                    max_size=Config.DB_POOL_MAX_SIZE,
+                    acquire_timeout=Config.DB_POOL_ACQUIRE_TIMEOUT,
+                    max_lifetime=Config.DB_POOL_MAX_LIFETIME,
+                    max_idle=Config.DB_POOL_MAX_IDLE,
+                    health_check=Config.DB_POOL_HEALTH_CHECK,
+                    health_check_after=Config.DB_POOL_HEALTH_CHECK_AFTER
+                )
+    return _pool
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+def get_pool_stats():
+    if _pool is None:
+        return {'initialized': False}
+    return dict(_pool.stats(), initialized=True)
+
+
+@contextmanager
+def get_db():
+    """
+    풀에서 커넥션을 빌려오는 컨텍스트 매니저
+
+    with get_db() as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        ...
+        conn.commit()
+
+    블록을 벗어나면 커밋되지 않은 트랜잭션은 롤백되고 커넥션은 풀로 반납됩니다.
+    """
+    pool = get_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+    except Exception:
+        try:
+            conn.rollback()
+        except psycopg2.Error:
+            pass
+        raise
+    finally:
+        pool.putconn(conn)
+
+
+def fetch_dicts(cur):
+    """
+    일반 커서(튜플 행)의 결과를 dict 목록으로 변환
+
+    RealDictCursor는 행마다 RealDictRow 객체를 컬럼 단위로 채워 만들기 때문에,
+    대량 목록 조회는 튜플로 받은 뒤 dict(zip())으로 한 번에 만드는 편이 빠릅니다.
+    """
+    columns = [column.name for column in cur.description]
+    return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+
+def fetch_dict(cur):
+    """일반 커서의 한 행을 dict로 변환 (없으면 None)"""
+    row = cur.fetchone()
+    if row is None:
+        return None
+    return dict(zip([column.name for column in cur.description], row))
+
+
 def get_db_connection():
+    # 풀을 거치지 않는 단독 커넥션 (스크립트/관리 작업용)
     conn = psycopg2.connect(
         host=Config.DB_HOST,
         port=Config.DB_PORT,
@@ -10,4 +299,4 @@ def get_db_connection():
         user=Config.DB_USER,
         password=Config.DB_PASSWORD
     )
-    return conn
\ No newline at end of file
+    return conn
@@ -0,0 +1,122 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from config import Config
+
+# 비동기(asyncio) DB 접근 (psycopg 3 + psycopg_pool)
+#
+# 전용 이벤트 루프 스레드 하나에서 비동기 커넥션 풀을 운영하고,
+# 요청 스레드는 run_async()로 코루틴을 넘겨 결과를 기다립니다.
+# 한 요청 안의 독립적인 쿼리들은 asyncio.gather로 서로 다른 커넥션에서 동시에 실행됩니다.
+# (Config.ASYNC_READS = True 일 때만 사용되며, 그때만 psycopg 3 패키지가 필요합니다)
+
+_loop = None
+_loop_thread = None
+_pool = None
+_start_lock = threading.Lock()
+
+
+def _start():
+    global _loop, _loop_thread, _pool
+
+    with _start_lock:
+        if _loop is not None:
+            return
+
+        from psycopg_pool import AsyncConnectionPool
+
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, name='async-db', daemon=True)
+        thread.start()
+
+        async def open_pool():
+            pool = AsyncConnectionPool(
+                conninfo='',
+                kwargs={
+                    'host': Config.DB_HOST,
+                    'port': Config.DB_PORT,
+                    'dbname': Config.DB_NAME,
+                    'user': Config.DB_USER,
+                    'password': Config.DB_PASSWORD
+                },
+                min_size=Config.ASYNC_DB_POOL_MIN_SIZE,
+                max_size=Config.ASYNC_DB_POOL_MAX_SIZE,
+                timeout=Config.DB_POOL_ACQUIRE_TIMEOUT,
+                max_lifetime=Config.DB_POOL_MAX_LIFETIME,
+                max_idle=Config.DB_POOL_MAX_IDLE,
+                open=False
+            )
+            await pool.open()
+            return pool
+
+        _pool = asyncio.run_coroutine_threadsafe(open_pool(), loop).result()
+        _loop, _loop_thread = loop, thread
+
+
+def run_async(coro):
+    """요청 스레드에서 코루틴을 DB 이벤트 루프에 넘겨 실행하고 결과 반환"""
+    if _loop is None:
+        _start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+
+@asynccontextmanager
+async def async_db():
+    """
+    비동기 풀에서 커넥션을 빌려오는 컨텍스트 매니저 (이벤트 루프 안에서 사용)
+
+    async with async_db() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        await cur.execute(...)
+    """
+    async with _pool.connection() as conn:
+        yield conn
+
+
+async def fetch_all(sql, params=None, setup=()):
+    """
+    쿼리 결과 전체 조회
+
+    setup: 같은 트랜잭션에서 먼저 실행할 (sql, params) 목록 (예: set_config)
+    psycopg 3는 파라미터가 있는 다중 문장을 한 번에 실행할 수 없으므로 나누어 실행합니다.
+    """
+    from psycopg.rows import dict_row
+
+    async with async_db() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        for setup_sql, setup_params in setup:
+            await cur.execute(setup_sql, setup_params)
+        await cur.execute(sql, params)
+        return await cur.fetchall()
+
+
+async def fetch_one(sql, params=None):
+    from psycopg.rows import dict_row
+
+    async with async_db() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        await cur.execute(sql, params)
+        return await cur.fetchone()
+
+
+async def gather(*aws):
+    """독립적인 쿼리 코루틴들을 동시에 실행 (run_async(gather(fetch_one(...), fetch_all(...))))"""
+    return await asyncio.gather(*aws)
+
+
+def close_async_pool():
+    global _loop, _loop_thread, _pool
+
+    with _start_lock:
+        if _loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(_pool.close(), _loop).result()
+        _loop.call_soon_threadsafe(_loop.stop)
+        _loop_thread.join()
+        _loop, _loop_thread, _pool = None, None, None
+
+
+def get_async_pool_stats():
+    if _pool is None:
+        return {'initialized': False}
+    return dict(_pool.get_stats(), initialized=True)
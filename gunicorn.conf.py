@@ -0,0 +1,92 @@
+# ============================================
+# 운영 서버 설정 (gunicorn)
+# ============================================
+# 실행: python3 App.py --mode prod  (또는 gunicorn -c gunicorn.conf.py wsgi:app)
+# 무중단 재시작: 마스터 프로세스에 SIGHUP (새 워커를 띄운 뒤 기존 워커를 정상 종료)
+# ============================================
+import multiprocessing
+from config import Config
+
+bind = f'{Config.SERVER_HOST}:{Config.SERVER_PORT}'
+
+# 워커 프로세스 x 스레드 (gthread)
+workers = Config.SERVER_WORKERS or multiprocessing.cpu_count() * 2 + 1
+
+# 워커당 최소 커넥션 수 (동기 풀 1 + ASYNC_READS면 비동기 풀 1)
+# SERVER_DB_CONNECTIONS_TOTAL을 넘지 않도록 워커 수를 줄임 (when_ready에서 경고)
+_MIN_CONNECTIONS_PER_WORKER = 2 if Config.ASYNC_READS else 1
+_requested_workers = workers
+workers = max(1, min(workers, Config.SERVER_DB_CONNECTIONS_TOTAL // _MIN_CONNECTIONS_PER_WORKER))
+worker_class = 'gthread'
+threads = Config.SERVER_THREADS
+
+timeout = Config.SERVER_TIMEOUT
+graceful_timeout = Config.SERVER_GRACEFUL_TIMEOUT
+keepalive = 5
+
+# 메모리 누수 대비 워커 주기적 교체 (동시에 교체되지 않도록 지터)
+max_requests = Config.SERVER_MAX_REQUESTS
+max_requests_jitter = Config.SERVER_MAX_REQUESTS // 10
+
+# 앱(커넥션 풀, 공통코드 사전, 백그라운드 스레드)은 워커마다 fork 이후에 생성
+# SIGHUP 시 코드 변경도 함께 반영됨
+preload_app = False
+
+accesslog = '-'
+errorlog = '-'
+
+
+def _pool_sizes_per_worker():
+    """
+    워커당 (동기 풀, 비동기 풀) 최대 커넥션 수
+
+    워커 전체 DB 커넥션 합이 SERVER_DB_CONNECTIONS_TOTAL을 넘지 않도록 워커 몫을 나누고,
+    ASYNC_READS면 그 안에서 비동기 풀 몫(최대 절반)을 먼저 떼고 나머지를 동기 풀에 줌
+    - 동기 풀: 요청 스레드는 동시에 커넥션을 하나만 사용하므로 스레드 수보다 클 필요 없음
+    - 비동기 풀: 상세 조회 한 번이 커넥션 여러 개를 동시에 쓰므로 부족하면 풀에서 대기
+    """
+    budget = max(1, Config.SERVER_DB_CONNECTIONS_TOTAL // workers)
+
+    async_size = 0
+    if Config.ASYNC_READS:
+        async_size = max(1, min(Config.ASYNC_DB_POOL_MAX_SIZE, budget // 2))
+
+    sync_size = max(1, min(threads, Config.DB_POOL_MAX_SIZE, budget - async_size))
+    return sync_size, async_size
+
+
+def when_ready(server):
+    if workers < _requested_workers:
+        server.log.warning(
+            '워커 수를 %s -> %s로 줄임 (SERVER_DB_CONNECTIONS_TOTAL=%s, 워커당 최소 커넥션 %s)',
+            _requested_workers, workers, Config.SERVER_DB_CONNECTIONS_TOTAL, _MIN_CONNECTIONS_PER_WORKER
+        )
+    if workers * _MIN_CONNECTIONS_PER_WORKER > Config.SERVER_DB_CONNECTIONS_TOTAL:
+        server.log.warning(
+            'SERVER_DB_CONNECTIONS_TOTAL=%s가 워커 1개의 최소 커넥션 %s보다 작아 상한을 넘습니다',
+            Config.SERVER_DB_CONNECTIONS_TOTAL, _MIN_CONNECTIONS_PER_WORKER
+        )
+
+    sync_size, async_size = _pool_sizes_per_worker()
+    server.log.info(
+        'workers=%s threads=%s db_pool_max_size(워커당)=%s async_db_pool_max_size(워커당)=%s',
+        workers, threads, sync_size, async_size
+    )
+
+
+def post_fork(server, worker):
+    sync_size, async_size = _pool_sizes_per_worker()
+    Config.DB_POOL_MAX_SIZE = sync_size
+    Config.DB_POOL_MIN_SIZE = min(Config.DB_POOL_MIN_SIZE, sync_size)
+    if async_size:
+        Config.ASYNC_DB_POOL_MAX_SIZE = async_size
+        Config.ASYNC_DB_POOL_MIN_SIZE = min(Config.ASYNC_DB_POOL_MIN_SIZE, async_size)
+
+
+def worker_exit(server, worker):
+    from database import close_pool
+    from database_async import close_async_pool
+    from utils.container_logs import flush_pending
+    flush_pending()  # queue 모드에서 아직 기록하지 못한 이력 (풀을 닫기 전에)
+    close_pool()
+    close_async_pool()
@@ -1,7 +1,7 @@
 from flask import request, jsonify
 from functools import wraps
 import jwt
-from config import Config
+from utils.tokens import verify_access_token
 
 def token_required(f):
     @wraps(f)
@@ -15,8 +15,7 @@ def token_required(f):
             if token.startswith('Bearer '):
                 token = token[7:]
             
-            data = jwt.decode(token, Config.SECRET_KEY, algorithms=['HS256'])
-            current_user_id = data['user_id']
+            current_user_id = verify_access_token(token)
             
         except jwt.ExpiredSignatureError:
             return jsonify({'error': '토큰이 만료되었습니다'}), 401
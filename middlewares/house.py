@@ -0,0 +1,94 @@
+from flask import jsonify, request
+from functools import wraps
+import threading
+import time
+from database import get_db
+from config import Config
+
+# (house_id, user_id) -> (role_cd, 만료 시각)
+# 무효화(invalidate_membership)는 해당 프로세스에만 적용되므로, 여러 워커로 실행하면
+# 다른 워커에서는 추방/탈퇴된 구성원이 MEMBERSHIP_CACHE_TTL 동안 조회 API에 접근할 수 있습니다.
+# 변경 요청(POST/PUT/PATCH/DELETE)은 캐시를 쓰지 않고 항상 DB로 확인합니다.
+MUTATING_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+_membership_cache = {}
+_cache_lock = threading.Lock()
+
+
+def get_member_role(house_id, user_id, use_cache=True):
+    """
+    집 구성원의 권한 코드 조회 (구성원이 아니면 None)
+
+    구성원인 경우에만 짧은 TTL 동안 캐시합니다.
+    구성원이 아닌 결과는 캐시하지 않으므로 초대 수락 직후에도 바로 접근할 수 있습니다.
+    use_cache=False면 DB에서 다시 확인하고 그 결과로 캐시를 갱신합니다.
+    """
+    key = (house_id, user_id)
+    now = time.monotonic()
+
+    if use_cache and Config.MEMBERSHIP_CACHE_TTL > 0:
+        with _cache_lock:
+            cached = _membership_cache.get(key)
+            if cached and cached[1] > now:
+                return cached[0]
+
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT role_cd FROM house_members WHERE house_id = %s AND user_id = %s",
+            (house_id, user_id)
+        )
+        row = cur.fetchone()
+
+    if not row:
+        with _cache_lock:
+            _membership_cache.pop(key, None)
+        return None
+
+    role_cd = row[0]
+    if Config.MEMBERSHIP_CACHE_TTL > 0:
+        with _cache_lock:
+            # 최대 크기 초과 시 가장 오래된 항목부터 제거
+            while len(_membership_cache) >= Config.MEMBERSHIP_CACHE_MAX_SIZE:
+                _membership_cache.pop(next(iter(_membership_cache)))
+            _membership_cache[key] = (role_cd, now + Config.MEMBERSHIP_CACHE_TTL)
+
+    return role_cd
+
+
+def invalidate_membership(house_id, user_id=None):
+    """구성원 변경(가입/탈퇴/추방/집 삭제) 시 캐시 무효화 (user_id가 없으면 집 전체)"""
+    with _cache_lock:
+        if user_id is not None:
+            _membership_cache.pop((house_id, user_id), None)
+        else:
+            for key in [k for k in _membership_cache if k[0] == house_id]:
+                del _membership_cache[key]
+
+
+def house_member_required(error_message='접근 권한이 없습니다'):
+    """
+    집 구성원만 접근 가능한 엔드포인트 데코레이터 (token_required 다음에 사용)
+
+    URL의 house_id로 권한을 확인하고, 핸들러에 role_cd 인자로 권한 코드를 전달합니다.
+    변경 요청은 다른 워커의 무효화가 반영되지 않은 캐시를 쓰지 않도록 DB로 확인합니다.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(current_user_id, *args, **kwargs):
+            try:
+                role_cd = get_member_role(
+                    kwargs['house_id'], current_user_id,
+                    use_cache=request.method not in MUTATING_METHODS
+                )
+            except Exception as e:
+                return jsonify({'error': str(e)}), 500
+
+            if role_cd is None:
+                return jsonify({'error': error_message}), 403
+
+            return f(current_user_id, *args, role_cd=role_cd, **kwargs)
+
+        return decorated
+
+    return decorator
@@ -0,0 +1,75 @@
+from flask import request, make_response
+from functools import wraps
+from database import get_db
+from config import Config
+from utils.codes import sync_code_version
+from utils.user_names import sync_user_name_version
+
+# 집 단위 조건부 GET (ETag)
+# houses.version 은 컨테이너/구성원이 바뀔 때마다 트리거로 증가하므로,
+# 클라이언트가 가진 버전과 같으면 본 쿼리를 실행하지 않고 304를 반환합니다.
+#
+# 응답에 들어가는 사용자 이름(owner_name 등)과 코드명(type_nm)은 집 버전과 별개로 바뀌므로
+# dictionary_versions의 이름/공통코드 버전도 ETag에 함께 넣습니다.
+# 이력(container_logs)은 outbox/queue 모드에서 나중에 기록되어 버전에 잡히지 않으므로 사용하지 않습니다.
+
+
+def get_house_version(house_id):
+    """(version, changed_at, 이름 버전, 공통코드 버전) 조회 (집이 없으면 None)"""
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT
+                h.version,
+                h.changed_at,
+                (SELECT version FROM dictionary_versions WHERE name = 'users.name'),
+                (SELECT version FROM dictionary_versions WHERE name = 'com_code_d')
+            FROM houses h
+            WHERE h.id = %s
+            """,
+            (house_id,)
+        )
+        return cur.fetchone()
+
+
+def house_etag(f):
+    """
+    집 데이터 조회 엔드포인트용 조건부 GET 데코레이터 (house_member_required 다음에 사용)
+
+    ETag는 집 버전, 이름/공통코드 버전, 요청자 권한(my_role 응답 포함)으로 만들고,
+    버전 조회 이후에 바뀐 데이터가 응답에 섞여도 다음 요청에서 버전이 달라 새로 조회됩니다.
+    응답을 만들기 전에 이름/코드 캐시를 조회한 버전에 맞춥니다 (캐시 TTL 동안 옛 이름이 새 ETag로 나가지 않도록).
+    Last-Modified는 참고용으로만 보내고 If-Modified-Since로는 판단하지 않습니다
+    (초 단위라 같은 초 안의 변경을 구분할 수 없음).
+    """
+    @wraps(f)
+    def decorated(current_user_id, *args, **kwargs):
+        if not Config.HTTP_CACHE_ENABLED:
+            return f(current_user_id, *args, **kwargs)
+
+        house_id = kwargs['house_id']
+        house_version = get_house_version(house_id)
+        if house_version is None:
+            return f(current_user_id, *args, **kwargs)
+
+        version, changed_at, name_version, code_version = house_version
+        etag = f"{house_id}-{version}.{name_version}.{code_version}-{kwargs.get('role_cd', '')}"
+        last_modified = changed_at.replace(microsecond=0)
+
+        if request.if_none_match.contains_weak(etag):
+            response = make_response('', 304)
+        else:
+            sync_user_name_version(name_version)
+            sync_code_version(code_version)
+            response = make_response(f(current_user_id, *args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+        response.set_etag(etag, weak=True)
+        response.last_modified = last_modified
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+
+    return decorated
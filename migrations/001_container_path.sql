@@ -0,0 +1,91 @@
+-- ============================================
+-- 컨테이너 계층 경로(materialized path) 추가
+-- ============================================
+-- 기존 DB에 적용: psql -d postgres -f migrations/001_container_path.sql
+-- 조상/자손 조회를 재귀 CTE 대신 path 인덱스 범위 스캔으로 처리
+-- ============================================
+
+BEGIN;
+
+ALTER TABLE containers ADD COLUMN IF NOT EXISTS path TEXT;
+
+-- 계층 경로 설정 (생성 / 부모 변경 시)
+-- set_container_id 보다 나중에 실행되어야 함 (트리거는 이름순으로 실행)
+CREATE OR REPLACE FUNCTION set_container_path()
+RETURNS TRIGGER AS $$
+DECLARE
+    parent_path TEXT;
+BEGIN
+    IF NEW.up_container_id IS NULL THEN
+        NEW.path := '/' || NEW.id || '/';
+    ELSE
+        SELECT path INTO parent_path FROM containers WHERE id = NEW.up_container_id;
+        NEW.path := COALESCE(parent_path, '/') || NEW.id || '/';
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS set_container_path ON containers;
+CREATE TRIGGER set_container_path
+    BEFORE INSERT OR UPDATE OF up_container_id ON containers
+    FOR EACH ROW
+    EXECUTE FUNCTION set_container_path();
+
+-- 부모 변경 시 하위 항목 경로 일괄 변경
+CREATE OR REPLACE FUNCTION move_container_path()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE containers
+    SET path = NEW.path || substr(path, length(OLD.path) + 1)
+    WHERE path LIKE OLD.path || '%'
+      AND id <> NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS move_container_path ON containers;
+CREATE TRIGGER move_container_path
+    AFTER UPDATE OF up_container_id ON containers
+    FOR EACH ROW
+    WHEN (OLD.path IS DISTINCT FROM NEW.path)
+    EXECUTE FUNCTION move_container_path();
+
+-- 계층 경로 전체 재계산 (백필 / 정합성 복구용)
+CREATE OR REPLACE FUNCTION rebuild_container_paths()
+RETURNS INT AS $$
+DECLARE
+    updated_count INT;
+BEGIN
+    WITH RECURSIVE tree AS (
+        SELECT id, '/' || id || '/' AS path
+        FROM containers
+        WHERE up_container_id IS NULL
+
+        UNION ALL
+
+        SELECT c.id, t.path || c.id || '/'
+        FROM containers c
+        JOIN tree t ON c.up_container_id = t.id
+    )
+    UPDATE containers c
+    SET path = tree.path
+    FROM tree
+    WHERE c.id = tree.id
+      AND c.path IS DISTINCT FROM tree.path;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 기존 데이터 백필
+SELECT rebuild_container_paths();
+
+ALTER TABLE containers ALTER COLUMN path SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_containers_path ON containers(path text_pattern_ops);
+
+COMMENT ON COLUMN containers.path IS '계층 경로 (/최상위ID/.../자기ID/, 조상/자손 조회용)';
+
+COMMIT;
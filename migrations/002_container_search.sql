@@ -0,0 +1,11 @@
+-- ============================================
+-- 컨테이너 검색용 trigram 인덱스 추가
+-- ============================================
+-- 기존 DB에 적용: psql -d postgres -f migrations/002_container_search.sql
+-- ILIKE '%검색어%' 및 유사도 검색(%, <%)이 인덱스를 사용하도록 함
+-- ============================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_containers_name_trgm ON containers USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_containers_remk_trgm ON containers USING gin (remk gin_trgm_ops) WHERE remk IS NOT NULL;
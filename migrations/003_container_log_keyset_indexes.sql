@@ -0,0 +1,22 @@
+-- ============================================
+-- 컨테이너 이력 커서 페이지네이션용 복합 인덱스
+-- ============================================
+-- 기존 DB에 적용: psql -d postgres -f migrations/003_container_log_keyset_indexes.sql
+-- (created_at DESC, id DESC) 정렬과 일치하는 인덱스로 교체
+-- CONCURRENTLY 사용으로 트랜잭션 블록 없이 실행
+-- ============================================
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_container_logs_container_created
+    ON container_logs(container_id, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_container_logs_from_house_created
+    ON container_logs(from_house_id, created_at DESC, id DESC) WHERE from_house_id IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_container_logs_to_house_created
+    ON container_logs(to_house_id, created_at DESC, id DESC) WHERE to_house_id IS NOT NULL;
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_container_logs_container;
+DROP INDEX CONCURRENTLY IF EXISTS idx_container_logs_from_house;
+DROP INDEX CONCURRENTLY IF EXISTS idx_container_logs_to_house;
+
+ALTER INDEX idx_container_logs_container_created RENAME TO idx_container_logs_container;
+ALTER INDEX idx_container_logs_from_house_created RENAME TO idx_container_logs_from_house;
+ALTER INDEX idx_container_logs_to_house_created RENAME TO idx_container_logs_to_house;
@@ -0,0 +1,150 @@
+-- ============================================
+-- 집별 집계 컬럼 추가 (구성원 수 / 최상위 영역 수)
+-- ============================================
+-- 기존 DB에 적용: psql -d postgres -f migrations/004_house_counters.sql
+-- 집 목록 조회 시 전체 테이블 GROUP BY 대신 houses 컬럼을 바로 읽음
+-- ============================================
+
+BEGIN;
+
+ALTER TABLE houses ADD COLUMN IF NOT EXISTS member_count INT NOT NULL DEFAULT 0;
+ALTER TABLE houses ADD COLUMN IF NOT EXISTS container_count INT NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION update_house_member_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE houses h
+        SET member_count = h.member_count + d.cnt
+        FROM (SELECT house_id, COUNT(*) AS cnt FROM new_rows GROUP BY house_id) d
+        WHERE h.id = d.house_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE houses h
+        SET member_count = h.member_count - d.cnt
+        FROM (SELECT house_id, COUNT(*) AS cnt FROM old_rows GROUP BY house_id) d
+        WHERE h.id = d.house_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS count_house_members_insert ON house_members;
+CREATE TRIGGER count_house_members_insert
+    AFTER INSERT ON house_members
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_house_member_count();
+
+DROP TRIGGER IF EXISTS count_house_members_delete ON house_members;
+CREATE TRIGGER count_house_members_delete
+    AFTER DELETE ON house_members
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_house_member_count();
+
+CREATE OR REPLACE FUNCTION update_house_container_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE houses h
+        SET container_count = h.container_count + d.cnt
+        FROM (
+            SELECT house_id, COUNT(*) AS cnt
+            FROM new_rows
+            WHERE up_container_id IS NULL
+            GROUP BY house_id
+        ) d
+        WHERE h.id = d.house_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE houses h
+        SET container_count = h.container_count - d.cnt
+        FROM (
+            SELECT house_id, COUNT(*) AS cnt
+            FROM old_rows
+            WHERE up_container_id IS NULL
+            GROUP BY house_id
+        ) d
+        WHERE h.id = d.house_id;
+    ELSE
+        -- 최상위 여부 또는 집이 바뀐 행만 반영
+        UPDATE houses h
+        SET container_count = h.container_count + d.cnt
+        FROM (
+            SELECT house_id, SUM(delta) AS cnt
+            FROM (
+                SELECT o.house_id, -1 AS delta
+                FROM old_rows o
+                JOIN new_rows n ON n.id = o.id
+                WHERE o.up_container_id IS NULL
+                  AND (n.up_container_id IS NOT NULL OR n.house_id <> o.house_id)
+
+                UNION ALL
+
+                SELECT n.house_id, 1 AS delta
+                FROM old_rows o
+                JOIN new_rows n ON n.id = o.id
+                WHERE n.up_container_id IS NULL
+                  AND (o.up_container_id IS NOT NULL OR n.house_id <> o.house_id)
+            ) changes
+            GROUP BY house_id
+        ) d
+        WHERE h.id = d.house_id
+          AND d.cnt <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS count_house_containers_insert ON containers;
+CREATE TRIGGER count_house_containers_insert
+    AFTER INSERT ON containers
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_house_container_count();
+
+DROP TRIGGER IF EXISTS count_house_containers_update ON containers;
+CREATE TRIGGER count_house_containers_update
+    AFTER UPDATE ON containers
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_house_container_count();
+
+DROP TRIGGER IF EXISTS count_house_containers_delete ON containers;
+CREATE TRIGGER count_house_containers_delete
+    AFTER DELETE ON containers
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_house_container_count();
+
+-- 집계 재계산 (정합성 점검/복구용, 틀어진 집 수 반환)
+CREATE OR REPLACE FUNCTION reconcile_house_counters()
+RETURNS INT AS $$
+DECLARE
+    fixed_count INT;
+BEGIN
+    WITH actual AS (
+        SELECT
+            h.id,
+            (SELECT COUNT(*) FROM house_members hm WHERE hm.house_id = h.id) AS member_count,
+            (SELECT COUNT(*) FROM containers c WHERE c.house_id = h.id AND c.up_container_id IS NULL) AS container_count
+        FROM houses h
+    )
+    UPDATE houses h
+    SET member_count = a.member_count,
+        container_count = a.container_count
+    FROM actual a
+    WHERE h.id = a.id
+      AND (h.member_count <> a.member_count OR h.container_count <> a.container_count);
+
+    GET DIAGNOSTICS fixed_count = ROW_COUNT;
+    RETURN fixed_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 기존 데이터 집계
+SELECT reconcile_house_counters();
+
+COMMENT ON COLUMN houses.member_count IS '구성원 수 (트리거로 관리)';
+COMMENT ON COLUMN houses.container_count IS '최상위 영역 수 (트리거로 관리)';
+
+COMMIT;
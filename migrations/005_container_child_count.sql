@@ -0,0 +1,114 @@
+-- ============================================
+-- 컨테이너 하위 항목 수(child_count) 컬럼 추가
+-- ============================================
+-- 기존 DB에 적용: psql -d postgres -f migrations/005_container_child_count.sql
+-- 목록/상세 조회 시 행마다 실행되던 COUNT(*) 서브쿼리 제거
+-- ============================================
+
+BEGIN;
+
+ALTER TABLE containers ADD COLUMN IF NOT EXISTS child_count INT NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION update_container_child_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE containers p
+        SET child_count = p.child_count + d.cnt
+        FROM (
+            SELECT up_container_id, COUNT(*) AS cnt
+            FROM new_rows
+            WHERE up_container_id IS NOT NULL
+            GROUP BY up_container_id
+        ) d
+        WHERE p.id = d.up_container_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE containers p
+        SET child_count = p.child_count - d.cnt
+        FROM (
+            SELECT up_container_id, COUNT(*) AS cnt
+            FROM old_rows
+            WHERE up_container_id IS NOT NULL
+            GROUP BY up_container_id
+        ) d
+        WHERE p.id = d.up_container_id;
+    ELSE
+        -- 부모가 바뀐 행만 반영
+        UPDATE containers p
+        SET child_count = p.child_count + d.cnt
+        FROM (
+            SELECT parent_id, SUM(delta) AS cnt
+            FROM (
+                SELECT o.up_container_id AS parent_id, -1 AS delta
+                FROM old_rows o
+                JOIN new_rows n ON n.id = o.id
+                WHERE o.up_container_id IS NOT NULL
+                  AND o.up_container_id IS DISTINCT FROM n.up_container_id
+
+                UNION ALL
+
+                SELECT n.up_container_id, 1
+                FROM old_rows o
+                JOIN new_rows n ON n.id = o.id
+                WHERE n.up_container_id IS NOT NULL
+                  AND o.up_container_id IS DISTINCT FROM n.up_container_id
+            ) changes
+            GROUP BY parent_id
+        ) d
+        WHERE p.id = d.parent_id
+          AND d.cnt <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS count_container_children_insert ON containers;
+CREATE TRIGGER count_container_children_insert
+    AFTER INSERT ON containers
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_container_child_count();
+
+DROP TRIGGER IF EXISTS count_container_children_update ON containers;
+CREATE TRIGGER count_container_children_update
+    AFTER UPDATE ON containers
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_container_child_count();
+
+DROP TRIGGER IF EXISTS count_container_children_delete ON containers;
+CREATE TRIGGER count_container_children_delete
+    AFTER DELETE ON containers
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_container_child_count();
+
+-- 하위 항목 수 재계산 (정합성 점검/복구용, 틀어진 컨테이너 수 반환)
+CREATE OR REPLACE FUNCTION reconcile_container_child_counts()
+RETURNS INT AS $$
+DECLARE
+    fixed_count INT;
+BEGIN
+    WITH actual AS (
+        SELECT p.id, COUNT(c.id) AS child_count
+        FROM containers p
+        LEFT JOIN containers c ON c.up_container_id = p.id
+        GROUP BY p.id
+    )
+    UPDATE containers p
+    SET child_count = a.child_count
+    FROM actual a
+    WHERE p.id = a.id
+      AND p.child_count <> a.child_count;
+
+    GET DIAGNOSTICS fixed_count = ROW_COUNT;
+    RETURN fixed_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 기존 데이터 집계
+SELECT reconcile_container_child_counts();
+
+COMMENT ON COLUMN containers.child_count IS '직속 하위 항목 수 (트리거로 관리)';
+
+COMMIT;
@@ -0,0 +1,25 @@
+-- ============================================
+-- 컨테이너 ID 발급 함수 분리
+-- ============================================
+-- 기존 DB에 적용: psql -d postgres -f migrations/006_next_container_id.sql
+-- 일괄 등록 시 ID를 한 번에 미리 발급하기 위해 트리거의 ID 생성식을 함수로 분리
+-- ============================================
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION next_container_id()
+RETURNS VARCHAR AS $$
+    SELECT 'C' || TO_CHAR(CURRENT_DATE, 'YYYY') || LPAD(nextval('containers_id_seq')::TEXT, 5, '0');
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION generate_container_id()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.id IS NULL OR NEW.id = '' THEN
+        NEW.id := next_container_id();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMIT;
@@ -0,0 +1,25 @@
+-- ============================================
+-- 공통코드 변경 알림 트리거
+-- ============================================
+-- 기존 DB에 적용: psql -d postgres -f migrations/007_com_code_notify.sql
+-- com_code_d 변경 시 com_code_changed 채널로 NOTIFY
+-- (Config.CODE_NOTIFY_ENABLED = True 인 서버는 코드 사전을 즉시 다시 적재)
+-- ============================================
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION notify_com_code_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('com_code_changed', TG_OP);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS notify_com_code_changed ON com_code_d;
+CREATE TRIGGER notify_com_code_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON com_code_d
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_com_code_changed();
+
+COMMIT;
@@ -0,0 +1,76 @@
+-- ============================================
+-- 집 변경 버전 컬럼 추가 (HTTP 캐시 검증용)
+-- ============================================
+-- 기존 DB에 적용: psql -d postgres -f migrations/008_house_version.sql
+-- 조회 API가 houses.version 하나로 ETag / Last-Modified 를 만들어 304 응답
+-- ============================================
+
+BEGIN;
+
+ALTER TABLE houses ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE houses ADD COLUMN IF NOT EXISTS changed_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP;
+
+CREATE OR REPLACE FUNCTION bump_house_version()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed_house_ids VARCHAR[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT house_id) INTO changed_house_ids FROM new_rows;
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- 집 간 이동은 출발/도착 집 모두 변경
+        SELECT array_agg(DISTINCT house_id) INTO changed_house_ids
+        FROM (SELECT house_id FROM new_rows UNION SELECT house_id FROM old_rows) t;
+    ELSE
+        SELECT array_agg(DISTINCT house_id) INTO changed_house_ids FROM old_rows;
+    END IF;
+
+    -- 동시에 커밋되는 트랜잭션 사이에서도 changed_at이 줄어들지 않도록 GREATEST 사용
+    UPDATE houses
+    SET version = version + 1,
+        changed_at = GREATEST(clock_timestamp(), changed_at + INTERVAL '1 millisecond')
+    WHERE id = ANY(changed_house_ids);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS bump_house_version_containers_insert ON containers;
+CREATE TRIGGER bump_house_version_containers_insert
+    AFTER INSERT ON containers
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_house_version();
+
+DROP TRIGGER IF EXISTS bump_house_version_containers_update ON containers;
+CREATE TRIGGER bump_house_version_containers_update
+    AFTER UPDATE ON containers
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_house_version();
+
+DROP TRIGGER IF EXISTS bump_house_version_containers_delete ON containers;
+CREATE TRIGGER bump_house_version_containers_delete
+    AFTER DELETE ON containers
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_house_version();
+
+DROP TRIGGER IF EXISTS bump_house_version_members_insert ON house_members;
+CREATE TRIGGER bump_house_version_members_insert
+    AFTER INSERT ON house_members
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_house_version();
+
+DROP TRIGGER IF EXISTS bump_house_version_members_delete ON house_members;
+CREATE TRIGGER bump_house_version_members_delete
+    AFTER DELETE ON house_members
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_house_version();
+
+COMMENT ON COLUMN houses.version IS '컨테이너/구성원 변경 버전 (트리거로 관리, ETag)';
+COMMENT ON COLUMN houses.changed_at IS '마지막 변경 시각 (트리거로 관리, Last-Modified)';
+
+COMMIT;
@@ -0,0 +1,35 @@
+-- ============================================
+-- 서브트리 이동용 경로 트리거 조정
+-- ============================================
+-- 기존 DB에 적용: psql -d postgres -f migrations/009_subtree_move_triggers.sql
+-- 서브트리 이동(utils/subtree_move.py)은 대상과 자손의 path를 한 문장으로 직접 계산하므로,
+-- 경로 트리거는 up_container_id 값이 실제로 바뀐 행(이동 대상)에서만 동작하도록 제한
+-- ============================================
+
+BEGIN;
+
+-- 생성 시 경로 설정
+DROP TRIGGER IF EXISTS set_container_path ON containers;
+CREATE TRIGGER set_container_path
+    BEFORE INSERT ON containers
+    FOR EACH ROW
+    EXECUTE FUNCTION set_container_path();
+
+-- 부모 변경 시 경로 설정 (SET 절에 up_container_id가 있어도 값이 같으면 실행하지 않음)
+DROP TRIGGER IF EXISTS set_container_path_on_move ON containers;
+CREATE TRIGGER set_container_path_on_move
+    BEFORE UPDATE OF up_container_id ON containers
+    FOR EACH ROW
+    WHEN (OLD.up_container_id IS DISTINCT FROM NEW.up_container_id)
+    EXECUTE FUNCTION set_container_path();
+
+-- 부모 변경 시 하위 항목 경로 일괄 변경
+DROP TRIGGER IF EXISTS move_container_path ON containers;
+CREATE TRIGGER move_container_path
+    AFTER UPDATE OF up_container_id ON containers
+    FOR EACH ROW
+    WHEN (OLD.up_container_id IS DISTINCT FROM NEW.up_container_id
+          AND OLD.path IS DISTINCT FROM NEW.path)
+    EXECUTE FUNCTION move_container_path();
+
+COMMIT;
@@ -0,0 +1,36 @@
+-- ============================================
+-- 컨테이너 이력 outbox 테이블 추가
+-- ============================================
+-- 기존 DB에 적용: psql -d postgres -f migrations/010_container_log_outbox.sql
+-- Config.CONTAINER_LOG_MODE = 'outbox' 일 때 요청 트랜잭션은 이 테이블에만 기록하고,
+-- 백그라운드 스레드(또는 flask flush-container-logs)가 모아서 container_logs로 옮김
+-- ============================================
+
+BEGIN;
+
+-- 인덱스/FK/ID 트리거 없이 추가만 하는 테이블 (seq 순서 = 기록 순서)
+CREATE TABLE IF NOT EXISTS container_log_outbox (
+    seq BIGSERIAL PRIMARY KEY,
+    container_id VARCHAR(11),
+    act_cd VARCHAR(20) NOT NULL,
+    container_name VARCHAR(200),
+    container_type_cd VARCHAR(20),
+    from_container_id VARCHAR(11),
+    to_container_id VARCHAR(11),
+    from_house_id VARCHAR(11),
+    to_house_id VARCHAR(11),
+    from_owner_user_id VARCHAR(10),
+    to_owner_user_id VARCHAR(10),
+    from_quantity INT,
+    to_quantity INT,
+    from_remk TEXT,
+    to_remk TEXT,
+    log_remk TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    created_user VARCHAR(10) NOT NULL,
+    updated_user VARCHAR(10) NOT NULL
+);
+
+COMMENT ON TABLE container_log_outbox IS '컨테이너 이력 기록 대기열 (outbox 모드, container_logs로 옮긴 뒤 삭제)';
+
+COMMIT;
@@ -0,0 +1,186 @@
+-- ============================================
+-- container_logs 월별 파티션 전환 + 집별 일간 활동 집계
+-- ============================================
+-- 기존 DB에 적용: psql -d postgres -f migrations/011_container_logs_partitioning.sql
+-- 기존 이력을 새 파티션 테이블로 복사하므로 이력이 많으면 점검 시간에 실행
+-- 이후 파티션 생성/집계는 flask maintain-container-logs (cron 매일),
+-- 보관 기간이 지난 파티션은 flask archive-container-logs 로 분리
+-- ============================================
+
+BEGIN;
+
+-- 기존 테이블은 이름을 바꿔 두고 (인덱스/PK 이름이 새 테이블과 겹치지 않도록 정리)
+ALTER TABLE container_logs RENAME TO container_logs_unpartitioned;
+ALTER TABLE container_logs_unpartitioned RENAME CONSTRAINT container_logs_pkey TO container_logs_unpartitioned_pkey;
+DROP TRIGGER IF EXISTS set_container_log_id ON container_logs_unpartitioned;
+DROP INDEX IF EXISTS idx_container_logs_container;
+DROP INDEX IF EXISTS idx_container_logs_created;
+DROP INDEX IF EXISTS idx_container_logs_from_house;
+DROP INDEX IF EXISTS idx_container_logs_to_house;
+
+CREATE TABLE container_logs (
+    id VARCHAR(11) NOT NULL,
+    container_id VARCHAR(11),
+    act_cd VARCHAR(20) NOT NULL,
+    container_name VARCHAR(200),
+    container_type_cd VARCHAR(20),
+    from_container_id VARCHAR(11),
+    to_container_id VARCHAR(11),
+    from_house_id VARCHAR(11),
+    to_house_id VARCHAR(11),
+    from_owner_user_id VARCHAR(10),
+    to_owner_user_id VARCHAR(10),
+    from_quantity INT,
+    to_quantity INT,
+    from_remk TEXT,
+    to_remk TEXT,
+    log_remk TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    created_user VARCHAR(10) NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_user VARCHAR(10) NOT NULL,
+
+    FOREIGN KEY (container_id) REFERENCES containers(id) ON DELETE SET NULL,
+    FOREIGN KEY (act_cd) REFERENCES com_code_d(cd) ON DELETE RESTRICT,
+    FOREIGN KEY (container_type_cd) REFERENCES com_code_d(cd) ON DELETE RESTRICT,
+    FOREIGN KEY (from_container_id) REFERENCES containers(id) ON DELETE SET NULL,
+    FOREIGN KEY (to_container_id) REFERENCES containers(id) ON DELETE SET NULL,
+    FOREIGN KEY (from_house_id) REFERENCES houses(id) ON DELETE CASCADE,
+    FOREIGN KEY (to_house_id) REFERENCES houses(id) ON DELETE CASCADE,
+    FOREIGN KEY (created_user) REFERENCES users(id) ON DELETE RESTRICT,
+    FOREIGN KEY (updated_user) REFERENCES users(id) ON DELETE RESTRICT,
+
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE container_logs_default PARTITION OF container_logs DEFAULT;
+
+-- 월별 파티션 생성 (container_logs_YYYYMM, 이미 있으면 NULL 반환)
+-- default 파티션에 들어가 있던 해당 월 행은 새 파티션으로 옮긴 뒤 연결
+CREATE OR REPLACE FUNCTION create_container_log_partition(p_month DATE)
+RETURNS TEXT AS $$
+DECLARE
+    start_at DATE := date_trunc('month', p_month)::DATE;
+    end_at DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::DATE;
+    partition_name TEXT := 'container_logs_' || to_char(p_month, 'YYYYMM');
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN NULL;
+    END IF;
+
+    EXECUTE format('CREATE TABLE %I (LIKE container_logs INCLUDING DEFAULTS)', partition_name);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM container_logs_default WHERE created_at >= %L AND created_at < %L RETURNING *)
+         INSERT INTO %I SELECT * FROM moved',
+        start_at, end_at, partition_name
+    );
+    EXECUTE format(
+        'ALTER TABLE container_logs ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, start_at, end_at
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 이번 달부터 months_ahead개월 뒤까지 파티션 준비 (새로 만든 파티션 수 반환)
+CREATE OR REPLACE FUNCTION ensure_container_log_partitions(months_ahead INT DEFAULT 3)
+RETURNS INT AS $$
+DECLARE
+    created_count INT := 0;
+    target_month DATE;
+BEGIN
+    FOR target_month IN
+        SELECT generate_series(
+            date_trunc('month', CURRENT_DATE),
+            date_trunc('month', CURRENT_DATE) + make_interval(months => months_ahead),
+            INTERVAL '1 month'
+        )::DATE
+    LOOP
+        IF create_container_log_partition(target_month) IS NOT NULL THEN
+            created_count := created_count + 1;
+        END IF;
+    END LOOP;
+    RETURN created_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 기존 이력이 있는 달부터 앞으로 3개월까지 파티션 생성
+SELECT create_container_log_partition(m::DATE)
+FROM generate_series(
+    date_trunc('month', COALESCE((SELECT MIN(created_at) FROM container_logs_unpartitioned), CURRENT_DATE)),
+    date_trunc('month', CURRENT_DATE) + INTERVAL '3 months',
+    INTERVAL '1 month'
+) AS m;
+
+-- 기존 이력 복사
+INSERT INTO container_logs (
+       id, container_id, act_cd, container_name, container_type_cd,
+       from_container_id, to_container_id, from_house_id, to_house_id,
+       from_owner_user_id, to_owner_user_id, from_quantity, to_quantity,
+       from_remk, to_remk, log_remk, created_at, created_user, updated_at, updated_user)
+SELECT id, container_id, act_cd, container_name, container_type_cd,
+       from_container_id, to_container_id, from_house_id, to_house_id,
+       from_owner_user_id, to_owner_user_id, from_quantity, to_quantity,
+       from_remk, to_remk, log_remk, created_at, created_user, updated_at, updated_user
+FROM container_logs_unpartitioned;
+
+DROP TABLE container_logs_unpartitioned;
+
+CREATE TRIGGER set_container_log_id
+    BEFORE INSERT ON container_logs
+    FOR EACH ROW
+    EXECUTE FUNCTION generate_container_log_id();
+
+-- 파티션 테이블에 만든 인덱스는 모든 파티션(이후 생성분 포함)에 적용됨
+CREATE INDEX idx_container_logs_container ON container_logs(container_id, created_at DESC, id DESC);
+CREATE INDEX idx_container_logs_created ON container_logs(created_at);
+CREATE INDEX idx_container_logs_from_house ON container_logs(from_house_id, created_at DESC, id DESC) WHERE from_house_id IS NOT NULL;
+CREATE INDEX idx_container_logs_to_house ON container_logs(to_house_id, created_at DESC, id DESC) WHERE to_house_id IS NOT NULL;
+
+COMMENT ON TABLE container_logs IS '컨테이너 이력 (이동, 수정 등)';
+COMMENT ON COLUMN container_logs.from_house_id IS '출발 집 (집 간 이동 시)';
+COMMENT ON COLUMN container_logs.to_house_id IS '도착 집 (집 간 이동 시)';
+
+-- 집별 일간 활동 집계
+-- 집 간 이동 이력은 출발/도착 집 모두에 집계
+
+CREATE TABLE IF NOT EXISTS container_log_daily (
+    house_id VARCHAR(11) NOT NULL,
+    log_date DATE NOT NULL,
+    act_cd VARCHAR(20) NOT NULL,
+    log_count INT NOT NULL,
+    PRIMARY KEY (house_id, log_date, act_cd),
+    FOREIGN KEY (house_id) REFERENCES houses(id) ON DELETE CASCADE
+);
+
+-- [from_date, to_date) 구간 재집계 (다시 실행해도 같은 결과, 집계한 행 수 반환)
+CREATE OR REPLACE FUNCTION rollup_container_logs(from_date DATE, to_date DATE)
+RETURNS INT AS $$
+DECLARE
+    rolled_count INT;
+BEGIN
+    DELETE FROM container_log_daily
+    WHERE log_date >= from_date AND log_date < to_date;
+
+    INSERT INTO container_log_daily (house_id, log_date, act_cd, log_count)
+    SELECT h.house_id, l.created_at::DATE, l.act_cd, COUNT(*)
+    FROM container_logs l
+    CROSS JOIN LATERAL (
+        SELECT DISTINCT house_id
+        FROM unnest(ARRAY[l.from_house_id, l.to_house_id]) AS t(house_id)
+        WHERE house_id IS NOT NULL
+    ) h
+    WHERE l.created_at >= from_date AND l.created_at < to_date
+    GROUP BY h.house_id, l.created_at::DATE, l.act_cd;
+
+    GET DIAGNOSTICS rolled_count = ROW_COUNT;
+    RETURN rolled_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 기존 이력 전체 집계 (오늘 제외)
+SELECT rollup_container_logs('-infinity'::DATE, CURRENT_DATE);
+
+COMMENT ON TABLE container_log_daily IS '집별 일간 활동 집계 (이력 아카이브 후에도 유지)';
+
+COMMIT;
@@ -0,0 +1,54 @@
+-- ============================================
+-- 컨테이너 / 이력 ID 발급 개선
+-- ============================================
+-- 기존 DB에 적용: psql -d postgres -f migrations/012_container_id_defaults.sql
+-- - 번호가 99999를 넘으면 LPAD가 잘라내 ID가 중복되던 문제 수정 (5자리 이상은 자리수 증가)
+-- - ID 컬럼을 VARCHAR(20)으로 확장 (길이만 늘리는 변경이라 테이블 재작성 없음)
+-- - 행마다 실행되던 ID 트리거 대신 컬럼 기본값으로 발급
+-- - 시퀀스 CACHE로 대량 INSERT 시 시퀀스 경합 감소 (번호 사이 공백 허용)
+-- 기존 ID는 그대로 유지됩니다.
+-- ============================================
+
+BEGIN;
+
+ALTER TABLE containers
+    ALTER COLUMN id TYPE VARCHAR(20),
+    ALTER COLUMN up_container_id TYPE VARCHAR(20);
+
+ALTER TABLE container_logs
+    ALTER COLUMN id TYPE VARCHAR(20),
+    ALTER COLUMN container_id TYPE VARCHAR(20),
+    ALTER COLUMN from_container_id TYPE VARCHAR(20),
+    ALTER COLUMN to_container_id TYPE VARCHAR(20);
+
+ALTER TABLE container_log_outbox
+    ALTER COLUMN container_id TYPE VARCHAR(20),
+    ALTER COLUMN from_container_id TYPE VARCHAR(20),
+    ALTER COLUMN to_container_id TYPE VARCHAR(20);
+
+ALTER SEQUENCE containers_id_seq CACHE 20;
+ALTER SEQUENCE container_logs_id_seq CACHE 20;
+
+CREATE OR REPLACE FUNCTION next_container_id()
+RETURNS VARCHAR AS $$
+    SELECT 'C' || TO_CHAR(CURRENT_DATE, 'YYYY') || LPAD(n::TEXT, GREATEST(5, length(n::TEXT)), '0')
+    FROM nextval('containers_id_seq') AS n;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION next_container_log_id()
+RETURNS VARCHAR AS $$
+    SELECT 'L' || TO_CHAR(CURRENT_DATE, 'YYYY') || LPAD(n::TEXT, GREATEST(5, length(n::TEXT)), '0')
+    FROM nextval('container_logs_id_seq') AS n;
+$$ LANGUAGE sql;
+
+-- 기본값은 BEFORE 트리거보다 먼저 채워지므로 set_container_path는 그대로 NEW.id 사용 가능
+-- (파티션 테이블의 기본값은 기존 파티션에도 함께 적용)
+ALTER TABLE containers ALTER COLUMN id SET DEFAULT next_container_id();
+ALTER TABLE container_logs ALTER COLUMN id SET DEFAULT next_container_log_id();
+
+DROP TRIGGER IF EXISTS set_container_id ON containers;
+DROP TRIGGER IF EXISTS set_container_log_id ON container_logs;
+DROP FUNCTION IF EXISTS generate_container_id();
+DROP FUNCTION IF EXISTS generate_container_log_id();
+
+COMMIT;
@@ -0,0 +1,59 @@
+-- ============================================
+-- 집 전체 트리 스냅샷 / 변경분 조회 지원
+-- ============================================
+-- 기존 DB에 적용: psql -d postgres -f migrations/013_container_tree_sync.sql
+-- - containers(house_id, updated_at) 인덱스: 토큰 이후 변경된 컨테이너 조회
+-- - container_tombstones: 삭제/다른 집 이동된 컨테이너 ID 기록 (container_logs는 삭제 시 ID가 NULL이 됨)
+-- 오래된 삭제 기록은 flask prune-container-tombstones (cron 매일)
+-- ============================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS container_tombstones (
+    house_id VARCHAR(11) NOT NULL,
+    container_id VARCHAR(20) NOT NULL,
+    removed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE OR REPLACE FUNCTION record_container_tombstones()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        -- 집 삭제로 함께 삭제된 컨테이너는 기록하지 않음
+        INSERT INTO container_tombstones (house_id, container_id)
+        SELECT o.house_id, o.id
+        FROM old_rows o
+        WHERE EXISTS (SELECT 1 FROM houses h WHERE h.id = o.house_id);
+    ELSE
+        -- 집 간 이동은 출발 집 입장에서 삭제와 같음
+        INSERT INTO container_tombstones (house_id, container_id)
+        SELECT o.house_id, o.id
+        FROM old_rows o
+        JOIN new_rows n ON n.id = o.id
+        WHERE n.house_id <> o.house_id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS record_container_tombstones_update ON containers;
+CREATE TRIGGER record_container_tombstones_update
+    AFTER UPDATE ON containers
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_container_tombstones();
+
+DROP TRIGGER IF EXISTS record_container_tombstones_delete ON containers;
+CREATE TRIGGER record_container_tombstones_delete
+    AFTER DELETE ON containers
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_container_tombstones();
+
+CREATE INDEX IF NOT EXISTS idx_containers_house_updated ON containers(house_id, updated_at);
+CREATE INDEX IF NOT EXISTS idx_container_tombstones_house ON container_tombstones(house_id, removed_at);
+
+COMMENT ON TABLE container_tombstones IS '삭제/다른 집으로 이동된 컨테이너 기록 (트리 변경분 조회용, 트리거로 관리)';
+
+COMMIT;
@@ -0,0 +1,79 @@
+-- ============================================
+-- child_count 트리거 재귀 수정
+-- ============================================
+-- 기존 DB에 적용: psql -d postgres -f migrations/014_fix_child_count_trigger.sql
+-- 문장 단위 UPDATE 트리거가 child_count UPDATE로 자기 자신을 다시 실행해
+-- 컨테이너 생성/수정/이동/삭제가 stack depth limit exceeded로 실패하던 문제 수정
+-- 부모가 바뀐 행이 없으면 바로 종료하고, 틀어진 child_count는 다시 집계
+-- ============================================
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION update_container_child_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE containers p
+        SET child_count = p.child_count + d.cnt
+        FROM (
+            SELECT up_container_id, COUNT(*) AS cnt
+            FROM new_rows
+            WHERE up_container_id IS NOT NULL
+            GROUP BY up_container_id
+        ) d
+        WHERE p.id = d.up_container_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE containers p
+        SET child_count = p.child_count - d.cnt
+        FROM (
+            SELECT up_container_id, COUNT(*) AS cnt
+            FROM old_rows
+            WHERE up_container_id IS NOT NULL
+            GROUP BY up_container_id
+        ) d
+        WHERE p.id = d.up_container_id;
+    ELSE
+        -- 부모가 바뀐 행이 없으면 종료
+        -- 아래 child_count UPDATE도 이 트리거를 다시 실행하므로 (문장 트리거는 0건이어도 실행됨)
+        -- 여기서 멈추지 않으면 재귀가 끝나지 않음
+        IF NOT EXISTS (
+            SELECT 1
+            FROM old_rows o
+            JOIN new_rows n ON n.id = o.id
+            WHERE o.up_container_id IS DISTINCT FROM n.up_container_id
+        ) THEN
+            RETURN NULL;
+        END IF;
+
+        -- 부모가 바뀐 행만 반영
+        UPDATE containers p
+        SET child_count = p.child_count + d.cnt
+        FROM (
+            SELECT parent_id, SUM(delta) AS cnt
+            FROM (
+                SELECT o.up_container_id AS parent_id, -1 AS delta
+                FROM old_rows o
+                JOIN new_rows n ON n.id = o.id
+                WHERE o.up_container_id IS NOT NULL
+                  AND o.up_container_id IS DISTINCT FROM n.up_container_id
+
+                UNION ALL
+
+                SELECT n.up_container_id, 1
+                FROM old_rows o
+                JOIN new_rows n ON n.id = o.id
+                WHERE n.up_container_id IS NOT NULL
+                  AND o.up_container_id IS DISTINCT FROM n.up_container_id
+            ) changes
+            GROUP BY parent_id
+        ) d
+        WHERE p.id = d.parent_id
+          AND d.cnt <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT reconcile_container_child_counts();
+
+COMMIT;
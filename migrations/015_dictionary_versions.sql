@@ -0,0 +1,48 @@
+-- ============================================
+-- 사용자 이름 / 공통코드 변경 버전 (HTTP 캐시 검증용)
+-- ============================================
+-- 기존 DB에 적용: psql -d postgres -f migrations/015_dictionary_versions.sql
+-- 조회 응답의 사용자 이름(owner_name 등)과 코드명(type_nm)은 houses.version을 올리지 않고 바뀌므로,
+-- 각각의 변경 버전을 따로 두고 ETag에 함께 넣음 (값이 바뀌면 서버의 이름/코드 캐시도 다시 읽음)
+-- ============================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS dictionary_versions (
+    name VARCHAR(30) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO dictionary_versions (name) VALUES ('users.name'), ('com_code_d')
+ON CONFLICT (name) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_dictionary_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE dictionary_versions SET version = version + 1 WHERE name = TG_ARGV[0];
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS bump_dictionary_version_user_name ON users;
+CREATE TRIGGER bump_dictionary_version_user_name
+    AFTER UPDATE OF name ON users
+    FOR EACH ROW
+    WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION bump_dictionary_version('users.name');
+
+DROP TRIGGER IF EXISTS bump_dictionary_version_user_delete ON users;
+CREATE TRIGGER bump_dictionary_version_user_delete
+    AFTER DELETE ON users
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_dictionary_version('users.name');
+
+DROP TRIGGER IF EXISTS bump_dictionary_version_com_code ON com_code_d;
+CREATE TRIGGER bump_dictionary_version_com_code
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON com_code_d
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_dictionary_version('com_code_d');
+
+COMMENT ON TABLE dictionary_versions IS '사용자 이름 / 공통코드 변경 버전 (트리거로 관리, ETag)';
+
+COMMIT;
@@ -0,0 +1,84 @@
+-- ============================================
+-- 집 전체 트리 변경분을 집 버전 번호로 조회
+-- ============================================
+-- 기존 DB에 적용: psql -d postgres -f migrations/016_container_change_version.sql
+-- updated_at(트랜잭션 시작 시각) + 겹침 시간으로 조회하면 겹침보다 오래 걸린 트랜잭션
+-- (대량 가져오기 등)의 변경이 빠지므로, 행마다 커밋될 집 버전(houses.version)을 기록하고
+-- 토큰의 버전보다 큰 행만 조회
+-- ============================================
+
+BEGIN;
+
+ALTER TABLE containers ADD COLUMN IF NOT EXISTS change_version BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE container_tombstones ADD COLUMN IF NOT EXISTS change_version BIGINT NOT NULL DEFAULT 0;
+
+-- 기존 행은 현재 집 버전으로 채움 (이전 토큰으로 조회하면 한 번 전체를 다시 받거나 reset)
+-- 트리거(updated_at, 집 버전 등)는 실행하지 않음
+SET LOCAL session_replication_role = replica;
+UPDATE containers c SET change_version = h.version FROM houses h WHERE h.id = c.house_id;
+UPDATE container_tombstones t SET change_version = h.version FROM houses h WHERE h.id = t.house_id;
+SET LOCAL session_replication_role = origin;
+
+CREATE OR REPLACE FUNCTION set_container_change_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- 트리 응답에 없는 컬럼(child_count, path, 메모 등)만 바뀌면 그대로 둠
+    IF TG_OP = 'UPDATE'
+       AND NEW.house_id = OLD.house_id
+       AND NEW.up_container_id IS NOT DISTINCT FROM OLD.up_container_id
+       AND NEW.type_cd = OLD.type_cd
+       AND NEW.name = OLD.name
+       AND NEW.quantity IS NOT DISTINCT FROM OLD.quantity THEN
+        RETURN NEW;
+    END IF;
+
+    -- 문장 끝의 집 버전 증가(bump_house_version)와 같은 행 잠금을 먼저 잡고 읽음
+    -- 잠금은 커밋까지 유지되므로 같은 집의 변경은 커밋 순서대로 번호가 커짐
+    SELECT version + 1 INTO NEW.change_version
+    FROM houses
+    WHERE id = NEW.house_id
+    FOR NO KEY UPDATE;
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS set_container_change_version ON containers;
+CREATE TRIGGER set_container_change_version
+    BEFORE INSERT OR UPDATE ON containers
+    FOR EACH ROW
+    EXECUTE FUNCTION set_container_change_version();
+
+-- 삭제 기록에는 출발 집의 증가된 버전을 기록
+-- (bump_house_version_* 트리거가 이름 순으로 먼저 실행되어 집 행을 잠그고 버전을 올려 둠)
+CREATE OR REPLACE FUNCTION record_container_tombstones()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        -- 집 삭제로 함께 삭제된 컨테이너는 기록하지 않음
+        INSERT INTO container_tombstones (house_id, container_id, change_version)
+        SELECT o.house_id, o.id, h.version
+        FROM old_rows o
+        JOIN houses h ON h.id = o.house_id;
+    ELSE
+        -- 집 간 이동은 출발 집 입장에서 삭제와 같음
+        INSERT INTO container_tombstones (house_id, container_id, change_version)
+        SELECT o.house_id, o.id, h.version
+        FROM old_rows o
+        JOIN new_rows n ON n.id = o.id
+        JOIN houses h ON h.id = o.house_id
+        WHERE n.house_id <> o.house_id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP INDEX IF EXISTS idx_containers_house_updated;
+CREATE INDEX IF NOT EXISTS idx_containers_house_change ON containers(house_id, change_version);
+DROP INDEX IF EXISTS idx_container_tombstones_house;
+CREATE INDEX IF NOT EXISTS idx_container_tombstones_house ON container_tombstones(house_id, change_version);
+
+COMMENT ON COLUMN containers.change_version IS '트리 응답 컬럼이 마지막으로 바뀐 집 버전 (트리거로 관리, 트리 변경분 조회)';
+
+COMMIT;
@@ -6,6 +6,7 @@ def register_blueprints(app):
     from routes.houses import houses_bp
     from routes.invitations import invitations_bp
     from routes.containers import containers_bp
+    from routes.codes import codes_bp
     # from routes.containers import containers_bp
     # ... 등등
     
@@ -14,4 +15,5 @@ def register_blueprints(app):
     app.register_blueprint(houses_bp)
     app.register_blueprint(invitations_bp)
     app.register_blueprint(containers_bp)
+    app.register_blueprint(codes_bp)
     # app.register_blueprint(containers_bp)
\ No newline at end of file
@@ -1,10 +1,10 @@
 from flask import Blueprint, request, jsonify
-import bcrypt
 import jwt
-from datetime import datetime, timedelta
-from database import get_db_connection
+from database import get_db
 from config import Config
 from psycopg2.extras import RealDictCursor
+from utils.passwords import hash_password, verify_password, needs_rehash, PasswordHashBusyError
+from utils.tokens import issue_tokens, verify_refresh_token
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api')
 
@@ -19,32 +19,40 @@ def signup():
         if not email or not password or not name:
             return jsonify({'error': '모든 필드를 입력해주세요'}), 400
         
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        # 중복 이메일은 해시 전에 거름 (409로 끝날 요청이 해시 작업 자리를 차지하지 않도록)
+        with get_db() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT id FROM users WHERE email = %s", (email,))
+            if cur.fetchone():
+                return jsonify({'error': '이미 존재하는 이메일입니다'}), 409
         
-        conn = get_db_connection()
-        cur = conn.cursor()
+        # 해시 중에는 DB 커넥션을 점유하지 않음
+        hashed_password = hash_password(password)
         
-        cur.execute("SELECT id FROM users WHERE email = %s", (email,))
-        if cur.fetchone():
-            cur.close()
-            conn.close()
-            return jsonify({'error': '이미 존재하는 이메일입니다'}), 409
-        
-        cur.execute(
-            "INSERT INTO users (email, password, name) VALUES (%s, %s, %s) RETURNING id",
-            (email, hashed_password, name)
-        )
-        user_id = cur.fetchone()[0]
-        conn.commit()
+        with get_db() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO users (email, password, name) VALUES (%s, %s, %s)
+                ON CONFLICT (email) DO NOTHING
+                RETURNING id
+                """,
+                (email, hashed_password, name)
+            )
+            row = cur.fetchone()
+            conn.commit()
         
-        cur.close()
-        conn.close()
+        # 확인과 저장 사이에 같은 이메일로 가입한 경우
+        if not row:
+            return jsonify({'error': '이미 존재하는 이메일입니다'}), 409
         
         return jsonify({
             'message': '회원가입 성공',
-            'user_id': user_id
+            'user_id': row[0]
         }), 201
         
+    except PasswordHashBusyError as e:
+        return jsonify({'error': str(e)}), 429, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -58,38 +66,78 @@ def login():
         if not email or not password:
             return jsonify({'error': '이메일과 비밀번호를 입력해주세요'}), 400
         
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        with get_db() as conn:
+            cur = conn.cursor(cursor_factory=RealDictCursor)
 
-        cur.execute("SELECT * FROM users WHERE email = %s", (email,))
-        user = cur.fetchone()
+            cur.execute("SELECT * FROM users WHERE email = %s", (email,))
+            user = cur.fetchone()
 
         if not user:
-            cur.close()
-            conn.close()
             return jsonify({'error': '존재하지 않는 이메일입니다'}), 404
         
-        if not bcrypt.checkpw(password.encode('utf-8'), user['password'].encode('utf-8')):
-            cur.close()
-            conn.close()
+        # 해시 검증 중에는 DB 커넥션을 점유하지 않음
+        if not verify_password(password, user['password']):
             return jsonify({'error': '비밀번호가 일치하지 않습니다'}), 401
         
-        token = jwt.encode({
-            'user_id': user['id'],
-            'exp': datetime.utcnow() + timedelta(hours=24)
-        }, Config.SECRET_KEY, algorithm="HS256")
-
-        cur.close()
-        conn.close()
-
+        # 해시 비용(BCRYPT_ROUNDS)이 바뀌었으면 현재 설정으로 다시 해시하여 저장
+        if needs_rehash(user['password']):
+            try:
+                rehashed_password = hash_password(password)
+                with get_db() as conn:
+                    cur = conn.cursor()
+                    cur.execute(
+                        "UPDATE users SET password = %s WHERE id = %s AND password = %s",
+                        (rehashed_password, user['id'], user['password'])
+                    )
+                    conn.commit()
+            except PasswordHashBusyError:
+                pass  # 다음 로그인 때 다시 시도
+        
         return jsonify({
             'message': '로그인 성공',
-            'token': token,
+            **issue_tokens(user['id']),
             'user': {
                 'id': user['id'],
                 'email': user['email'],
                 'name': user['name']
             }
         }), 200
+    except PasswordHashBusyError as e:
+        return jsonify({'error': str(e)}), 429, {'Retry-After': '1'}
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+# access 토큰 재발급 (Config.JWT_REFRESH_TOKEN_ENABLED)
+@auth_bp.route('/token/refresh', methods=['POST'])
+def refresh_token():
+    try:
+        if not Config.JWT_REFRESH_TOKEN_ENABLED:
+            return jsonify({'error': '토큰 재발급을 사용하지 않습니다'}), 404
+
+        data = request.json or {}
+        token = data.get('refresh_token')
+
+        if not token:
+            return jsonify({'error': 'refresh_token이 필요합니다'}), 400
+
+        try:
+            user_id = verify_refresh_token(token)
+        except jwt.ExpiredSignatureError:
+            return jsonify({'error': '토큰이 만료되었습니다'}), 401
+        except jwt.InvalidTokenError:
+            return jsonify({'error': '유효하지 않은 토큰입니다'}), 401
+
+        # 탈퇴 등으로 사라진 사용자는 재발급하지 않음
+        with get_db() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT id FROM users WHERE id = %s", (user_id,))
+            if not cur.fetchone():
+                return jsonify({'error': '사용자를 찾을 수 없습니다'}), 401
+
+        return jsonify({
+            'message': '토큰 재발급 성공',
+            **issue_tokens(user_id)
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,44 @@
+from flask import Blueprint, jsonify
+from datetime import datetime
+from middlewares.auth import token_required
+from config import Config
+from utils.codes import load_codes, get_code_dictionary
+
+codes_bp = Blueprint('codes', __name__, url_prefix='/api/codes')
+
+# 1. 공통코드 사전 조회
+@codes_bp.route('/', methods=['GET'])
+@token_required
+def get_codes(current_user_id):
+    try:
+        version, loaded_at, codes = get_code_dictionary()
+
+        return jsonify({
+            'version': version,
+            'loaded_at': datetime.fromtimestamp(loaded_at).isoformat() if loaded_at else None,
+            'codes': codes
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# 2. 공통코드 사전 재적재 (시스템 관리자 전용, 요청을 받은 프로세스만 갱신)
+@codes_bp.route('/reload', methods=['POST'])
+@token_required
+def reload_codes(current_user_id):
+    try:
+        if current_user_id != Config.SYSTEM_ADMIN_USER_ID:
+            return jsonify({'error': '시스템 관리자만 재적재할 수 있습니다'}), 403
+
+        count = load_codes()
+        version, _, _ = get_code_dictionary()
+
+        return jsonify({
+            'message': '공통코드를 다시 불러왔습니다',
+            'count': count,
+            'version': version
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
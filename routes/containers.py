@@ -1,116 +1,83 @@
 from flask import Blueprint, request, jsonify
-from psycopg2.extras import RealDictCursor
-from database import get_db_connection
+from psycopg2.extras import RealDictCursor, execute_values
+from database import get_db, fetch_dicts, fetch_dict
 from middlewares.auth import token_required
+from middlewares.house import house_member_required, get_member_role
+from middlewares.http_cache import house_etag
+from config import Config
+from utils.pagination import paginate_logs, decode_cursor
+from utils.container_import import parse_import_request, validate_import_rows
+from utils.codes import attach_code_names
+from utils.user_names import attach_user_names, resolve_user_names, LOG_USER_NAME_FIELDS
+from utils.fields import parse_fields, project
+from utils.subtree_move import move_subtree, SubtreeMoveError
+from utils.container_logs import make_log, write_logs
+from utils.container_tree import build_tree_snapshot, build_tree_changes, decode_tree_token
+from database_async import run_async, gather, fetch_one, fetch_all
 
 containers_bp = Blueprint('containers', __name__, url_prefix='/api/houses')
 
 # 1. 컨테이너 조회 (최상위 또는 특정 부모의 자식들)
 @containers_bp.route('/<house_id>/containers', methods=['GET'])
 @token_required
-def get_containers(current_user_id, house_id):
+@house_member_required()
+@house_etag
+def get_containers(current_user_id, house_id, role_cd):
     """
     Query Parameters:
     - level=root : 최상위 영역들 조회
     - parent_id={container_id} : 특정 컨테이너의 자식들 조회
+    - fields: 응답 목록에 포함할 필드 (쉼표 구분, optional, 예: id,name,type_nm)
     """
     try:
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # 권한 확인
-        cur.execute(
-            "SELECT role_cd FROM house_members WHERE house_id = %s AND user_id = %s",
-            (house_id, current_user_id)
-        )
-        member = cur.fetchone()
-        
-        if not member:
-            cur.close()
-            conn.close()
-            return jsonify({'error': '접근 권한이 없습니다'}), 403
-        
         # 쿼리 파라미터
         level = request.args.get('level')
         parent_id = request.args.get('parent_id')
         
         if level == 'root':
             # 최상위 영역들 조회 (상세 정보 포함)
-            cur.execute(
-                """
-                SELECT 
-                    c.id,
-                    c.name,
-                    c.house_id,
-                    c.up_container_id,
-                    c.type_cd,
-                    cd.nm as type_nm,
-                    c.quantity,
-                    c.remk,
-                    c.owner_user_id,
-                    u.name as owner_name,
-                    c.created_at,
-                    c.created_user,
-                    creator.name as creator_name,
-                    (SELECT COUNT(*) 
-                     FROM containers 
-                     WHERE up_container_id = c.id 
-                     AND house_id = %s) as child_count
-                FROM containers c
-                LEFT JOIN com_code_d cd ON c.type_cd = cd.cd
-                LEFT JOIN users u ON c.owner_user_id = u.id
-                LEFT JOIN users creator ON c.created_user = creator.id
-                WHERE c.house_id = %s 
-                  AND c.up_container_id IS NULL
-                ORDER BY c.type_cd, c.name
-                """,
-                (house_id, house_id)
-            )
+            parent_condition = "AND c.up_container_id IS NULL"
+            params = (house_id,)
         elif parent_id:
             # 특정 부모의 자식들 조회 (상세 정보 포함)
-            cur.execute(
-                """
-                SELECT 
-                    c.id,
-                    c.name,
-                    c.house_id,
-                    c.up_container_id,
-                    c.type_cd,
-                    cd.nm as type_nm,
-                    c.quantity,
-                    c.remk,
-                    c.owner_user_id,
-                    u.name as owner_name,
-                    c.created_at,
-                    c.created_user,
-                    creator.name as creator_name,
-                    (SELECT COUNT(*) 
-                     FROM containers 
-                     WHERE up_container_id = c.id 
-                     AND house_id = %s) as child_count
-                FROM containers c
-                LEFT JOIN com_code_d cd ON c.type_cd = cd.cd
-                LEFT JOIN users u ON c.owner_user_id = u.id
-                LEFT JOIN users creator ON c.created_user = creator.id
-                WHERE c.house_id = %s 
-                  AND c.up_container_id = %s
-                ORDER BY c.type_cd, c.name
-                """,
-                (house_id, house_id, parent_id)
-            )
+            parent_condition = "AND c.up_container_id = %s"
+            params = (house_id, parent_id)
         else:
-            cur.close()
-            conn.close()
             return jsonify({'error': 'level 또는 parent_id 파라미터가 필요합니다'}), 400
         
-        containers = cur.fetchall()
+        sql = """
+            SELECT 
+                c.id,
+                c.name,
+                c.house_id,
+                c.up_container_id,
+                c.type_cd,
+                c.quantity,
+                c.remk,
+                c.owner_user_id,
+                c.created_at,
+                c.created_user,
+                c.child_count
+            FROM containers c
+            WHERE c.house_id = %s 
+              {parent_condition}
+            ORDER BY c.type_cd, c.name
+        """.format(parent_condition=parent_condition)
+        
+        if Config.ASYNC_READS:
+            containers = run_async(fetch_all(sql, params))
+        else:
+            with get_db() as conn:
+                cur = conn.cursor()
+                cur.execute(sql, params)
+                containers = fetch_dicts(cur)
         
-        cur.close()
-        conn.close()
+        attach_code_names(containers, {'type_cd': 'type_nm'})
+        attach_user_names(containers, {'owner_user_id': 'owner_name', 'created_user': 'creator_name'})
         
         return jsonify({
-            'containers': containers,
-            'my_role': member['role_cd']
+            'containers': project(containers, parse_fields(request.args)),
+            'my_role': role_cd
         }), 200
         
     except Exception as e:
@@ -120,26 +87,90 @@ def get_containers(current_user_id, house_id):
 # 2. 컨테이너 상세 조회
 @containers_bp.route('/<house_id>/containers/<container_id>', methods=['GET'])
 @token_required
-def get_container_detail(current_user_id, house_id, container_id):
+@house_member_required()
+@house_etag
+def get_container_detail(current_user_id, house_id, container_id, role_cd):
     """
     특정 컨테이너의 상세 정보 조회
     """
     try:
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        if Config.ASYNC_READS:
+            container, path, child_preview = run_async(_get_container_detail_async(house_id, container_id))
+        else:
+            with get_db() as conn:
+                cur = conn.cursor(cursor_factory=RealDictCursor)
+            
+                # 컨테이너 상세 + 부모 경로(브레드크럼) + 하위 항목 미리보기를 한 번에 조회
+                cur.execute(
+                    """
+                    SELECT 
+                        c.id,
+                        c.name,
+                        c.house_id,
+                        c.up_container_id,
+                        c.type_cd,
+                        c.quantity,
+                        c.remk,
+                        c.owner_user_id,
+                        c.created_at,
+                        c.created_user,
+                        c.child_count,
+                
+                        -- 부모 경로 (브레드크럼용, materialized path의 조상 ID로 PK 조회)
+                        (SELECT json_agg(json_build_object('id', pc.id, 'name', pc.name) ORDER BY a.ord)
+                         FROM unnest(string_to_array(trim(both '/' from c.path), '/')) WITH ORDINALITY AS a(id, ord)
+                         JOIN containers pc ON pc.id = a.id AND pc.house_id = c.house_id) as path,
+                
+                        -- 하위 항목 미리보기 (영역/박스만, 최대 3개)
+                        CASE WHEN c.type_cd IN ('COM1200001', 'COM1200002') AND c.child_count > 0 THEN (
+                            SELECT COALESCE(json_agg(p ORDER BY p.type_cd, p.name), '[]'::json)
+                            FROM (
+                                SELECT 
+                                    ch.id,
+                                    ch.name,
+                                    ch.type_cd,
+                                    ch.quantity,
+                                    ch.owner_user_id
+                                FROM containers ch
+                                WHERE ch.up_container_id = c.id 
+                                  AND ch.house_id = c.house_id
+                                ORDER BY ch.type_cd, ch.name
+                                LIMIT 3
+                            ) p
+                        ) ELSE '[]'::json END as child_preview
+                    FROM containers c
+                    WHERE c.house_id = %s 
+                      AND c.id = %s
+                    """,
+                    (house_id, container_id)
+                )
+                container = cur.fetchone()
+            
+            path = container.pop('path') if container else None
+            child_preview = container.pop('child_preview') if container else None
         
-        # 권한 확인
-        cur.execute(
-            "SELECT role_cd FROM house_members WHERE house_id = %s AND user_id = %s",
-            (house_id, current_user_id)
-        )
-        if not cur.fetchone():
-            cur.close()
-            conn.close()
-            return jsonify({'error': '접근 권한이 없습니다'}), 403
+        if not container:
+            return jsonify({'error': '컨테이너를 찾을 수 없습니다'}), 404
         
-        # 컨테이너 상세 조회
-        cur.execute(
+        attach_code_names(container, {'type_cd': 'type_nm'})
+        attach_code_names(child_preview, {'type_cd': 'type_nm'})
+        attach_user_names(container, {'owner_user_id': 'owner_name', 'created_user': 'creator_name'})
+        attach_user_names(child_preview, {'owner_user_id': 'owner_name'})
+        
+        return jsonify({
+            'container': container,
+            'path': path or [],
+            'child_preview': child_preview
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+async def _get_container_detail_async(house_id, container_id):
+    # 상세 / 부모 경로 / 하위 항목 미리보기를 각각 다른 커넥션에서 동시에 조회
+    container, path, child_preview = await gather(
+        fetch_one(
             """
             SELECT 
                 c.id,
@@ -147,98 +178,60 @@ def get_container_detail(current_user_id, house_id, container_id):
                 c.house_id,
                 c.up_container_id,
                 c.type_cd,
-                cd.nm as type_nm,
                 c.quantity,
                 c.remk,
                 c.owner_user_id,
-                u.name as owner_name,
                 c.created_at,
                 c.created_user,
-                creator.name as creator_name,
-                (SELECT COUNT(*) 
-                 FROM containers 
-                 WHERE up_container_id = c.id 
-                 AND house_id = %s) as child_count
+                c.child_count
             FROM containers c
-            LEFT JOIN com_code_d cd ON c.type_cd = cd.cd
-            LEFT JOIN users u ON c.owner_user_id = u.id
-            LEFT JOIN users creator ON c.created_user = creator.id
             WHERE c.house_id = %s 
               AND c.id = %s
             """,
-            (house_id, house_id, container_id)
-        )
-        container = cur.fetchone()
-        
-        if not container:
-            cur.close()
-            conn.close()
-            return jsonify({'error': '컨테이너를 찾을 수 없습니다'}), 404
-        
-        # 부모 경로 조회 (브레드크럼용)
-        cur.execute(
+            (house_id, container_id)
+        ),
+        fetch_all(
             """
-            WITH RECURSIVE parent_path AS (
-                SELECT id, name, up_container_id, 1 as depth
-                FROM containers
-                WHERE id = %s AND house_id = %s
-                
-                UNION ALL
-                
-                SELECT c.id, c.name, c.up_container_id, pp.depth + 1
-                FROM containers c
-                JOIN parent_path pp ON c.id = pp.up_container_id
-                WHERE c.house_id = %s
-            )
-            SELECT id, name FROM parent_path
-            ORDER BY depth DESC
+            SELECT pc.id, pc.name
+            FROM containers c
+            CROSS JOIN unnest(string_to_array(trim(both '/' from c.path), '/')) WITH ORDINALITY AS a(id, ord)
+            JOIN containers pc ON pc.id = a.id AND pc.house_id = c.house_id
+            WHERE c.house_id = %s 
+              AND c.id = %s
+            ORDER BY a.ord
+            """,
+            (house_id, container_id)
+        ),
+        fetch_all(
+            """
+            SELECT 
+                ch.id,
+                ch.name,
+                ch.type_cd,
+                ch.quantity,
+                ch.owner_user_id
+            FROM containers ch
+            WHERE ch.up_container_id = %s 
+              AND ch.house_id = %s
+            ORDER BY ch.type_cd, ch.name
+            LIMIT 3
             """,
-            (container_id, house_id, house_id)
+            (container_id, house_id)
         )
-        path = cur.fetchall()
-        
-        # 하위 항목 미리보기 (영역/박스만, 최대 3개)
+    )
+    
+    # 하위 항목 미리보기는 영역/박스만
+    if not container or container['type_cd'] not in ('COM1200001', 'COM1200002'):
         child_preview = []
-        if container['type_cd'] in ['COM1200001', 'COM1200002']:  # 영역 또는 박스
-            cur.execute(
-                """
-                SELECT 
-                    c.id,
-                    c.name,
-                    c.type_cd,
-                    cd.nm as type_nm,
-                    c.quantity,
-                    c.owner_user_id,
-                    u.name as owner_name
-                FROM containers c
-                LEFT JOIN com_code_d cd ON c.type_cd = cd.cd
-                LEFT JOIN users u ON c.owner_user_id = u.id
-                WHERE c.up_container_id = %s 
-                  AND c.house_id = %s
-                ORDER BY c.type_cd, c.name
-                LIMIT 3
-                """,
-                (container_id, house_id)
-            )
-            child_preview = cur.fetchall()
-        
-        cur.close()
-        conn.close()
-        
-        return jsonify({
-            'container': container,
-            'path': path,
-            'child_preview': child_preview
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    
+    return container, path, child_preview
 
 
 # 3. 컨테이너 생성
 @containers_bp.route('/<house_id>/containers', methods=['POST'])
 @token_required
-def create_container(current_user_id, house_id):
+@house_member_required()
+def create_container(current_user_id, house_id, role_cd):
     """
     Request Body:
     {
@@ -270,78 +263,58 @@ def create_container(current_user_id, house_id):
             if quantity < 0:
                 return jsonify({'error': '수량은 0 이상이어야 합니다'}), 400
         
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        with get_db() as conn:
+            cur = conn.cursor(cursor_factory=RealDictCursor)
         
-        # 권한 확인
-        cur.execute(
-            "SELECT role_cd FROM house_members WHERE house_id = %s AND user_id = %s",
-            (house_id, current_user_id)
-        )
-        if not cur.fetchone():
-            cur.close()
-            conn.close()
-            return jsonify({'error': '접근 권한이 없습니다'}), 403
+            # 부모 확인 (parent_id가 있는 경우)
+            if parent_id:
+                cur.execute(
+                    "SELECT id FROM containers WHERE id = %s AND house_id = %s",
+                    (parent_id, house_id)
+                )
+                if not cur.fetchone():
+                    return jsonify({'error': '부모 컨테이너를 찾을 수 없습니다'}), 404
         
-        # 부모 확인 (parent_id가 있는 경우)
-        if parent_id:
+            # 컨테이너 생성
             cur.execute(
-                "SELECT id FROM containers WHERE id = %s AND house_id = %s",
-                (parent_id, house_id)
+                """
+                INSERT INTO containers 
+                (house_id, up_container_id, type_cd, name, quantity, owner_user_id, remk, created_user, updated_user)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING id, name, type_cd, created_at
+                """,
+                (house_id, parent_id, type_cd, name, quantity, owner_user_id, remk, current_user_id, current_user_id)
             )
-            if not cur.fetchone():
-                cur.close()
-                conn.close()
-                return jsonify({'error': '부모 컨테이너를 찾을 수 없습니다'}), 404
+            container = cur.fetchone()
         
-        # 컨테이너 생성
-        cur.execute(
-            """
-            INSERT INTO containers 
-            (house_id, up_container_id, type_cd, name, quantity, owner_user_id, remk, created_user, updated_user)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id, name, type_cd, created_at
-            """,
-            (house_id, parent_id, type_cd, name, quantity, owner_user_id, remk, current_user_id, current_user_id)
-        )
-        container = cur.fetchone()
-        
-        # ============================================
-        # container_logs 기록 추가 (생성)
-        # ============================================
-        log_remk = f"{name} 생성"
+            # ============================================
+            # container_logs 기록 추가 (생성)
+            # ============================================
+            log_remk = f"{name} 생성"
 
-        cur.execute(
-            """
-            INSERT INTO container_logs
-            (container_id, container_name, container_type_cd, act_cd,
-             to_container_id, to_house_id, to_quantity, to_owner_user_id,
-             to_remk, log_remk, created_user, updated_user)
-            VALUES (%s, %s, %s, 'COM1300001', %s, %s, %s, %s, %s, %s, %s, %s)
-            """,
-            (container['id'], name, type_cd, parent_id, house_id, quantity, owner_user_id,
-             remk, log_remk, current_user_id, current_user_id)
-        )
+            write_logs(cur, [make_log(
+                container_id=container['id'], container_name=name, container_type_cd=type_cd,
+                act_cd='COM1300001', to_container_id=parent_id, to_house_id=house_id,
+                to_quantity=quantity, to_owner_user_id=owner_user_id, to_remk=remk,
+                log_remk=log_remk, created_user=current_user_id, updated_user=current_user_id
+            )])
         
-        conn.commit()
-        cur.close()
-        conn.close()
+            conn.commit()
         
-        return jsonify({
-            'message': '컨테이너가 생성되었습니다',
-            'container': container
-        }), 201
+            return jsonify({
+                'message': '컨테이너가 생성되었습니다',
+                'container': container
+            }), 201
         
     except Exception as e:
-        if conn:
-            conn.rollback()
         return jsonify({'error': str(e)}), 500
 
 
 # 4. 컨테이너 수정 (up_container_id 이동 기능 추가됨)
 @containers_bp.route('/<house_id>/containers/<container_id>', methods=['PATCH'])
 @token_required
-def update_container(current_user_id, house_id, container_id):
+@house_member_required()
+def update_container(current_user_id, house_id, container_id, role_cd):
     """
     Request Body:
     {
@@ -355,367 +328,342 @@ def update_container(current_user_id, house_id, container_id):
     try:
         data = request.json
         
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # 권한 확인
-        cur.execute(
-            "SELECT role_cd FROM house_members WHERE house_id = %s AND user_id = %s",
-            (house_id, current_user_id)
-        )
-        if not cur.fetchone():
-            cur.close()
-            conn.close()
-            return jsonify({'error': '접근 권한이 없습니다'}), 403
-        
-        # 컨테이너 존재 확인
-        cur.execute(
-            "SELECT type_cd FROM containers WHERE id = %s AND house_id = %s",
-            (container_id, house_id)
-        )
-        container = cur.fetchone()
-        
-        if not container:
-            cur.close()
-            conn.close()
-            return jsonify({'error': '컨테이너를 찾을 수 없습니다'}), 404
+        with get_db() as conn:
+            cur = conn.cursor(cursor_factory=RealDictCursor)
         
-        # 업데이트할 필드 구성
-        update_fields = []
-        params = []
-        
-        if 'name' in data:
-            update_fields.append("name = %s")
-            params.append(data['name'])
-        
-        # up_container_id 수정 (이동 기능) - 새로 추가된 부분
-        if 'up_container_id' in data:
-            # 부모 컨테이너 유효성 검사
-            new_parent_id = data['up_container_id']
-            if new_parent_id is not None:
-                cur.execute(
-                    "SELECT id, type_cd FROM containers WHERE id = %s AND house_id = %s",
-                    (new_parent_id, house_id)
-                )
-                parent = cur.fetchone()
-                if not parent:
-                    cur.close()
-                    conn.close()
-                    return jsonify({'error': '부모 컨테이너를 찾을 수 없습니다'}), 404
-                # 물품은 물품 안에 들어갈 수 없음
-                if parent['type_cd'] == 'COM1200003':
-                    cur.close()
-                    conn.close()
-                    return jsonify({'error': '물품 안에는 다른 항목을 넣을 수 없습니다'}), 400
-                # 자기 자신의 하위로 이동 불가 (순환 참조 방지)
-                if new_parent_id == container_id:
-                    cur.close()
-                    conn.close()
-                    return jsonify({'error': '자기 자신의 하위로 이동할 수 없습니다'}), 400
-            
-            update_fields.append("up_container_id = %s")
-            params.append(new_parent_id)
-        
-        # 물품일 때만 추가 필드 수정 가능
-        if container['type_cd'] == 'COM1200003':
-            if 'quantity' in data:
-                if data['quantity'] < 0:
-                    cur.close()
-                    conn.close()
-                    return jsonify({'error': '수량은 0 이상이어야 합니다'}), 400
-                update_fields.append("quantity = %s")
-                params.append(data['quantity'])
-            
-            if 'owner_user_id' in data:
-                update_fields.append("owner_user_id = %s")
-                params.append(data['owner_user_id'])
-            
-            if 'remk' in data:
-                update_fields.append("remk = %s")
-                params.append(data['remk'])
-        
-        if not update_fields:
-            cur.close()
-            conn.close()
-            return jsonify({'error': '수정할 내용이 없습니다'}), 400
-        
-        # ============================================
-        # 원본 데이터 조회 (로그용) - UPDATE 전에 조회!
-        # ============================================
-        cur.execute(
-            """
-            SELECT name, type_cd, up_container_id, quantity, owner_user_id, remk
-            FROM containers
-            WHERE id = %s AND house_id = %s
-            """,
-            (container_id, house_id)
-        )
-        original = cur.fetchone()
-        
-        # updated_user 추가
-        update_fields.append("updated_user = %s")
-        params.append(current_user_id)
-        
-        # 쿼리 실행
-        params.extend([container_id, house_id])
-        query = f"""
-            UPDATE containers 
-            SET {', '.join(update_fields)}, updated_at = CURRENT_TIMESTAMP
-            WHERE id = %s AND house_id = %s
-            RETURNING id, name, updated_at
-        """
-        
-        cur.execute(query, params)
-        updated = cur.fetchone()
-        
-        # ============================================
-        # container_logs 기록 추가
-        # ============================================
-        
-        # 변경 내용 체크
-        location_changed = 'up_container_id' in data and data['up_container_id'] != original.get('up_container_id')
-        name_changed = 'name' in data and data['name'] != original.get('name')
-        quantity_changed = 'quantity' in data and data['quantity'] != original.get('quantity')
-        owner_changed = 'owner_user_id' in data and data['owner_user_id'] != original.get('owner_user_id')
-        remk_changed = 'remk' in data and data['remk'] != original.get('remk')
-        
-        # 1. 위치 이동만 변경된 경우 - 이동 로그
-        if location_changed and not (name_changed or quantity_changed or owner_changed or remk_changed):
+            # ============================================
+            # 원본 데이터 조회 (존재 확인 + 로그용) - UPDATE 전에 조회!
+            # ============================================
             cur.execute(
                 """
-                INSERT INTO container_logs
-                (container_id, container_name, container_type_cd, act_cd,
-                 from_container_id, to_container_id,
-                 from_house_id, to_house_id, created_user, updated_user)
-                VALUES (%s, %s, %s, 'COM1300003', %s, %s, %s, %s, %s, %s)
+                SELECT id, name, type_cd, up_container_id, quantity, owner_user_id, remk
+                FROM containers
+                WHERE id = %s AND house_id = %s
                 """,
-                (container_id, original.get('name'), original.get('type_cd'),
-                 original.get('up_container_id'), data['up_container_id'],
-                 house_id, house_id, current_user_id, current_user_id)
+                (container_id, house_id)
             )
+            original = cur.fetchone()
+        
+            if not original:
+                return jsonify({'error': '컨테이너를 찾을 수 없습니다'}), 404
+        
+            # 적용할 변경 내용 구성
+            changes, error = _collect_changes(original, data)
+            if error:
+                return jsonify({'error': error}), 400
+            if 'owner_user_id' in changes and _find_unknown_owners(cur, [changes['owner_user_id']]):
+                return jsonify({'error': '존재하지 않는 소유자입니다'}), 400
+        
+            # 위치 이동 (부모 유효성/순환 검사 + 자손 path 갱신, 로그는 아래에서 기록)
+            moved = None
+            if 'up_container_id' in changes:
+                try:
+                    moved = move_subtree(cur, house_id, container_id, house_id, changes['up_container_id'],
+                                         current_user_id, log_root=False)
+                except SubtreeMoveError as e:
+                    return jsonify({'error': str(e)}), e.status_code
+        
+            # 이동 외 필드 수정 (updated_user 포함)
+            update_fields = [f"{field} = %s" for field in UPDATABLE_FIELDS if field in changes]
+            params = [changes[field] for field in UPDATABLE_FIELDS if field in changes]
+            update_fields.append("updated_user = %s")
+            params.append(current_user_id)
+        
+            # 쿼리 실행
+            params.extend([container_id, house_id])
+            query = f"""
+                UPDATE containers 
+                SET {', '.join(update_fields)}, updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s AND house_id = %s
+                RETURNING id, name, updated_at
+            """
         
-        # 2. 위치 이동 외 변경사항이 있으면 - 통합 수정 로그
-        elif name_changed or quantity_changed or owner_changed or remk_changed or location_changed:
-            log_parts = []
-            
-            # 위치 변경
-            if location_changed:
-                log_parts.append(f"위치 이동")
-            
-            # 이름 변경
-            if name_changed:
-                log_parts.append(f"이름 변경: {original.get('name', '')} → {data['name']}")
-            
-            # 수량 변경
-            if quantity_changed:
-                log_parts.append(f"수량 변경: {original.get('quantity', 0)}개 → {data['quantity']}개")
-            
-            # 소유자 변경
-            if owner_changed:
-                # 소유자 이름 조회
-                from_owner_name = None
-                to_owner_name = None
-                
-                if original.get('owner_user_id'):
-                    cur.execute("SELECT name FROM users WHERE id = %s", (original['owner_user_id'],))
-                    from_owner = cur.fetchone()
-                    from_owner_name = from_owner['name'] if from_owner else None
-                
-                if data.get('owner_user_id'):
-                    cur.execute("SELECT name FROM users WHERE id = %s", (data['owner_user_id'],))
-                    to_owner = cur.fetchone()
-                    to_owner_name = to_owner['name'] if to_owner else None
-                
-                from_text = from_owner_name or '없음'
-                to_text = to_owner_name or '없음'
-                log_parts.append(f"소유자 변경: {from_text} → {to_text}")
-            
-            # 메모 변경
-            if remk_changed:
-                from_remk = original.get('remk') or '없음'
-                to_remk = data.get('remk') or '없음'
-                log_parts.append(f"메모 변경: {from_remk} → {to_remk}")
-            
-            # 통합 수정 로그 생성
-            cur.execute(
-                """
-                INSERT INTO container_logs
-                (container_id, container_name, container_type_cd, act_cd,
-                 from_container_id, to_container_id,
-                 from_house_id, to_house_id,
-                 from_quantity, to_quantity, from_owner_user_id, to_owner_user_id,
-                 from_remk, to_remk, log_remk, created_user, updated_user)
-                VALUES (%s, %s, %s, 'COM1300004', %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (container_id, original.get('name'), original.get('type_cd'),
-                 original.get('up_container_id') if location_changed else None,
-                 data.get('up_container_id') if location_changed else None,
-                 house_id,
-                 house_id,
-                 original.get('quantity') if quantity_changed else None,
-                 data.get('quantity') if quantity_changed else None,
-                 original.get('owner_user_id') if owner_changed else None,
-                 data.get('owner_user_id') if owner_changed else None,
-                 original.get('remk') if remk_changed else None,
-                 data.get('remk') if remk_changed else None,
-                 '\n'.join(log_parts),
-                 current_user_id, current_user_id)
-            )
+            cur.execute(query, params)
+            updated = cur.fetchone()
         
-        conn.commit()
-        cur.close()
-        conn.close()
+            # container_logs 기록 (이동만 → 이동 로그, 그 외 → 통합 수정 로그)
+            owner_names = _fetch_owner_names(cur, [(original, changes)])
+            log_row = _build_update_log(original, changes, house_id, current_user_id, owner_names)
+            if log_row:
+                write_logs(cur, [log_row])
         
-        return jsonify({
-            'message': '컨테이너가 수정되었습니다',
-            'container': updated
-        }), 200
+            conn.commit()
+        
+            result = {
+                'message': '컨테이너가 수정되었습니다',
+                'container': updated
+            }
+            if moved:
+                result['moved_count'] = moved['moved_count']
+                result['elapsed_ms'] = moved['elapsed_ms']
+        
+            return jsonify(result), 200
         
     except Exception as e:
-        if conn:
-            conn.rollback()
         return jsonify({'error': str(e)}), 500
 
+# 컨테이너 수정 공통 처리 (4. 단건 수정 / 11. 일괄 수정)
+UPDATABLE_FIELDS = ('name', 'quantity', 'owner_user_id', 'remk')
+ITEM_ONLY_FIELDS = ('quantity', 'owner_user_id', 'remk')
+
+
+def _collect_changes(original, data):
+    """
+    요청 본문에서 실제로 바뀌는 필드만 추출 -> (changes, error)
+
+    물품 전용 필드(quantity, owner_user_id, remk)는 물품일 때만 반영합니다.
+    """
+    requested = [field for field in ('name', 'up_container_id') if field in data]
+    if original['type_cd'] == 'COM1200003':
+        requested += [field for field in ITEM_ONLY_FIELDS if field in data]
+
+    if not requested:
+        return None, '수정할 내용이 없습니다'
+
+    if 'name' in requested:
+        if not isinstance(data['name'], str) or not data['name'].strip():
+            return None, '이름은 필수입니다'
+        if len(data['name']) > 200:
+            return None, '이름은 200자 이하여야 합니다'
+
+    if 'quantity' in requested and (
+        not isinstance(data['quantity'], int) or isinstance(data['quantity'], bool) or data['quantity'] < 0
+    ):
+        return None, '수량은 0 이상이어야 합니다'
+
+    for field in ('up_container_id', 'owner_user_id', 'remk'):
+        if field in requested and data[field] is not None and not isinstance(data[field], str):
+            return None, f'{field}는 문자열이어야 합니다'
+
+    changes = {field: data[field] for field in requested if data[field] != original.get(field)}
+    return changes, None
+
+
+def _find_unknown_owners(cur, owner_ids):
+    """존재하지 않는 소유자 ID 집합 (한 번의 조회로 확인)"""
+    owner_ids = list({owner_id for owner_id in owner_ids if owner_id is not None})
+    if not owner_ids:
+        return set()
+
+    cur.execute("SELECT id FROM users WHERE id = ANY(%s)", (owner_ids,))
+    return set(owner_ids) - {row['id'] for row in cur.fetchall()}
+
+
+def _fetch_owner_names(cur, pairs):
+    """소유자 변경 로그용 사용자 이름을 한 번에 조회 (pairs: [(original, changes)])"""
+    return resolve_user_names(
+        (user_id
+         for original, changes in pairs if 'owner_user_id' in changes
+         for user_id in (original.get('owner_user_id'), changes['owner_user_id'])),
+        cur=cur
+    )
+
+
+def _build_update_log(original, changes, house_id, current_user_id, owner_names):
+    """
+    수정 로그 한 행 생성 (make_log 형식, 변경 없으면 None)
+
+    1. 위치 이동만 변경된 경우 - 이동 로그 (COM1300003)
+    2. 위치 이동 외 변경사항이 있으면 - 통합 수정 로그 (COM1300004)
+    """
+    if not changes:
+        return None
+
+    location_changed = 'up_container_id' in changes
+    name_changed = 'name' in changes
+    quantity_changed = 'quantity' in changes
+    owner_changed = 'owner_user_id' in changes
+    remk_changed = 'remk' in changes
+
+    if location_changed and len(changes) == 1:
+        return make_log(
+            container_id=original['id'], container_name=original.get('name'),
+            container_type_cd=original.get('type_cd'), act_cd='COM1300003',
+            from_container_id=original.get('up_container_id'), to_container_id=changes['up_container_id'],
+            from_house_id=house_id, to_house_id=house_id,
+            created_user=current_user_id, updated_user=current_user_id
+        )
+
+    log_parts = []
+
+    # 위치 변경
+    if location_changed:
+        log_parts.append("위치 이동")
+
+    # 이름 변경
+    if name_changed:
+        log_parts.append(f"이름 변경: {original.get('name', '')} → {changes['name']}")
+
+    # 수량 변경
+    if quantity_changed:
+        log_parts.append(f"수량 변경: {original.get('quantity', 0)}개 → {changes['quantity']}개")
+
+    # 소유자 변경
+    if owner_changed:
+        from_text = owner_names.get(original.get('owner_user_id')) or '없음'
+        to_text = owner_names.get(changes['owner_user_id']) or '없음'
+        log_parts.append(f"소유자 변경: {from_text} → {to_text}")
+
+    # 메모 변경
+    if remk_changed:
+        from_remk = original.get('remk') or '없음'
+        to_remk = changes['remk'] or '없음'
+        log_parts.append(f"메모 변경: {from_remk} → {to_remk}")
+
+    return make_log(
+        container_id=original['id'], container_name=original.get('name'),
+        container_type_cd=original.get('type_cd'), act_cd='COM1300004',
+        from_container_id=original.get('up_container_id') if location_changed else None,
+        to_container_id=changes['up_container_id'] if location_changed else None,
+        from_house_id=house_id,
+        to_house_id=house_id,
+        from_quantity=original.get('quantity') if quantity_changed else None,
+        to_quantity=changes['quantity'] if quantity_changed else None,
+        from_owner_user_id=original.get('owner_user_id') if owner_changed else None,
+        to_owner_user_id=changes['owner_user_id'] if owner_changed else None,
+        from_remk=original.get('remk') if remk_changed else None,
+        to_remk=changes['remk'] if remk_changed else None,
+        log_remk='\n'.join(log_parts),
+        created_user=current_user_id, updated_user=current_user_id
+    )
 
 # 5. 컨테이너 삭제
 @containers_bp.route('/<house_id>/containers/<container_id>', methods=['DELETE'])
 @token_required
-def delete_container(current_user_id, house_id, container_id):
+@house_member_required()
+def delete_container(current_user_id, house_id, container_id, role_cd):
     """
     컨테이너 삭제 (하위 항목도 CASCADE 삭제됨)
     """
     try:
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        with get_db() as conn:
+            cur = conn.cursor(cursor_factory=RealDictCursor)
         
-        # 권한 확인
-        cur.execute(
-            "SELECT role_cd FROM house_members WHERE house_id = %s AND user_id = %s",
-            (house_id, current_user_id)
-        )
-        if not cur.fetchone():
-            cur.close()
-            conn.close()
-            return jsonify({'error': '접근 권한이 없습니다'}), 403
-        
-        # 컨테이너 존재 확인 및 상세 정보 조회
-        cur.execute(
-            """
-            SELECT name, type_cd, up_container_id, quantity, owner_user_id, remk
-            FROM containers
-            WHERE id = %s AND house_id = %s
-            """,
-            (container_id, house_id)
-        )
-        container = cur.fetchone()
+            # 컨테이너 존재 확인 및 상세 정보 조회
+            cur.execute(
+                """
+                SELECT name, type_cd, up_container_id, quantity, owner_user_id, remk
+                FROM containers
+                WHERE id = %s AND house_id = %s
+                """,
+                (container_id, house_id)
+            )
+            container = cur.fetchone()
 
-        if not container:
-            cur.close()
-            conn.close()
-            return jsonify({'error': '컨테이너를 찾을 수 없습니다'}), 404
+            if not container:
+                return jsonify({'error': '컨테이너를 찾을 수 없습니다'}), 404
 
-        # ============================================
-        # container_logs 기록 추가 (삭제) - 삭제 전에 기록
-        # ============================================
-        log_remk = f"삭제: {container['name']}"
-        if container['up_container_id']:
-            log_remk += f", 위치: {container['up_container_id']}"
+            # ============================================
+            # container_logs 기록 추가 (삭제) - 삭제 전에 기록
+            # ============================================
+            log_remk = f"삭제: {container['name']}"
+            if container['up_container_id']:
+                log_remk += f", 위치: {container['up_container_id']}"
 
-        cur.execute(
-            """
-            INSERT INTO container_logs
-            (container_id, container_name, container_type_cd, act_cd,
-             from_container_id, from_house_id, from_quantity, from_owner_user_id,
-             from_remk, log_remk, created_user, updated_user)
-            VALUES (%s, %s, %s, 'COM1300007', %s, %s, %s, %s, %s, %s, %s, %s)
-            """,
-            (container_id, container['name'], container['type_cd'],
-             container['up_container_id'], house_id, container.get('quantity'),
-             container.get('owner_user_id'), container.get('remk'), log_remk,
-             current_user_id, current_user_id)
-        )
-        
-        # 삭제
-        cur.execute(
-            "DELETE FROM containers WHERE id = %s AND house_id = %s",
-            (container_id, house_id)
-        )
+            write_logs(cur, [make_log(
+                container_id=container_id, container_name=container['name'],
+                container_type_cd=container['type_cd'], act_cd='COM1300007',
+                from_container_id=container['up_container_id'], from_house_id=house_id,
+                from_quantity=container.get('quantity'), from_owner_user_id=container.get('owner_user_id'),
+                from_remk=container.get('remk'), log_remk=log_remk,
+                created_user=current_user_id, updated_user=current_user_id
+            )])
+        
+            # 삭제
+            cur.execute(
+                "DELETE FROM containers WHERE id = %s AND house_id = %s",
+                (container_id, house_id)
+            )
         
-        conn.commit()
-        cur.close()
-        conn.close()
+            conn.commit()
         
-        return jsonify({
-            'message': f'"{container["name"]}"이(가) 삭제되었습니다'
-        }), 200
+            return jsonify({
+                'message': f'"{container["name"]}"이(가) 삭제되었습니다'
+            }), 200
         
     except Exception as e:
-        if conn:
-            conn.rollback()
         return jsonify({'error': str(e)}), 500
 
 
 # 6. 컨테이너 검색
 @containers_bp.route('/<house_id>/containers/search', methods=['GET'])
 @token_required
-def search_containers(current_user_id, house_id):
+@house_member_required()
+@house_etag
+def search_containers(current_user_id, house_id, role_cd):
     """
+    이름/메모 trigram 검색 (부분 일치 + 오타 허용, 관련도 순 정렬)
+
     Query Parameters:
     - q: 검색어 (필수)
     - type: 타입 필터 (optional: area, box, item)
+    - limit: 조회 개수 (기본 50개, 최대 SEARCH_MAX_LIMIT)
+    - offset: 건너뛸 개수 (기본 0)
+    - fields: 응답 목록에 포함할 필드 (쉼표 구분, optional, 예: id,name,type_nm)
+
+    관련도: 이름 완전 일치 > 접두사 일치 > 부분 일치 > 유사도(오타), 메모 일치는 가산점
     """
     try:
         query = request.args.get('q', '').strip()
         type_filter = request.args.get('type')
+        limit = min(max(request.args.get('limit', 50, type=int), 1), Config.SEARCH_MAX_LIMIT)
+        offset = max(request.args.get('offset', 0, type=int), 0)
         
         if not query:
             return jsonify({'error': '검색어를 입력해주세요'}), 400
         
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        escaped = _escape_like(query)
+        prefix_pattern = f'{escaped}%'
+        contains_pattern = f'%{escaped}%'
         
-        # 권한 확인
-        cur.execute(
-            "SELECT role_cd FROM house_members WHERE house_id = %s AND user_id = %s",
-            (house_id, current_user_id)
-        )
-        if not cur.fetchone():
-            cur.close()
-            conn.close()
-            return jsonify({'error': '접근 권한이 없습니다'}), 403
+        # 검색 쿼리 구성
+        # - 유사도 임계값은 같은 요청(트랜잭션) 안에서만 적용
+        # - 경로는 현재 페이지 결과 행에 대해서만 materialized path로 계산
+        threshold_sql = """
+            SELECT set_config('pg_trgm.similarity_threshold', %s, true),
+                   set_config('pg_trgm.word_similarity_threshold', %s, true);
+        """
+        threshold_params = [
+            str(Config.SEARCH_SIMILARITY_THRESHOLD), str(Config.SEARCH_WORD_SIMILARITY_THRESHOLD)
+        ]
         
-        # 검색 쿼리 구성 - ARRAY 타입 명시적 캐스팅
         sql = """
-            WITH RECURSIVE parent_path AS (
-                SELECT id, name, up_container_id, ARRAY[name::text] as path
-                FROM containers
-                WHERE house_id = %s AND up_container_id IS NULL
-                
-                UNION ALL
-                
-                SELECT c.id, c.name, c.up_container_id, pp.path || c.name::text
-                FROM containers c
-                JOIN parent_path pp ON c.up_container_id = pp.id
-                WHERE c.house_id = %s
-            )
             SELECT 
                 c.id,
                 c.name,
                 c.type_cd,
-                cd.nm as type_nm,
                 c.quantity,
                 c.owner_user_id,
-                u.name as owner_name,
-                array_to_string(pp.path, ' > ') as path
-            FROM containers c
-            LEFT JOIN com_code_d cd ON c.type_cd = cd.cd
-            LEFT JOIN users u ON c.owner_user_id = u.id
-            LEFT JOIN parent_path pp ON c.id = pp.id
-            WHERE c.house_id = %s 
-              AND c.name ILIKE %s
+                (SELECT string_agg(pc.name, ' > ' ORDER BY a.ord)
+                 FROM unnest(string_to_array(trim(both '/' from c.path), '/')) WITH ORDINALITY AS a(id, ord)
+                 JOIN containers pc ON pc.id = a.id) as path,
+                round(c.score::numeric, 3) as score
+            FROM (
+                SELECT id, name, type_cd, quantity, owner_user_id, path,
+                    CASE WHEN lower(name) = lower(%s) THEN 3
+                         WHEN name ILIKE %s THEN 2
+                         WHEN name ILIKE %s THEN 1
+                         ELSE 0 END
+                    + GREATEST(similarity(name, %s), word_similarity(%s, name))
+                    + CASE WHEN remk ILIKE %s THEN 0.1 ELSE 0 END as score
+                FROM containers
+                WHERE house_id = %s 
+                  AND (name ILIKE %s
+                       OR %s <%% name
+                       OR name %% %s
+                       OR remk ILIKE %s)
+                  {type_condition}
+                ORDER BY score DESC, type_cd, name
+                LIMIT %s OFFSET %s
+            ) c
+            ORDER BY c.score DESC, c.type_cd, c.name
         """
         
-        params = [house_id, house_id, house_id, f'%{query}%']
+        params = [
+            query, prefix_pattern, contains_pattern, query, query, contains_pattern,
+            house_id, contains_pattern, query, query, contains_pattern
+        ]
+        type_condition = ''
         
         # 타입 필터
         if type_filter:
@@ -725,77 +673,85 @@ def search_containers(current_user_id, house_id):
                 'item': 'COM1200003'
             }
             if type_filter in type_map:
-                sql += " AND c.type_cd = %s"
+                type_condition = "AND type_cd = %s"
                 params.append(type_map[type_filter])
         
-        sql += " ORDER BY c.type_cd, c.name LIMIT 50"
+        # 다음 페이지 존재 여부 확인을 위해 1개 더 조회
+        params.extend([limit + 1, offset])
+        sql = sql.format(type_condition=type_condition)
         
-        cur.execute(sql, params)
-        results = cur.fetchall()
+        if Config.ASYNC_READS:
+            results = run_async(fetch_all(sql, params, setup=[(threshold_sql, threshold_params)]))
+        else:
+            with get_db() as conn:
+                cur = conn.cursor()
+                cur.execute(threshold_sql + sql, threshold_params + params)
+                results = fetch_dicts(cur)
         
-        cur.close()
-        conn.close()
+        has_more = len(results) > limit
+        results = attach_code_names(results[:limit], {'type_cd': 'type_nm'})
+        attach_user_names(results, {'owner_user_id': 'owner_name'})
         
         return jsonify({
-            'results': results,
-            'count': len(results)
+            'results': project(results, parse_fields(request.args)),
+            'count': len(results),
+            'has_more': has_more
         }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+def _escape_like(value):
+    # LIKE 패턴 특수문자(%, _, \) 이스케이프
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
 # 7. 컨테이너 히스토리 조회
 @containers_bp.route('/<house_id>/containers/<container_id>/logs', methods=['GET'])
 @token_required
-def get_container_logs(current_user_id, house_id, container_id):
+@house_member_required()
+def get_container_logs(current_user_id, house_id, container_id, role_cd):
     """
-    특정 컨테이너의 변경 이력 조회
+    특정 컨테이너의 변경 이력 조회 (최신순, 커서 기반 페이지네이션)
+
+    Query Parameters:
+    - limit: 조회할 로그 개수 (기본 50개, 최대 100개)
+    - cursor: 이전 응답의 next_cursor (optional, 없으면 최신부터)
+    - fields: 응답 목록에 포함할 필드 (쉼표 구분, optional, 예: id,name,type_nm)
     """
     try:
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # 권한 확인
-        cur.execute(
-            "SELECT role_cd FROM house_members WHERE house_id = %s AND user_id = %s",
-            (house_id, current_user_id)
-        )
-        if not cur.fetchone():
-            cur.close()
-            conn.close()
-            return jsonify({'error': '접근 권한이 없습니다'}), 403
-        
-        # 컨테이너 존재 확인
-        cur.execute(
-            "SELECT id FROM containers WHERE id = %s AND house_id = %s",
-            (container_id, house_id)
-        )
-        if not cur.fetchone():
-            cur.close()
-            conn.close()
-            return jsonify({'error': '컨테이너를 찾을 수 없습니다'}), 404
-        
-        # 현재 컨테이너가 속한 집 이름 조회
-        cur.execute(
-            """
+        limit = min(max(request.args.get('limit', 50, type=int), 1), 100)
+        
+        cursor = request.args.get('cursor')
+        cursor_condition = ''
+        cursor_params = []
+        if cursor:
+            try:
+                cursor_created_at, cursor_id = decode_cursor(cursor)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            # created_at 단독 조건은 월별 파티션 제외(pruning)용
+            cursor_condition = "AND cl.created_at <= %s AND (cl.created_at, cl.id) < (%s, %s)"
+            cursor_params = [cursor_created_at, cursor_created_at, cursor_id]
+        
+        exists_sql = "SELECT id FROM containers WHERE id = %s AND house_id = %s"
+        exists_params = (container_id, house_id)
+        
+        # 현재 컨테이너가 속한 집 이름
+        house_sql = """
             SELECT h.name
             FROM houses h
             WHERE h.id = %s
-            """,
-            (house_id,)
-        )
-        house_result = cur.fetchone()
-        current_house_name = house_result['name'] if house_result else ''
-
-        # 히스토리 조회 (상세 정보 포함)
-        cur.execute(
-            """
+        """
+        house_params = (house_id,)
+        
+        # 히스토리 (상세 정보 포함)
+        logs_sql = """
             SELECT
                 cl.id,
                 cl.container_id,
                 cl.act_cd,
-                cd.nm as act_nm,
 
                 -- 위치 정보
                 cl.from_container_id,
@@ -811,9 +767,7 @@ def get_container_logs(current_user_id, house_id, container_id):
 
                 -- 소유자 정보
                 cl.from_owner_user_id,
-                fo.name as from_owner_name,
                 cl.to_owner_user_id,
-                tou.name as to_owner_name,
 
                 -- 수량 정보
                 cl.from_quantity,
@@ -827,41 +781,65 @@ def get_container_logs(current_user_id, house_id, container_id):
                 cl.log_remk,
                 TO_CHAR(cl.created_at, 'YYYY-MM-DD HH24:MI:SS') as created_at,
                 cl.created_user,
-                creator.name as creator_name
+                cl.created_at as cursor_created_at
 
             FROM container_logs cl
-            LEFT JOIN com_code_d cd ON cl.act_cd = cd.cd
             LEFT JOIN containers fc ON cl.from_container_id = fc.id
             LEFT JOIN containers tc ON cl.to_container_id = tc.id
             LEFT JOIN houses fh ON cl.from_house_id = fh.id
             LEFT JOIN houses th ON cl.to_house_id = th.id
-            LEFT JOIN users fo ON cl.from_owner_user_id = fo.id
-            LEFT JOIN users tou ON cl.to_owner_user_id = tou.id
-            LEFT JOIN users creator ON cl.created_user = creator.id
-
-            WHERE cl.container_id = %s
-            ORDER BY cl.created_at DESC
-            """,
-            (container_id,)
-        )
-
-        logs = cur.fetchall()
-
-        cur.close()
-        conn.close()
 
+            WHERE cl.container_id = %s {cursor_condition}
+            ORDER BY cl.created_at DESC, cl.id DESC
+            LIMIT %s
+        """.format(cursor_condition=cursor_condition)
+        logs_params = [container_id, *cursor_params, limit + 1]
+        
+        if Config.ASYNC_READS:
+            # 세 쿼리는 서로 독립적이므로 동시에 실행
+            container, house_result, logs = run_async(gather(
+                fetch_one(exists_sql, exists_params),
+                fetch_one(house_sql, house_params),
+                fetch_all(logs_sql, logs_params)
+            ))
+        else:
+            with get_db() as conn:
+                cur = conn.cursor()
+            
+                # 컨테이너 존재 확인
+                cur.execute(exists_sql, exists_params)
+                container = cur.fetchone()
+                house_result = logs = None
+                if container:
+                    cur.execute(house_sql, house_params)
+                    house_result = fetch_dict(cur)
+                    cur.execute(logs_sql, logs_params)
+                    logs = fetch_dicts(cur)
+        
+        if not container:
+            return jsonify({'error': '컨테이너를 찾을 수 없습니다'}), 404
+        
+        current_house_name = house_result['name'] if house_result else ''
+        logs, next_cursor = paginate_logs(logs, limit)
+        attach_code_names(logs, {'act_cd': 'act_nm'})
+        attach_user_names(logs, LOG_USER_NAME_FIELDS)
+        
         return jsonify({
-            'logs': logs,
+            'logs': project(logs, parse_fields(request.args)),
             'count': len(logs),
-            'current_house_name': current_house_name
+            'current_house_name': current_house_name,
+            'next_cursor': next_cursor
         }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+
 # 9. 집 간 컨테이너 이동 (새 API)
 @containers_bp.route('/<house_id>/containers/<container_id>/move', methods=['PATCH'])
 @token_required
-def move_container_cross_house(current_user_id, house_id, container_id):
+@house_member_required('출발지 집에 대한 권한이 없습니다')
+def move_container_cross_house(current_user_id, house_id, container_id, role_cd):
     """
     집 간 컨테이너 이동 (house_id 변경 가능)
     
@@ -876,139 +854,375 @@ def move_container_cross_house(current_user_id, house_id, container_id):
         parent_id = data.get('parent_id')
         to_house_id = data.get('to_house_id', house_id)  # 기본값은 같은 집
         
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        # 목적지 집 권한 확인 (다른 집으로 이동하는 경우)
+        if to_house_id != house_id and get_member_role(to_house_id, current_user_id, use_cache=False) is None:
+            return jsonify({'error': '목적지 집에 대한 권한이 없습니다'}), 403
         
-        # 출발지 집 권한 확인
-        cur.execute(
-            "SELECT role_cd FROM house_members WHERE house_id = %s AND user_id = %s",
-            (house_id, current_user_id)
-        )
-        if not cur.fetchone():
-            cur.close()
-            conn.close()
-            return jsonify({'error': '출발지 집에 대한 권한이 없습니다'}), 403
+        with get_db() as conn:
+            cur = conn.cursor(cursor_factory=RealDictCursor)
         
-        # 목적지 집 권한 확인 (다른 집으로 이동하는 경우)
-        if to_house_id != house_id:
-            cur.execute(
-                "SELECT role_cd FROM house_members WHERE house_id = %s AND user_id = %s",
-                (to_house_id, current_user_id)
-            )
-            if not cur.fetchone():
-                cur.close()
-                conn.close()
-                return jsonify({'error': '목적지 집에 대한 권한이 없습니다'}), 403
+            # 순환 검사 + 서브트리 전체 이동 + 이동 로그 (utils/subtree_move.py)
+            try:
+                moved = move_subtree(cur, house_id, container_id, to_house_id, parent_id, current_user_id)
+            except SubtreeMoveError as e:
+                return jsonify({'error': str(e)}), e.status_code
         
-        # 컨테이너 존재 확인 및 원본 데이터 조회
-        cur.execute(
-            """
-            SELECT c.id, c.house_id, c.up_container_id, c.type_cd, c.name,
-                   c.quantity, c.owner_user_id, c.remk
-            FROM containers c
-            WHERE c.id = %s AND c.house_id = %s
-            """,
-            (container_id, house_id)
-        )
-        container = cur.fetchone()
+            conn.commit()
         
-        if not container:
-            cur.close()
-            conn.close()
-            return jsonify({'error': '컨테이너를 찾을 수 없습니다'}), 404
+            return jsonify({
+                'message': '이동이 완료되었습니다',
+                'container_id': container_id,
+                'from_house_id': house_id,
+                'to_house_id': to_house_id,
+                'moved_count': moved['moved_count'],
+                'elapsed_ms': moved['elapsed_ms']
+            }), 200
         
-        # 목적지 부모 컨테이너 유효성 검사
-        if parent_id is not None:
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# 10. 컨테이너 일괄 등록
+@containers_bp.route('/<house_id>/containers/bulk', methods=['POST'])
+@token_required
+@house_member_required()
+def bulk_create_containers(current_user_id, house_id, role_cd):
+    """
+    컨테이너 일괄 등록 (JSON 또는 CSV)
+
+    Request Body (JSON):
+    {
+        "items": [
+            {"ref": "living", "type_cd": "COM1200001", "name": "거실",
+             "children": [{"type_cd": "COM1200003", "name": "리모컨", "quantity": 2}]},
+            {"parent_ref": "living", "type_cd": "COM1200002", "name": "서랍"},
+            {"parent_id": "C202500001", "type_cd": "COM1200003", "name": "건전지"}
+        ]
+    }
+
+    Request Body (CSV, Content-Type: text/csv):
+    ref,parent_ref,parent_id,type_cd,name,quantity,owner_user_id,remk
+
+    Query Parameters:
+    - atomic: 1이면 한 행이라도 오류가 있을 때 전체를 등록하지 않음 (기본: 유효한 행만 등록)
+    """
+    try:
+        atomic = request.args.get('atomic', '0') in ('1', 'true')
+
+        try:
+            rows = parse_import_request(request)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if not rows:
+            return jsonify({'error': '등록할 항목이 없습니다'}), 400
+        if len(rows) > Config.BULK_IMPORT_MAX_ROWS:
+            return jsonify({'error': f'한 번에 최대 {Config.BULK_IMPORT_MAX_ROWS}개까지 등록할 수 있습니다'}), 400
+
+        # 문자열이 아닌 ID는 행 검증에서 오류 처리
+        parent_ids = list({row['parent_id'] for row in rows if isinstance(row.get('parent_id'), str)})
+        owner_ids = list({row['owner_user_id'] for row in rows if isinstance(row.get('owner_user_id'), str)})
+
+        with get_db() as conn:
+            cur = conn.cursor(cursor_factory=RealDictCursor)
+
+            # 참조 대상(기존 부모, 소유자)을 한 번에 조회
+            existing_parents = {}
+            if parent_ids:
+                cur.execute(
+                    "SELECT id, type_cd FROM containers WHERE house_id = %s AND id = ANY(%s)",
+                    (house_id, parent_ids)
+                )
+                existing_parents = {row['id']: row['type_cd'] for row in cur.fetchall()}
+
+            valid_owner_ids = set()
+            if owner_ids:
+                cur.execute("SELECT id FROM users WHERE id = ANY(%s)", (owner_ids,))
+                valid_owner_ids = {row['id'] for row in cur.fetchall()}
+
+            ordered, errors = validate_import_rows(rows, existing_parents, valid_owner_ids)
+
+            if errors and (atomic or not ordered):
+                return jsonify({
+                    'error': '등록할 수 없는 항목이 있습니다',
+                    'error_count': len(errors),
+                    'errors': errors
+                }), 400
+
+            # ID 미리 발급 (배치 내 parent_ref를 실제 ID로 연결하기 위함)
             cur.execute(
-                "SELECT id, type_cd FROM containers WHERE id = %s AND house_id = %s",
-                (parent_id, to_house_id)
+                "SELECT next_container_id() AS id FROM generate_series(1, %s)",
+                (len(ordered),)
             )
-            parent = cur.fetchone()
-            if not parent:
-                cur.close()
-                conn.close()
-                return jsonify({'error': '목적지 부모 컨테이너를 찾을 수 없습니다'}), 404
-            
-            # 물품은 물품 안에 들어갈 수 없음
-            if parent['type_cd'] == 'COM1200003':
-                cur.close()
-                conn.close()
-                return jsonify({'error': '물품 안에는 다른 항목을 넣을 수 없습니다'}), 400
-        
-        # 컨테이너 업데이트 (house_id와 up_container_id 변경)
-        cur.execute(
-            """
-            UPDATE containers
-            SET house_id = %s,
-                up_container_id = %s,
-                updated_at = CURRENT_TIMESTAMP,
-                updated_user = %s
-            WHERE id = %s
-            """,
-            (to_house_id, parent_id, current_user_id, container_id)
-        )
-        
-        # 하위 컨테이너들도 재귀적으로 house_id 업데이트 (중요!)
-        if to_house_id != house_id:
-            cur.execute(
+            ids_by_ref = {
+                row['ref']: allocated['id']
+                for row, allocated in zip(ordered, cur.fetchall())
+            }
+            for row in ordered:
+                row['id'] = ids_by_ref[row['ref']]
+                if row['parent_ref'] is not None:
+                    row['parent_id'] = ids_by_ref[row['parent_ref']]
+
+            # 컨테이너 생성 (부모가 먼저 오도록 정렬되어 있음)
+            execute_values(
+                cur,
                 """
-                WITH RECURSIVE descendants AS (
-                    SELECT id FROM containers WHERE up_container_id = %s
-                    UNION ALL
-                    SELECT c.id FROM containers c
-                    INNER JOIN descendants d ON c.up_container_id = d.id
+                INSERT INTO containers
+                (id, house_id, up_container_id, type_cd, name, quantity, owner_user_id, remk, created_user, updated_user)
+                VALUES %s
+                """,
+                [
+                    (row['id'], house_id, row['parent_id'], row['type_cd'], row['name'], row['quantity'],
+                     row['owner_user_id'], row['remk'], current_user_id, current_user_id)
+                    for row in ordered
+                ],
+                page_size=Config.BULK_INSERT_PAGE_SIZE
+            )
+
+            # container_logs 기록 (생성)
+            write_logs(cur, [
+                make_log(
+                    container_id=row['id'], container_name=row['name'], container_type_cd=row['type_cd'],
+                    act_cd='COM1300001', to_container_id=row['parent_id'], to_house_id=house_id,
+                    to_quantity=row['quantity'], to_owner_user_id=row['owner_user_id'], to_remk=row['remk'],
+                    log_remk=f"{row['name']} 생성", created_user=current_user_id, updated_user=current_user_id
                 )
-                UPDATE containers
-                SET house_id = %s,
-                    updated_at = CURRENT_TIMESTAMP,
-                    updated_user = %s
-                WHERE id IN (SELECT id FROM descendants)
+                for row in ordered
+            ])
+
+            conn.commit()
+
+            return jsonify({
+                'message': f'{len(ordered)}개 항목이 등록되었습니다',
+                'created_count': len(ordered),
+                'error_count': len(errors),
+                'errors': errors,
+                'created': [
+                    {'row': row['row'], 'ref': row['ref'], 'id': row['id']}
+                    for row in sorted(ordered, key=lambda r: r['row'])
+                ]
+            }), 201
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# 11. 컨테이너 일괄 수정 / 이동
+@containers_bp.route('/<house_id>/containers/batch', methods=['PATCH'])
+@token_required
+@house_member_required()
+def batch_update_containers(current_user_id, house_id, role_cd):
+    """
+    여러 컨테이너의 수정/이동을 한 트랜잭션으로 처리
+
+    Request Body:
+    {
+        "operations": [
+            {"id": "C202500010", "up_container_id": "C202500002"},
+            {"id": "C202500011", "quantity": 3, "owner_user_id": "0000000001"},
+            ...
+        ]
+    }
+    (각 항목의 필드는 4. 컨테이너 수정과 같음)
+
+    Query Parameters:
+    - atomic: 1이면 한 건이라도 오류가 있을 때 전체를 반영하지 않음 (기본: 유효한 항목만 반영)
+    """
+    try:
+        atomic = request.args.get('atomic', '0') in ('1', 'true')
+        operations = (request.json or {}).get('operations')
+
+        if not isinstance(operations, list) or not operations:
+            return jsonify({'error': '수정할 항목이 없습니다'}), 400
+        if len(operations) > Config.BATCH_UPDATE_MAX_OPERATIONS:
+            return jsonify({'error': f'한 번에 최대 {Config.BATCH_UPDATE_MAX_OPERATIONS}개까지 수정할 수 있습니다'}), 400
+
+        results = [{'index': index, 'id': op.get('id') if isinstance(op, dict) else None}
+                   for index, op in enumerate(operations)]
+        ids = list({result['id'] for result in results if isinstance(result['id'], str)})
+
+        with get_db() as conn:
+            cur = conn.cursor(cursor_factory=RealDictCursor)
+
+            # 원본 데이터를 한 번에 조회 (로그용, 처리 중 다른 수정이 끼어들지 않도록 잠금)
+            cur.execute(
+                """
+                SELECT id, name, type_cd, up_container_id, quantity, owner_user_id, remk
+                FROM containers
+                WHERE house_id = %s AND id = ANY(%s)
+                ORDER BY id
+                FOR UPDATE
                 """,
-                (container_id, to_house_id, current_user_id)
+                (house_id, ids)
             )
-        
-        # 로그 기록
-        cur.execute(
-            """
-            INSERT INTO container_logs (
-                container_id,
-                container_name,
-                container_type_cd,
-                act_cd,
-                from_container_id,
-                to_container_id,
-                from_house_id,
-                to_house_id,
-                log_remk,
-                created_user,
-                updated_user
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """,
-            (
-                container_id,
-                container['name'],
-                container['type_cd'],
-                'COM1300003',  # 이동 (수정: COM1300002 -> COM1300003)
-                container['up_container_id'],
-                parent_id,
-                house_id,
-                to_house_id,
-                f"{'같은 집 내' if house_id == to_house_id else '집 간'} 이동",
-                current_user_id,
-                current_user_id  # updated_user 추가!
+            originals = {row['id']: row for row in cur.fetchall()}
+
+            # 항목별 검사
+            pending = []
+            seen = set()
+            for result, op in zip(results, operations):
+                container_id = result['id']
+                # 문자열이 아닌 id(리스트/딕셔너리 등)는 seen에 넣지 않음 (해시할 수 없음)
+                if not isinstance(container_id, str) or not container_id:
+                    result['error'] = 'id는 문자열이어야 합니다' if container_id else 'id가 필요합니다'
+                    continue
+                elif container_id in seen:
+                    result['error'] = '같은 컨테이너가 중복되었습니다'
+                elif container_id not in originals:
+                    result['error'] = '컨테이너를 찾을 수 없습니다'
+                else:
+                    changes, error = _collect_changes(originals[container_id], op)
+                    if error:
+                        result['error'] = error
+                    else:
+                        pending.append((result, originals[container_id], changes))
+                seen.add(container_id)
+
+            # 소유자 존재 확인 (한 번에 조회)
+            unknown_owners = _find_unknown_owners(
+                cur, (changes['owner_user_id'] for _, _, changes in pending if 'owner_user_id' in changes)
             )
-        )
-        
-        conn.commit()
-        cur.close()
-        conn.close()
-        
-        return jsonify({
-            'message': '이동이 완료되었습니다',
-            'container_id': container_id,
-            'from_house_id': house_id,
-            'to_house_id': to_house_id
-        }), 200
-        
+            if unknown_owners:
+                for result, _, changes in pending:
+                    if changes.get('owner_user_id') in unknown_owners:
+                        result['error'] = '존재하지 않는 소유자입니다'
+                pending = [item for item in pending if 'error' not in item[0]]
+
+            # 위치 이동 (요청 순서대로 처리하므로 앞선 이동 결과를 기준으로 순환 검사)
+            updates = []
+            for result, original, changes in pending:
+                if 'up_container_id' in changes:
+                    try:
+                        moved = move_subtree(cur, house_id, original['id'], house_id, changes['up_container_id'],
+                                             current_user_id, log_root=False)
+                    except SubtreeMoveError as e:
+                        result['error'] = str(e)
+                        continue
+                    result['moved_count'] = moved['moved_count']
+                updates.append((result, original, changes))
+
+            error_count = sum(1 for result in results if 'error' in result)
+            if error_count and (atomic or not updates):
+                conn.rollback()
+                return jsonify({
+                    'error': '수정할 수 없는 항목이 있습니다',
+                    'error_count': error_count,
+                    'results': results
+                }), 400
+
+            # 이동 외 필드 수정 (한 번의 UPDATE ... FROM VALUES)
+            # set_* 플래그로 요청에 있는 필드만 덮어씀 (null로 비우는 것과 구분)
+            updated_rows = execute_values(
+                cur,
+                """
+                UPDATE containers c
+                SET name = CASE WHEN v.set_name THEN v.name ELSE c.name END,
+                    quantity = CASE WHEN v.set_quantity THEN v.quantity ELSE c.quantity END,
+                    owner_user_id = CASE WHEN v.set_owner THEN v.owner_user_id ELSE c.owner_user_id END,
+                    remk = CASE WHEN v.set_remk THEN v.remk ELSE c.remk END,
+                    updated_user = v.updated_user,
+                    updated_at = CURRENT_TIMESTAMP
+                FROM (VALUES %s) AS v(id, set_name, name, set_quantity, quantity,
+                                      set_owner, owner_user_id, set_remk, remk, updated_user)
+                WHERE c.id = v.id
+                RETURNING c.id, c.name, c.updated_at
+                """,
+                [
+                    (original['id'],
+                     'name' in changes, changes.get('name'),
+                     'quantity' in changes, changes.get('quantity'),
+                     'owner_user_id' in changes, changes.get('owner_user_id'),
+                     'remk' in changes, changes.get('remk'),
+                     current_user_id)
+                    for _, original, changes in updates
+                ],
+                template='(%s, %s, %s::varchar, %s, %s::int, %s, %s::varchar, %s, %s::text, %s)',
+                page_size=len(updates),
+                fetch=True
+            )
+            updated_by_id = {row['id']: row for row in updated_rows}
+
+            # container_logs 기록 (여러 행을 한 번에 INSERT)
+            owner_names = _fetch_owner_names(cur, [(original, changes) for _, original, changes in updates])
+            log_rows = [
+                _build_update_log(original, changes, house_id, current_user_id, owner_names)
+                for _, original, changes in updates
+            ]
+            write_logs(cur, [row for row in log_rows if row])
+
+            conn.commit()
+
+            for result, original, changes in updates:
+                result['container'] = updated_by_id[original['id']]
+                result['changed'] = sorted(changes)
+
+            return jsonify({
+                'message': f'{len(updates)}개 항목이 수정되었습니다',
+                'updated_count': len(updates),
+                'error_count': error_count,
+                'results': results
+            }), 200
+
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+
+# 12. 집 전체 트리 스냅샷
+@containers_bp.route('/<house_id>/containers/tree', methods=['GET'])
+@token_required
+@house_member_required()
+@house_etag
+def get_container_tree(current_user_id, house_id, role_cd):
+    """
+    집의 모든 컨테이너를 컬럼별 배열로 한 번에 조회 (단계별 parent_id 조회 대체)
+
+    응답:
+    - ids / names / quantities: 컨테이너별 값 (같은 위치끼리 한 컨테이너)
+    - parent_indexes: 부모의 배열 위치 (-1이면 최상위, 부모가 항상 앞에 옴)
+    - type_indexes: types 배열 위치
+    - token: 이후 변경분 조회(13번 API)에 사용
+    """
+    try:
+        with get_db() as conn:
+            cur = conn.cursor()
+            snapshot = build_tree_snapshot(cur, house_id)
+
+        snapshot['my_role'] = role_cd
+        return jsonify(snapshot), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# 13. 집 전체 트리 변경분
+@containers_bp.route('/<house_id>/containers/tree/changes', methods=['GET'])
+@token_required
+@house_member_required()
+def get_container_tree_changes(current_user_id, house_id, role_cd):
+    """
+    Query Parameters:
+    - since: 스냅샷 또는 이전 변경분 응답의 token (필수)
+
+    응답:
+    - changed: 생성/수정/이동된 컨테이너 (스냅샷과 같은 배열 형식, 부모는 parent_ids로 전달)
+    - removed: 삭제되었거나 다른 집으로 이동한 컨테이너 ID (하위 항목도 함께 제거)
+    - reset: true면 스냅샷(12번 API)을 다시 받아야 함
+    - token: 다음 변경분 조회에 사용
+    """
+    try:
+        since = request.args.get('since')
+        if not since:
+            return jsonify({'error': 'since 파라미터가 필요합니다'}), 400
+
+        try:
+            since_version, since_changed_at = decode_tree_token(since)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        with get_db() as conn:
+            cur = conn.cursor()
+            changes = build_tree_changes(cur, house_id, since_version, since_changed_at)
+
+        changes['my_role'] = role_cd
+        return jsonify(changes), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
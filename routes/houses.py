@@ -1,7 +1,18 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from psycopg2.extras import RealDictCursor
-from database import get_db_connection
+from datetime import datetime
+from itertools import chain
+from database import get_db, fetch_dicts
+from config import Config
 from middlewares.auth import token_required
+from middlewares.house import house_member_required, invalidate_membership
+from utils.pagination import paginate_logs, decode_cursor
+from utils.codes import attach_code_names
+from utils.user_names import attach_user_names, LOG_USER_NAME_FIELDS
+from utils.fields import parse_fields, project
+from utils.house_export import (
+    CONTAINER_EXPORT_FIELDS, iter_house_containers, iter_house_logs, jsonl_chunks, csv_chunks
+)
 
 houses_bp = Blueprint('houses', __name__, url_prefix='/api/houses')
 
@@ -10,52 +21,34 @@ houses_bp = Blueprint('houses', __name__, url_prefix='/api/houses')
 @token_required
 def get_my_houses(current_user_id):
     try:
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        cur.execute(
-            """
-            SELECT
-                h.id,
-                h.name,
-                hm.role_cd,
-                hm.seq,
-                cd.nm as role_nm,
-                h.created_at,
-                admin.name as admin_name,
-                member_count.count as member_count,
-                container_count.count as container_count
-            FROM houses h
-                JOIN house_members hm ON h.id = hm.house_id
-                LEFT JOIN com_code_d cd ON hm.role_cd = cd.cd
-                LEFT JOIN (
-                    SELECT house_id, user_id
-                    FROM house_members
-                    WHERE role_cd = 'COM1100001'
-                ) admin_member ON h.id = admin_member.house_id
-                LEFT JOIN users admin ON admin_member.user_id = admin.id
-                LEFT JOIN (
-                    SELECT house_id, COUNT(*) as count
-                    FROM house_members
-                    GROUP BY house_id
-                ) member_count ON h.id = member_count.house_id
-                LEFT JOIN (
-                    SELECT house_id, COUNT(*) as count
-                    FROM containers
-                    WHERE up_container_id IS NULL
-                    GROUP BY house_id
-                ) container_count ON h.id = container_count.house_id
-            WHERE hm.user_id = %s
-            ORDER BY h.id
-            """,
-            (current_user_id,)
-        )
-        houses = cur.fetchall()
-        
-        cur.close()
-        conn.close()
-        
-        return jsonify({'houses': houses}), 200
+        with get_db() as conn:
+            cur = conn.cursor(cursor_factory=RealDictCursor)
+        
+            cur.execute(
+                """
+                SELECT
+                    h.id,
+                    h.name,
+                    hm.role_cd,
+                    hm.seq,
+                    h.created_at,
+                    admin_member.user_id as admin_user_id,
+                    h.member_count,
+                    h.container_count
+                FROM house_members hm
+                    JOIN houses h ON h.id = hm.house_id
+                    LEFT JOIN house_members admin_member
+                        ON admin_member.house_id = h.id
+                       AND admin_member.role_cd = 'COM1100001'
+                WHERE hm.user_id = %s
+                ORDER BY h.id
+                """,
+                (current_user_id,)
+            )
+            houses = attach_code_names(cur.fetchall(), {'role_cd': 'role_nm'})
+            attach_user_names(houses, {'admin_user_id': 'admin_name'}, cur=cur)
+        
+            return jsonify({'houses': houses}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -71,187 +64,138 @@ def create_house(current_user_id):
         if not house_name:
             return jsonify({'error': '집 이름을 입력해주세요'}), 400
         
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # 집 생성
-        cur.execute(
-            """
-            INSERT INTO houses (name, created_user, updated_user)
-            VALUES (%s, %s, %s)
-            RETURNING id, name, created_at
-            """,
-            (house_name, current_user_id, current_user_id)
-        )
-        house = cur.fetchone()
-        
-        # 구성원 등록 (관리자)
-        cur.execute(
-            """
-            INSERT INTO house_members (house_id, user_id, role_cd, created_user, updated_user)
-            VALUES (%s, %s, 'COM1100001', %s, %s)
-            RETURNING seq
-            """,
-            (house['id'], current_user_id, current_user_id, current_user_id)
-        )
-        member = cur.fetchone()
-        
-        conn.commit()
-        cur.close()
-        conn.close()
-        
-        return jsonify({
-            'message': '집 생성 성공',
-            'house': {
-                'id': house['id'],
-                'name': house['name'],
-                'role_cd': 'COM1100001',
-                'seq': member['seq'],
-                'created_at': house['created_at'].isoformat()
-            }
-        }), 201
+        with get_db() as conn:
+            cur = conn.cursor(cursor_factory=RealDictCursor)
+        
+            # 집 생성
+            cur.execute(
+                """
+                INSERT INTO houses (name, created_user, updated_user)
+                VALUES (%s, %s, %s)
+                RETURNING id, name, created_at
+                """,
+                (house_name, current_user_id, current_user_id)
+            )
+            house = cur.fetchone()
+        
+            # 구성원 등록 (관리자)
+            cur.execute(
+                """
+                INSERT INTO house_members (house_id, user_id, role_cd, created_user, updated_user)
+                VALUES (%s, %s, 'COM1100001', %s, %s)
+                RETURNING seq
+                """,
+                (house['id'], current_user_id, current_user_id, current_user_id)
+            )
+            member = cur.fetchone()
+        
+            conn.commit()
+        
+            return jsonify({
+                'message': '집 생성 성공',
+                'house': {
+                    'id': house['id'],
+                    'name': house['name'],
+                    'role_cd': 'COM1100001',
+                    'seq': member['seq'],
+                    'created_at': house['created_at'].isoformat()
+                }
+            }), 201
         
     except Exception as e:
-        if conn:
-            conn.rollback()
         return jsonify({'error': str(e)}), 500
 
 # 3. 집 삭제
 @houses_bp.route('/<house_id>', methods=['DELETE'])
 @token_required
-def delete_house(current_user_id, house_id):
+@house_member_required('해당 집의 구성원이 아닙니다')
+def delete_house(current_user_id, house_id, role_cd):
     try:
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # 권한 확인
-        cur.execute(
-            """
-            SELECT role_cd 
-            FROM house_members 
-            WHERE house_id = %s AND user_id = %s
-            """,
-            (house_id, current_user_id)
-        )
-        member = cur.fetchone()
-        
-        if not member:
-            return jsonify({'error': '해당 집의 구성원이 아닙니다'}), 403
-        
-        if member['role_cd'] != 'COM1100001':
+        if role_cd != 'COM1100001':
             return jsonify({'error': '관리자만 집을 삭제할 수 있습니다'}), 403
         
-        # 집 삭제
-        cur.execute("DELETE FROM houses WHERE id = %s", (house_id,))
+        with get_db() as conn:
+            cur = conn.cursor(cursor_factory=RealDictCursor)
+        
+            # 집 삭제
+            cur.execute("DELETE FROM houses WHERE id = %s", (house_id,))
         
-        if cur.rowcount == 0:
-            return jsonify({'error': '존재하지 않는 집입니다'}), 404
+            if cur.rowcount == 0:
+                return jsonify({'error': '존재하지 않는 집입니다'}), 404
         
-        conn.commit()
-        cur.close()
-        conn.close()
+            conn.commit()
+            invalidate_membership(house_id)
         
-        return jsonify({'message': '집 삭제 성공'}), 200
+            return jsonify({'message': '집 삭제 성공'}), 200
         
     except Exception as e:
-        if conn:
-            conn.rollback()
         return jsonify({'error': str(e)}), 500
     
 # 4. 집 나가기 (멤버 전용)
 @houses_bp.route('/<house_id>/leave', methods=['DELETE'])
 @token_required
-def leave_house(current_user_id, house_id):
+@house_member_required('해당 집의 구성원이 아닙니다')
+def leave_house(current_user_id, house_id, role_cd):
     try:
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # 권한 확인
-        cur.execute(
-            """
-            SELECT role_cd 
-            FROM house_members 
-            WHERE house_id = %s AND user_id = %s
-            """,
-            (house_id, current_user_id)
-        )
-        member = cur.fetchone()
-        
-        if not member:
-            return jsonify({'error': '해당 집의 구성원이 아닙니다'}), 403
-        
         # 관리자는 나갈 수 없음
-        if member['role_cd'] == 'COM1100001':
+        if role_cd == 'COM1100001':
             return jsonify({'error': '관리자는 나갈 수 없습니다. 먼저 다른 사람에게 관리자 권한을 양도하거나 집을 삭제하세요'}), 403
         
-        # 멤버 삭제
-        cur.execute(
-            "DELETE FROM house_members WHERE house_id = %s AND user_id = %s",
-            (house_id, current_user_id)
-        )
+        with get_db() as conn:
+            cur = conn.cursor(cursor_factory=RealDictCursor)
+        
+            # 멤버 삭제
+            cur.execute(
+                "DELETE FROM house_members WHERE house_id = %s AND user_id = %s",
+                (house_id, current_user_id)
+            )
         
-        if cur.rowcount == 0:
-            return jsonify({'error': '이미 나간 집입니다'}), 404
+            if cur.rowcount == 0:
+                invalidate_membership(house_id, current_user_id)
+                return jsonify({'error': '이미 나간 집입니다'}), 404
         
-        conn.commit()
-        cur.close()
-        conn.close()
+            conn.commit()
+            invalidate_membership(house_id, current_user_id)
         
-        return jsonify({'message': '집에서 나갔습니다'}), 200
+            return jsonify({'message': '집에서 나갔습니다'}), 200
         
     except Exception as e:
-        if conn:
-            conn.rollback()
         return jsonify({'error': str(e)}), 500
     
 
 # 5. 특정 집의 구성원 목록 조회
 @houses_bp.route('/<house_id>/members', methods=['GET'])
 @token_required
-def get_house_members(current_user_id, house_id):
+@house_member_required('해당 집의 구성원이 아닙니다')
+def get_house_members(current_user_id, house_id, role_cd):
     try:
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # 권한 확인 (해당 집의 구성원인지)
-        cur.execute(
-            "SELECT role_cd FROM house_members WHERE house_id = %s AND user_id = %s",
-            (house_id, current_user_id)
-        )
-        member = cur.fetchone()
-        
-        if not member:
-            return jsonify({'error': '해당 집의 구성원이 아닙니다'}), 403
-        
-        # 구성원 목록 조회
-        cur.execute(
-            """
-            SELECT 
-                hm.user_id,
-                u.name as user_name,
-                u.email,
-                hm.role_cd,
-                cd.nm as role_nm,
-                hm.created_at as joined_at
-            FROM house_members hm
-                JOIN users u ON hm.user_id = u.id
-                LEFT JOIN com_code_d cd ON hm.role_cd = cd.cd
-            WHERE hm.house_id = %s
-            ORDER BY 
-                CASE WHEN hm.role_cd = 'COM1100001' THEN 0 ELSE 1 END,
-                hm.created_at
-            """,
-            (house_id,)
-        )
-        members = cur.fetchall()
-        
-        cur.close()
-        conn.close()
-        
-        return jsonify({
-            'members': members,
-            'my_role': member['role_cd']
-        }), 200
+        with get_db() as conn:
+            cur = conn.cursor(cursor_factory=RealDictCursor)
+        
+            # 구성원 목록 조회
+            cur.execute(
+                """
+                SELECT 
+                    hm.user_id,
+                    u.name as user_name,
+                    u.email,
+                    hm.role_cd,
+                    hm.created_at as joined_at
+                FROM house_members hm
+                    JOIN users u ON hm.user_id = u.id
+                WHERE hm.house_id = %s
+                ORDER BY 
+                    CASE WHEN hm.role_cd = 'COM1100001' THEN 0 ELSE 1 END,
+                    hm.created_at
+                """,
+                (house_id,)
+            )
+            members = attach_code_names(cur.fetchall(), {'role_cd': 'role_nm'})
+        
+            return jsonify({
+                'members': project(members, parse_fields(request.args)),
+                'my_role': role_cd
+            }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -260,170 +204,296 @@ def get_house_members(current_user_id, house_id):
 # 6. 구성원 추방 (관리자 전용)
 @houses_bp.route('/<house_id>/members/<user_id>', methods=['DELETE'])
 @token_required
-def kick_member(current_user_id, house_id, user_id):
+@house_member_required('해당 집의 구성원이 아닙니다')
+def kick_member(current_user_id, house_id, user_id, role_cd):
     try:
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # 권한 확인 (관리자인지)
-        cur.execute(
-            "SELECT role_cd FROM house_members WHERE house_id = %s AND user_id = %s",
-            (house_id, current_user_id)
-        )
-        member = cur.fetchone()
-        
-        if not member:
-            return jsonify({'error': '해당 집의 구성원이 아닙니다'}), 403
-        
-        if member['role_cd'] != 'COM1100001':
+        if role_cd != 'COM1100001':
             return jsonify({'error': '관리자만 추방할 수 있습니다'}), 403
         
         # 자기 자신 추방 방지
         if current_user_id == user_id:
             return jsonify({'error': '자기 자신은 추방할 수 없습니다'}), 400
         
-        # 대상이 관리자인지 확인
-        cur.execute(
-            "SELECT role_cd FROM house_members WHERE house_id = %s AND user_id = %s",
-            (house_id, user_id)
-        )
-        target = cur.fetchone()
+        with get_db() as conn:
+            cur = conn.cursor(cursor_factory=RealDictCursor)
         
-        if not target:
-            return jsonify({'error': '해당 구성원을 찾을 수 없습니다'}), 404
+            # 대상이 관리자인지 확인
+            cur.execute(
+                "SELECT role_cd FROM house_members WHERE house_id = %s AND user_id = %s",
+                (house_id, user_id)
+            )
+            target = cur.fetchone()
         
-        if target['role_cd'] == 'COM1100001':
-            return jsonify({'error': '관리자는 추방할 수 없습니다'}), 400
+            if not target:
+                return jsonify({'error': '해당 구성원을 찾을 수 없습니다'}), 404
         
-        # 추방 실행
-        cur.execute(
-            "DELETE FROM house_members WHERE house_id = %s AND user_id = %s",
-            (house_id, user_id)
-        )
+            if target['role_cd'] == 'COM1100001':
+                return jsonify({'error': '관리자는 추방할 수 없습니다'}), 400
         
-        conn.commit()
-        cur.close()
-        conn.close()
+            # 추방 실행
+            cur.execute(
+                "DELETE FROM house_members WHERE house_id = %s AND user_id = %s",
+                (house_id, user_id)
+            )
         
-        return jsonify({'message': '구성원을 추방했습니다'}), 200
+            conn.commit()
+            invalidate_membership(house_id, user_id)
+        
+            return jsonify({'message': '구성원을 추방했습니다'}), 200
 
     except Exception as e:
-        if conn:
-            conn.rollback()
         return jsonify({'error': str(e)}), 500
 
 
 # 7. 집 전체 히스토리 조회
 @houses_bp.route('/<house_id>/logs', methods=['GET'])
 @token_required
-def get_house_logs(current_user_id, house_id):
+@house_member_required('해당 집의 구성원이 아닙니다')
+def get_house_logs(current_user_id, house_id, role_cd):
     """
-    집의 전체 활동 히스토리 조회
+    집의 전체 활동 히스토리 조회 (최신순, 커서 기반 페이지네이션)
 
     Query Parameters:
     - limit: 조회할 로그 개수 (기본 3개, 최대 100개)
+    - cursor: 이전 응답의 next_cursor (optional, 없으면 최신부터)
+    - fields: 응답 목록에 포함할 필드 (쉼표 구분, optional, 예: id,name,type_nm)
     """
     try:
         # limit 파라미터 (기본 3개)
         limit = request.args.get('limit', 3, type=int)
         if limit > 100:
             limit = 100
+        if limit < 1:
+            limit = 1
 
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        # cursor 파라미터 (마지막으로 받은 로그의 created_at, id)
+        cursor = request.args.get('cursor')
+        cursor_condition = ''
+        cursor_params = []
+        if cursor:
+            try:
+                cursor_created_at, cursor_id = decode_cursor(cursor)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            # created_at 단독 조건은 월별 파티션 제외(pruning)용
+            cursor_condition = "AND created_at <= %s AND (created_at, id) < (%s, %s)"
+            cursor_params = [cursor_created_at, cursor_created_at, cursor_id]
 
-        # 권한 확인 (해당 집의 구성원인지)
-        cur.execute(
-            "SELECT role_cd FROM house_members WHERE house_id = %s AND user_id = %s",
-            (house_id, current_user_id)
-        )
-        member = cur.fetchone()
+        with get_db() as conn:
+            # 로그 목록은 튜플 행으로 받아 dict로 변환 (RealDictRow 생성 비용 절감)
+            cur = conn.cursor()
 
-        if not member:
-            cur.close()
-            conn.close()
-            return jsonify({'error': '해당 집의 구성원이 아닙니다'}), 403
+            # 집 이름 조회
+            cur.execute(
+                "SELECT name FROM houses WHERE id = %s",
+                (house_id,)
+            )
+            house = cur.fetchone()
+            house_name = house[0] if house else ''
 
-        # 집 이름 조회
-        cur.execute(
-            "SELECT name FROM houses WHERE id = %s",
-            (house_id,)
-        )
-        house = cur.fetchone()
-        house_name = house['name'] if house else ''
-
-        # 히스토리 조회
-        cur.execute(
-            """
-            SELECT
-                cl.id,
-                cl.container_id,
-                cl.container_name,
-                cl.container_type_cd,
-                ct.nm as container_type_nm,
-                cl.act_cd,
-                cd.nm as act_nm,
-
-                -- 위치 정보
-                cl.from_container_id,
-                fc.name as from_container_name,
-                cl.to_container_id,
-                tc.name as to_container_name,
-
-                -- 집 정보
-                cl.from_house_id,
-                fh.name as from_house_name,
-                cl.to_house_id,
-                th.name as to_house_name,
-
-                -- 소유자 정보
-                cl.from_owner_user_id,
-                fo.name as from_owner_name,
-                cl.to_owner_user_id,
-                tou.name as to_owner_name,
-
-                -- 수량 정보
-                cl.from_quantity,
-                cl.to_quantity,
-
-                -- 메모 정보
-                cl.from_remk,
-                cl.to_remk,
-
-                -- 기타
-                cl.log_remk,
-                TO_CHAR(cl.created_at, 'YYYY-MM-DD HH24:MI:SS') as created_at,
-                cl.created_user,
-                creator.name as creator_name
-
-            FROM container_logs cl
-            LEFT JOIN com_code_d cd ON cl.act_cd = cd.cd
-            LEFT JOIN com_code_d ct ON cl.container_type_cd = ct.cd
-            LEFT JOIN containers fc ON cl.from_container_id = fc.id
-            LEFT JOIN containers tc ON cl.to_container_id = tc.id
-            LEFT JOIN houses fh ON cl.from_house_id = fh.id
-            LEFT JOIN houses th ON cl.to_house_id = th.id
-            LEFT JOIN users fo ON cl.from_owner_user_id = fo.id
-            LEFT JOIN users tou ON cl.to_owner_user_id = tou.id
-            LEFT JOIN users creator ON cl.created_user = creator.id
-
-            WHERE cl.from_house_id = %s OR cl.to_house_id = %s
-            ORDER BY cl.created_at DESC
-            LIMIT %s
-            """,
-            (house_id, house_id, limit)
+            # 히스토리 조회
+            # 출발/도착 집 조건을 각각 (house_id, created_at, id) 인덱스로 페이지 크기만큼 읽은 뒤 병합
+            cur.execute(
+                """
+                WITH page AS (
+                    SELECT id, created_at
+                    FROM (
+                        (SELECT id, created_at
+                         FROM container_logs
+                         WHERE from_house_id = %s {cursor_condition}
+                         ORDER BY created_at DESC, id DESC
+                         LIMIT %s)
+                        UNION
+                        (SELECT id, created_at
+                         FROM container_logs
+                         WHERE to_house_id = %s {cursor_condition}
+                         ORDER BY created_at DESC, id DESC
+                         LIMIT %s)
+                    ) merged
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT %s
+                )
+                SELECT
+                    cl.id,
+                    cl.container_id,
+                    cl.container_name,
+                    cl.container_type_cd,
+                    cl.act_cd,
+
+                    -- 위치 정보
+                    cl.from_container_id,
+                    fc.name as from_container_name,
+                    cl.to_container_id,
+                    tc.name as to_container_name,
+
+                    -- 집 정보
+                    cl.from_house_id,
+                    fh.name as from_house_name,
+                    cl.to_house_id,
+                    th.name as to_house_name,
+
+                    -- 소유자 정보
+                    cl.from_owner_user_id,
+                    cl.to_owner_user_id,
+
+                    -- 수량 정보
+                    cl.from_quantity,
+                    cl.to_quantity,
+
+                    -- 메모 정보
+                    cl.from_remk,
+                    cl.to_remk,
+
+                    -- 기타
+                    cl.log_remk,
+                    TO_CHAR(cl.created_at, 'YYYY-MM-DD HH24:MI:SS') as created_at,
+                    cl.created_user,
+                    page.created_at as cursor_created_at
+
+                FROM page
+                JOIN container_logs cl ON cl.id = page.id AND cl.created_at = page.created_at
+                LEFT JOIN containers fc ON cl.from_container_id = fc.id
+                LEFT JOIN containers tc ON cl.to_container_id = tc.id
+                LEFT JOIN houses fh ON cl.from_house_id = fh.id
+                LEFT JOIN houses th ON cl.to_house_id = th.id
+
+                ORDER BY page.created_at DESC, page.id DESC
+                """.format(cursor_condition=cursor_condition),
+                [house_id, *cursor_params, limit + 1,
+                 house_id, *cursor_params, limit + 1,
+                 limit + 1]
+            )
+
+            logs = fetch_dicts(cur)
+            logs, next_cursor = paginate_logs(logs, limit)
+            attach_code_names(logs, {'container_type_cd': 'container_type_nm', 'act_cd': 'act_nm'})
+            attach_user_names(logs, LOG_USER_NAME_FIELDS, cur=cur)
+
+            return jsonify({
+                'logs': project(logs, parse_fields(request.args)),
+                'count': len(logs),
+                'house_name': house_name,
+                'next_cursor': next_cursor
+            }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# 8. 집 전체 내보내기 (스트리밍)
+@houses_bp.route('/<house_id>/export', methods=['GET'])
+@token_required
+@house_member_required('해당 집의 구성원이 아닙니다')
+def export_house(current_user_id, house_id, role_cd):
+    """
+    집의 전체 컨테이너(경로, 유형명, 소유자 포함)를 스트리밍으로 내보내기
+
+    Query Parameters:
+    - format: jsonl (기본) 또는 csv
+    - include_logs: 1이면 컨테이너 히스토리도 함께 내보냄 (jsonl 전용)
+
+    jsonl 형식은 각 줄에 type 필드("container" / "log")가 포함됩니다.
+    """
+    try:
+        export_format = request.args.get('format', 'jsonl')
+        include_logs = request.args.get('include_logs', '0') in ('1', 'true')
+
+        if export_format not in ('jsonl', 'csv'):
+            return jsonify({'error': 'format은 jsonl 또는 csv만 가능합니다'}), 400
+        if export_format == 'csv' and include_logs:
+            return jsonify({'error': 'CSV 형식은 히스토리를 포함할 수 없습니다 (jsonl 사용)'}), 400
+
+        with get_db() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT 1 FROM houses WHERE id = %s", (house_id,))
+            if not cur.fetchone():
+                return jsonify({'error': '존재하지 않는 집입니다'}), 404
+
+        fetch_size = Config.EXPORT_FETCH_SIZE
+
+        # 응답을 보내는 동안에만 커넥션을 점유 (클라이언트가 끊으면 제너레이터 종료와 함께 반납)
+        def generate():
+            with get_db() as conn:
+                containers = iter_house_containers(conn, house_id, fetch_size)
+
+                if export_format == 'csv':
+                    yield from csv_chunks(containers, CONTAINER_EXPORT_FIELDS, fetch_size)
+                    return
+
+                records = (('container', row) for row in containers)
+                if include_logs:
+                    records = chain(
+                        records,
+                        (('log', row) for row in iter_house_logs(conn, house_id, fetch_size))
+                    )
+                yield from jsonl_chunks(records, fetch_size)
+
+        filename = f"house_{house_id}_{datetime.now().strftime('%Y%m%d')}.{export_format}"
+        mimetype = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
         )
 
-        logs = cur.fetchall()
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# 9. 집 일간 활동 통계
+@houses_bp.route('/<house_id>/activity', methods=['GET'])
+@token_required
+@house_member_required('해당 집의 구성원이 아닙니다')
+def get_house_activity(current_user_id, house_id, role_cd):
+    """
+    날짜별/행위별 이력 건수 (집계된 날짜는 container_log_daily, 그 이후 날짜는 실시간 집계)
 
-        cur.close()
-        conn.close()
+    일간 집계(maintain-container-logs)는 하루 한 번 어제까지만 집계하므로,
+    집계가 아직 돌지 않았거나 실패한 날짜도 빠지지 않도록 마지막 집계 날짜 다음 날부터 직접 집계합니다.
+
+    Query Parameters:
+    - days: 조회할 일수 (기본 30일, 최대 366일, 오늘 포함)
+    """
+    try:
+        days = min(max(request.args.get('days', 30, type=int), 1), 366)
+
+        with get_db() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                WITH rolled AS (
+                    -- 이 날짜 전까지는 집계 사용 (집계가 없으면 조회 기간 전체를 실시간 집계)
+                    SELECT LEAST(COALESCE(MAX(log_date) + 1, CURRENT_DATE - %s), CURRENT_DATE) AS until_date
+                    FROM container_log_daily
+                    WHERE house_id = %s
+                )
+                SELECT log_date, act_cd, log_count
+                FROM container_log_daily
+                WHERE house_id = %s
+                  AND log_date >= CURRENT_DATE - %s
+                  AND log_date < (SELECT until_date FROM rolled)
+
+                UNION ALL
+
+                -- 아직 집계되지 않은 날짜는 최근 파티션에서 직접 집계
+                SELECT created_at::DATE, act_cd, COUNT(*)
+                FROM container_logs
+                WHERE (from_house_id = %s OR to_house_id = %s)
+                  AND created_at >= (SELECT GREATEST(until_date, CURRENT_DATE - %s) FROM rolled)
+                GROUP BY created_at::DATE, act_cd
+
+                ORDER BY 1 DESC, 2
+                """,
+                (days - 1, house_id, house_id, days - 1, house_id, house_id, days - 1)
+            )
+            rows = fetch_dicts(cur)
+
+        attach_code_names(rows, {'act_cd': 'act_nm'})
 
         return jsonify({
-            'logs': logs,
-            'count': len(logs),
-            'house_name': house_name
+            'days': days,
+            'activity': rows
         }), 200
 
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
@@ -1,6 +1,6 @@
 from flask import Blueprint, request, jsonify
 import bcrypt
-from database import get_db_connection
+from database import get_db
 from middlewares.auth import token_required
 from psycopg2.extras import RealDictCursor
 
@@ -10,19 +10,17 @@ users_bp = Blueprint('users', __name__, url_prefix='/api/users')
 @token_required
 def get_my_info(current_user_id):
     try:
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        with get_db() as conn:
+            cur = conn.cursor(cursor_factory=RealDictCursor)
 
-        cur.execute("SELECT id, email, name, created_at FROM users WHERE id = %s", (current_user_id,))
-        user = cur.fetchone()
+            cur.execute("SELECT id, email, name, created_at FROM users WHERE id = %s", (current_user_id,))
+            user = cur.fetchone()
 
-        cur.close()
-        conn.close()
 
-        if not user:
-            return jsonify({'error': '사용자를 찾을 수 없습니다'}), 404
+            if not user:
+                return jsonify({'error': '사용자를 찾을 수 없습니다'}), 404
         
-        return jsonify({'user': user}), 200
+            return jsonify({'user': user}), 200
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
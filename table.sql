@@ -14,6 +14,9 @@
 
 -- 기존 데이터 완전 삭제를 위한 트리거/함수/시퀀스 먼저 제거
 DROP TRIGGER IF EXISTS set_container_log_id ON container_logs CASCADE;
+DROP TRIGGER IF EXISTS move_container_path ON containers CASCADE;
+DROP TRIGGER IF EXISTS set_container_path_on_move ON containers CASCADE;
+DROP TRIGGER IF EXISTS set_container_path ON containers CASCADE;
 DROP TRIGGER IF EXISTS set_container_id ON containers CASCADE;
 DROP TRIGGER IF EXISTS set_item_log_id ON item_logs CASCADE;
 DROP TRIGGER IF EXISTS set_item_id ON items CASCADE;
@@ -23,8 +26,26 @@ DROP TRIGGER IF EXISTS set_house_id ON houses CASCADE;
 DROP TRIGGER IF EXISTS set_updated_at ON users CASCADE;
 DROP TRIGGER IF EXISTS set_user_id ON users CASCADE;
 
+DROP FUNCTION IF EXISTS bump_dictionary_version() CASCADE;
+DROP FUNCTION IF EXISTS record_container_tombstones() CASCADE;
+DROP FUNCTION IF EXISTS set_container_change_version() CASCADE;
+DROP FUNCTION IF EXISTS rollup_container_logs(DATE, DATE) CASCADE;
+DROP FUNCTION IF EXISTS ensure_container_log_partitions(INT) CASCADE;
+DROP FUNCTION IF EXISTS create_container_log_partition(DATE) CASCADE;
+DROP FUNCTION IF EXISTS notify_com_code_changed() CASCADE;
+DROP FUNCTION IF EXISTS bump_house_version() CASCADE;
 DROP FUNCTION IF EXISTS generate_container_log_id() CASCADE;
+DROP FUNCTION IF EXISTS reconcile_container_child_counts() CASCADE;
+DROP FUNCTION IF EXISTS update_container_child_count() CASCADE;
+DROP FUNCTION IF EXISTS reconcile_house_counters() CASCADE;
+DROP FUNCTION IF EXISTS update_house_container_count() CASCADE;
+DROP FUNCTION IF EXISTS update_house_member_count() CASCADE;
+DROP FUNCTION IF EXISTS rebuild_container_paths() CASCADE;
+DROP FUNCTION IF EXISTS move_container_path() CASCADE;
+DROP FUNCTION IF EXISTS set_container_path() CASCADE;
 DROP FUNCTION IF EXISTS generate_container_id() CASCADE;
+DROP FUNCTION IF EXISTS next_container_id() CASCADE;
+DROP FUNCTION IF EXISTS next_container_log_id() CASCADE;
 DROP FUNCTION IF EXISTS generate_item_log_id() CASCADE;
 DROP FUNCTION IF EXISTS generate_item_id() CASCADE;
 DROP FUNCTION IF EXISTS generate_invitation_id() CASCADE;
@@ -42,6 +63,10 @@ DROP SEQUENCE IF EXISTS houses_id_seq CASCADE;
 DROP SEQUENCE IF EXISTS users_id_seq CASCADE;
 
 -- 테이블 삭제 (의존성 역순으로)
+DROP TABLE IF EXISTS dictionary_versions CASCADE;
+DROP TABLE IF EXISTS container_tombstones CASCADE;
+DROP TABLE IF EXISTS container_log_daily CASCADE;
+DROP TABLE IF EXISTS container_log_outbox CASCADE;
 DROP TABLE IF EXISTS container_logs CASCADE;
 DROP TABLE IF EXISTS item_logs CASCADE;
 DROP TABLE IF EXISTS items CASCADE;
@@ -136,6 +161,14 @@ CREATE TABLE houses (
     updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_user VARCHAR(10) NOT NULL,
     
+    -- 집계 (트리거로 관리)
+    member_count INT NOT NULL DEFAULT 0,
+    container_count INT NOT NULL DEFAULT 0,
+    
+    -- 변경 버전 (트리거로 관리, HTTP 캐시 검증용)
+    version BIGINT NOT NULL DEFAULT 0,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
     FOREIGN KEY (created_user) REFERENCES users(id) ON DELETE RESTRICT,
     FOREIGN KEY (updated_user) REFERENCES users(id) ON DELETE RESTRICT
 );
@@ -244,10 +277,21 @@ WHERE status_cd = 'COM1400001';
 -- ============================================
 -- 컨테이너 (영역/박스/물품 통합)
 -- ============================================
+-- 시퀀스 CACHE: 세션마다 번호를 미리 받아 두어 대량 INSERT 시 시퀀스 경합 감소 (번호 사이 공백 허용)
+CREATE SEQUENCE containers_id_seq START 1 CACHE 20;
+
+-- 컨테이너 ID 발급 (id 컬럼 기본값, 일괄 등록 시 애플리케이션에서 미리 발급할 때도 사용)
+-- 'C' + 연도 + 5자리 이상 번호 (99999를 넘으면 자리수가 늘어나며 잘리지 않음)
+CREATE OR REPLACE FUNCTION next_container_id()
+RETURNS VARCHAR AS $$
+    SELECT 'C' || TO_CHAR(CURRENT_DATE, 'YYYY') || LPAD(n::TEXT, GREATEST(5, length(n::TEXT)), '0')
+    FROM nextval('containers_id_seq') AS n;
+$$ LANGUAGE sql;
+
 CREATE TABLE containers (
-    id VARCHAR(11) PRIMARY KEY,
+    id VARCHAR(20) PRIMARY KEY DEFAULT next_container_id(),
     house_id VARCHAR(11) NOT NULL,
-    up_container_id VARCHAR(11),
+    up_container_id VARCHAR(20),
     type_cd VARCHAR(20) NOT NULL,
     name VARCHAR(200) NOT NULL,
     
@@ -256,6 +300,15 @@ CREATE TABLE containers (
     remk TEXT,
     owner_user_id VARCHAR(10),
     
+    -- 계층 경로 (예: /C202500001/C202500005/, 자기 자신 포함, 트리거로 관리)
+    path TEXT NOT NULL,
+    
+    -- 직속 하위 항목 수 (트리거로 관리)
+    child_count INT NOT NULL DEFAULT 0,
+    
+    -- 트리 응답 컬럼이 마지막으로 바뀐 집 버전 (트리거로 관리, 트리 변경분 조회)
+    change_version BIGINT NOT NULL DEFAULT 0,
+    
     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     created_user VARCHAR(10) NOT NULL,
     updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
@@ -275,29 +328,100 @@ CREATE TABLE containers (
     CHECK (type_cd = 'COM1200003' OR (quantity IS NULL AND owner_user_id IS NULL))
 );
 
-CREATE SEQUENCE containers_id_seq START 1;
-
-CREATE OR REPLACE FUNCTION generate_container_id()
+-- 계층 경로 설정 (생성 / 부모 변경 시)
+-- id는 컬럼 기본값(next_container_id())으로 BEFORE 트리거보다 먼저 채워짐
+CREATE OR REPLACE FUNCTION set_container_path()
 RETURNS TRIGGER AS $$
+DECLARE
+    parent_path TEXT;
 BEGIN
-    IF NEW.id IS NULL OR NEW.id = '' THEN
-        NEW.id := 'C' || TO_CHAR(CURRENT_DATE, 'YYYY') || LPAD(nextval('containers_id_seq')::TEXT, 5, '0');
+    IF NEW.up_container_id IS NULL THEN
+        NEW.path := '/' || NEW.id || '/';
+    ELSE
+        SELECT path INTO parent_path FROM containers WHERE id = NEW.up_container_id;
+        NEW.path := COALESCE(parent_path, '/') || NEW.id || '/';
     END IF;
     RETURN NEW;
 END;
 $$ LANGUAGE plpgsql;
 
-CREATE TRIGGER set_container_id
+CREATE TRIGGER set_container_path
     BEFORE INSERT ON containers
     FOR EACH ROW
-    EXECUTE FUNCTION generate_container_id();
+    EXECUTE FUNCTION set_container_path();
+
+-- SET 절에 up_container_id가 있어도 값이 같으면 실행하지 않음
+-- (서브트리 이동은 자손 path를 한 문장으로 직접 계산, utils/subtree_move.py)
+CREATE TRIGGER set_container_path_on_move
+    BEFORE UPDATE OF up_container_id ON containers
+    FOR EACH ROW
+    WHEN (OLD.up_container_id IS DISTINCT FROM NEW.up_container_id)
+    EXECUTE FUNCTION set_container_path();
+
+-- 부모 변경 시 하위 항목 경로 일괄 변경
+CREATE OR REPLACE FUNCTION move_container_path()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE containers
+    SET path = NEW.path || substr(path, length(OLD.path) + 1)
+    WHERE path LIKE OLD.path || '%'
+      AND id <> NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER move_container_path
+    AFTER UPDATE OF up_container_id ON containers
+    FOR EACH ROW
+    WHEN (OLD.up_container_id IS DISTINCT FROM NEW.up_container_id
+          AND OLD.path IS DISTINCT FROM NEW.path)
+    EXECUTE FUNCTION move_container_path();
+
+-- 계층 경로 전체 재계산 (백필 / 정합성 복구용)
+CREATE OR REPLACE FUNCTION rebuild_container_paths()
+RETURNS INT AS $$
+DECLARE
+    updated_count INT;
+BEGIN
+    WITH RECURSIVE tree AS (
+        SELECT id, '/' || id || '/' AS path
+        FROM containers
+        WHERE up_container_id IS NULL
+
+        UNION ALL
+
+        SELECT c.id, t.path || c.id || '/'
+        FROM containers c
+        JOIN tree t ON c.up_container_id = t.id
+    )
+    UPDATE containers c
+    SET path = tree.path
+    FROM tree
+    WHERE c.id = tree.id
+      AND c.path IS DISTINCT FROM tree.path;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
 
 -- ============================================
 -- 컨테이너 이력 (이동, 수정 등)
 -- ============================================
+-- created_at 기준 월별 파티션 (container_logs_YYYYMM)
+-- 조회는 최근 파티션만 읽고, 보관 기간이 지난 파티션은 통째로 분리/아카이브
+CREATE SEQUENCE container_logs_id_seq START 1 CACHE 20;
+
+-- 이력 ID 발급 (id 컬럼 기본값, 'L' + 연도 + 5자리 이상 번호)
+CREATE OR REPLACE FUNCTION next_container_log_id()
+RETURNS VARCHAR AS $$
+    SELECT 'L' || TO_CHAR(CURRENT_DATE, 'YYYY') || LPAD(n::TEXT, GREATEST(5, length(n::TEXT)), '0')
+    FROM nextval('container_logs_id_seq') AS n;
+$$ LANGUAGE sql;
+
 CREATE TABLE container_logs (
-    id VARCHAR(11) PRIMARY KEY,
-    container_id VARCHAR(11),
+    id VARCHAR(20) NOT NULL DEFAULT next_container_log_id(),
+    container_id VARCHAR(20),
     act_cd VARCHAR(20) NOT NULL,
 
     -- 컨테이너 정보 (삭제 대비)
@@ -305,8 +429,8 @@ CREATE TABLE container_logs (
     container_type_cd VARCHAR(20),
 
     -- 위치 변경
-    from_container_id VARCHAR(11),
-    to_container_id VARCHAR(11),
+    from_container_id VARCHAR(20),
+    to_container_id VARCHAR(20),
 
     -- 집 변경 (집 간 이동 시)
     from_house_id VARCHAR(11),
@@ -340,25 +464,562 @@ CREATE TABLE container_logs (
     FOREIGN KEY (from_house_id) REFERENCES houses(id) ON DELETE CASCADE,
     FOREIGN KEY (to_house_id) REFERENCES houses(id) ON DELETE CASCADE,
     FOREIGN KEY (created_user) REFERENCES users(id) ON DELETE RESTRICT,
-    FOREIGN KEY (updated_user) REFERENCES users(id) ON DELETE RESTRICT
+    FOREIGN KEY (updated_user) REFERENCES users(id) ON DELETE RESTRICT,
+
+    -- 파티션 키(created_at)를 포함해야 함
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- 해당 월 파티션이 아직 없을 때 받아두는 파티션 (파티션 생성 시 자동으로 옮겨짐)
+CREATE TABLE container_logs_default PARTITION OF container_logs DEFAULT;
+
+-- 월별 파티션 생성 (container_logs_YYYYMM, 이미 있으면 NULL 반환)
+-- default 파티션에 들어가 있던 해당 월 행은 새 파티션으로 옮긴 뒤 연결
+CREATE OR REPLACE FUNCTION create_container_log_partition(p_month DATE)
+RETURNS TEXT AS $$
+DECLARE
+    start_at DATE := date_trunc('month', p_month)::DATE;
+    end_at DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::DATE;
+    partition_name TEXT := 'container_logs_' || to_char(p_month, 'YYYYMM');
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN NULL;
+    END IF;
+
+    EXECUTE format('CREATE TABLE %I (LIKE container_logs INCLUDING DEFAULTS)', partition_name);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM container_logs_default WHERE created_at >= %L AND created_at < %L RETURNING *)
+         INSERT INTO %I SELECT * FROM moved',
+        start_at, end_at, partition_name
+    );
+    EXECUTE format(
+        'ALTER TABLE container_logs ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, start_at, end_at
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 이번 달부터 months_ahead개월 뒤까지 파티션 준비 (새로 만든 파티션 수 반환)
+CREATE OR REPLACE FUNCTION ensure_container_log_partitions(months_ahead INT DEFAULT 3)
+RETURNS INT AS $$
+DECLARE
+    created_count INT := 0;
+    target_month DATE;
+BEGIN
+    FOR target_month IN
+        SELECT generate_series(
+            date_trunc('month', CURRENT_DATE),
+            date_trunc('month', CURRENT_DATE) + make_interval(months => months_ahead),
+            INTERVAL '1 month'
+        )::DATE
+    LOOP
+        IF create_container_log_partition(target_month) IS NOT NULL THEN
+            created_count := created_count + 1;
+        END IF;
+    END LOOP;
+    RETURN created_count;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_container_log_partitions(3);
+
+-- 컨테이너 이력 기록 대기열 (Config.CONTAINER_LOG_MODE = 'outbox')
+-- 인덱스/FK/ID 없이 추가만 하는 테이블 (seq 순서 = 기록 순서)
+CREATE TABLE container_log_outbox (
+    seq BIGSERIAL PRIMARY KEY,
+    container_id VARCHAR(20),
+    act_cd VARCHAR(20) NOT NULL,
+    container_name VARCHAR(200),
+    container_type_cd VARCHAR(20),
+    from_container_id VARCHAR(20),
+    to_container_id VARCHAR(20),
+    from_house_id VARCHAR(11),
+    to_house_id VARCHAR(11),
+    from_owner_user_id VARCHAR(10),
+    to_owner_user_id VARCHAR(10),
+    from_quantity INT,
+    to_quantity INT,
+    from_remk TEXT,
+    to_remk TEXT,
+    log_remk TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    created_user VARCHAR(10) NOT NULL,
+    updated_user VARCHAR(10) NOT NULL
 );
 
-CREATE SEQUENCE container_logs_id_seq START 1;
+-- ============================================
+-- 집별 일간 활동 집계 (container_log_daily)
+-- ============================================
+-- 이력이 보관 기간이 지나 분리(아카이브)되어도 집별 활동량은 남도록 일 단위로 집계
+-- 집 간 이동 이력은 출발/도착 집 모두에 집계
 
-CREATE OR REPLACE FUNCTION generate_container_log_id()
+CREATE TABLE container_log_daily (
+    house_id VARCHAR(11) NOT NULL,
+    log_date DATE NOT NULL,
+    act_cd VARCHAR(20) NOT NULL,
+    log_count INT NOT NULL,
+    PRIMARY KEY (house_id, log_date, act_cd),
+    FOREIGN KEY (house_id) REFERENCES houses(id) ON DELETE CASCADE
+);
+
+-- [from_date, to_date) 구간 재집계 (다시 실행해도 같은 결과, 집계한 행 수 반환)
+CREATE OR REPLACE FUNCTION rollup_container_logs(from_date DATE, to_date DATE)
+RETURNS INT AS $$
+DECLARE
+    rolled_count INT;
+BEGIN
+    DELETE FROM container_log_daily
+    WHERE log_date >= from_date AND log_date < to_date;
+
+    INSERT INTO container_log_daily (house_id, log_date, act_cd, log_count)
+    SELECT h.house_id, l.created_at::DATE, l.act_cd, COUNT(*)
+    FROM container_logs l
+    CROSS JOIN LATERAL (
+        SELECT DISTINCT house_id
+        FROM unnest(ARRAY[l.from_house_id, l.to_house_id]) AS t(house_id)
+        WHERE house_id IS NOT NULL
+    ) h
+    WHERE l.created_at >= from_date AND l.created_at < to_date
+    GROUP BY h.house_id, l.created_at::DATE, l.act_cd;
+
+    GET DIAGNOSTICS rolled_count = ROW_COUNT;
+    RETURN rolled_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- 집별 집계 (구성원 수 / 최상위 영역 수)
+-- ============================================
+-- houses.member_count, houses.container_count 를 문장 단위 트리거로 갱신
+-- (일괄 INSERT/DELETE 시에도 집마다 한 번만 UPDATE)
+
+CREATE OR REPLACE FUNCTION update_house_member_count()
 RETURNS TRIGGER AS $$
 BEGIN
-    IF NEW.id IS NULL OR NEW.id = '' THEN
-        NEW.id := 'L' || TO_CHAR(CURRENT_DATE, 'YYYY') || LPAD(nextval('container_logs_id_seq')::TEXT, 5, '0');
+    IF TG_OP = 'INSERT' THEN
+        UPDATE houses h
+        SET member_count = h.member_count + d.cnt
+        FROM (SELECT house_id, COUNT(*) AS cnt FROM new_rows GROUP BY house_id) d
+        WHERE h.id = d.house_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE houses h
+        SET member_count = h.member_count - d.cnt
+        FROM (SELECT house_id, COUNT(*) AS cnt FROM old_rows GROUP BY house_id) d
+        WHERE h.id = d.house_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER count_house_members_insert
+    AFTER INSERT ON house_members
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_house_member_count();
+
+CREATE TRIGGER count_house_members_delete
+    AFTER DELETE ON house_members
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_house_member_count();
+
+CREATE OR REPLACE FUNCTION update_house_container_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE houses h
+        SET container_count = h.container_count + d.cnt
+        FROM (
+            SELECT house_id, COUNT(*) AS cnt
+            FROM new_rows
+            WHERE up_container_id IS NULL
+            GROUP BY house_id
+        ) d
+        WHERE h.id = d.house_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE houses h
+        SET container_count = h.container_count - d.cnt
+        FROM (
+            SELECT house_id, COUNT(*) AS cnt
+            FROM old_rows
+            WHERE up_container_id IS NULL
+            GROUP BY house_id
+        ) d
+        WHERE h.id = d.house_id;
+    ELSE
+        -- 최상위 여부 또는 집이 바뀐 행만 반영
+        UPDATE houses h
+        SET container_count = h.container_count + d.cnt
+        FROM (
+            SELECT house_id, SUM(delta) AS cnt
+            FROM (
+                SELECT o.house_id, -1 AS delta
+                FROM old_rows o
+                JOIN new_rows n ON n.id = o.id
+                WHERE o.up_container_id IS NULL
+                  AND (n.up_container_id IS NOT NULL OR n.house_id <> o.house_id)
+
+                UNION ALL
+
+                SELECT n.house_id, 1 AS delta
+                FROM old_rows o
+                JOIN new_rows n ON n.id = o.id
+                WHERE n.up_container_id IS NULL
+                  AND (o.up_container_id IS NOT NULL OR n.house_id <> o.house_id)
+            ) changes
+            GROUP BY house_id
+        ) d
+        WHERE h.id = d.house_id
+          AND d.cnt <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER count_house_containers_insert
+    AFTER INSERT ON containers
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_house_container_count();
+
+CREATE TRIGGER count_house_containers_update
+    AFTER UPDATE ON containers
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_house_container_count();
+
+CREATE TRIGGER count_house_containers_delete
+    AFTER DELETE ON containers
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_house_container_count();
+
+-- 집계 재계산 (정합성 점검/복구용, 틀어진 집 수 반환)
+CREATE OR REPLACE FUNCTION reconcile_house_counters()
+RETURNS INT AS $$
+DECLARE
+    fixed_count INT;
+BEGIN
+    WITH actual AS (
+        SELECT
+            h.id,
+            (SELECT COUNT(*) FROM house_members hm WHERE hm.house_id = h.id) AS member_count,
+            (SELECT COUNT(*) FROM containers c WHERE c.house_id = h.id AND c.up_container_id IS NULL) AS container_count
+        FROM houses h
+    )
+    UPDATE houses h
+    SET member_count = a.member_count,
+        container_count = a.container_count
+    FROM actual a
+    WHERE h.id = a.id
+      AND (h.member_count <> a.member_count OR h.container_count <> a.container_count);
+
+    GET DIAGNOSTICS fixed_count = ROW_COUNT;
+    RETURN fixed_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- 컨테이너별 하위 항목 수 (child_count)
+-- ============================================
+-- containers.child_count 를 문장 단위 트리거로 갱신 (생성 / 삭제 / 부모 변경)
+
+CREATE OR REPLACE FUNCTION update_container_child_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE containers p
+        SET child_count = p.child_count + d.cnt
+        FROM (
+            SELECT up_container_id, COUNT(*) AS cnt
+            FROM new_rows
+            WHERE up_container_id IS NOT NULL
+            GROUP BY up_container_id
+        ) d
+        WHERE p.id = d.up_container_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE containers p
+        SET child_count = p.child_count - d.cnt
+        FROM (
+            SELECT up_container_id, COUNT(*) AS cnt
+            FROM old_rows
+            WHERE up_container_id IS NOT NULL
+            GROUP BY up_container_id
+        ) d
+        WHERE p.id = d.up_container_id;
+    ELSE
+        -- 부모가 바뀐 행이 없으면 종료
+        -- 아래 child_count UPDATE도 이 트리거를 다시 실행하므로 (문장 트리거는 0건이어도 실행됨)
+        -- 여기서 멈추지 않으면 재귀가 끝나지 않음
+        IF NOT EXISTS (
+            SELECT 1
+            FROM old_rows o
+            JOIN new_rows n ON n.id = o.id
+            WHERE o.up_container_id IS DISTINCT FROM n.up_container_id
+        ) THEN
+            RETURN NULL;
+        END IF;
+
+        -- 부모가 바뀐 행만 반영
+        UPDATE containers p
+        SET child_count = p.child_count + d.cnt
+        FROM (
+            SELECT parent_id, SUM(delta) AS cnt
+            FROM (
+                SELECT o.up_container_id AS parent_id, -1 AS delta
+                FROM old_rows o
+                JOIN new_rows n ON n.id = o.id
+                WHERE o.up_container_id IS NOT NULL
+                  AND o.up_container_id IS DISTINCT FROM n.up_container_id
+
+                UNION ALL
+
+                SELECT n.up_container_id, 1
+                FROM old_rows o
+                JOIN new_rows n ON n.id = o.id
+                WHERE n.up_container_id IS NOT NULL
+                  AND o.up_container_id IS DISTINCT FROM n.up_container_id
+            ) changes
+            GROUP BY parent_id
+        ) d
+        WHERE p.id = d.parent_id
+          AND d.cnt <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER count_container_children_insert
+    AFTER INSERT ON containers
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_container_child_count();
+
+CREATE TRIGGER count_container_children_update
+    AFTER UPDATE ON containers
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_container_child_count();
+
+CREATE TRIGGER count_container_children_delete
+    AFTER DELETE ON containers
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_container_child_count();
+
+-- 하위 항목 수 재계산 (정합성 점검/복구용, 틀어진 컨테이너 수 반환)
+CREATE OR REPLACE FUNCTION reconcile_container_child_counts()
+RETURNS INT AS $$
+DECLARE
+    fixed_count INT;
+BEGIN
+    WITH actual AS (
+        SELECT p.id, COUNT(c.id) AS child_count
+        FROM containers p
+        LEFT JOIN containers c ON c.up_container_id = p.id
+        GROUP BY p.id
+    )
+    UPDATE containers p
+    SET child_count = a.child_count
+    FROM actual a
+    WHERE p.id = a.id
+      AND p.child_count <> a.child_count;
+
+    GET DIAGNOSTICS fixed_count = ROW_COUNT;
+    RETURN fixed_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- 집 변경 버전 (HTTP ETag / Last-Modified 용)
+-- ============================================
+-- 컨테이너/구성원이 바뀔 때마다 houses.version 증가 (문장 단위로 집마다 한 번)
+
+CREATE OR REPLACE FUNCTION bump_house_version()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed_house_ids VARCHAR[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT house_id) INTO changed_house_ids FROM new_rows;
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- 집 간 이동은 출발/도착 집 모두 변경
+        SELECT array_agg(DISTINCT house_id) INTO changed_house_ids
+        FROM (SELECT house_id FROM new_rows UNION SELECT house_id FROM old_rows) t;
+    ELSE
+        SELECT array_agg(DISTINCT house_id) INTO changed_house_ids FROM old_rows;
     END IF;
+
+    -- 동시에 커밋되는 트랜잭션 사이에서도 changed_at이 줄어들지 않도록 GREATEST 사용
+    UPDATE houses
+    SET version = version + 1,
+        changed_at = GREATEST(clock_timestamp(), changed_at + INTERVAL '1 millisecond')
+    WHERE id = ANY(changed_house_ids);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER bump_house_version_containers_insert
+    AFTER INSERT ON containers
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_house_version();
+
+CREATE TRIGGER bump_house_version_containers_update
+    AFTER UPDATE ON containers
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_house_version();
+
+CREATE TRIGGER bump_house_version_containers_delete
+    AFTER DELETE ON containers
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_house_version();
+
+CREATE TRIGGER bump_house_version_members_insert
+    AFTER INSERT ON house_members
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_house_version();
+
+CREATE TRIGGER bump_house_version_members_delete
+    AFTER DELETE ON house_members
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_house_version();
+
+-- ============================================
+-- 컨테이너 삭제 기록 (집 전체 트리 변경분 조회용)
+-- ============================================
+-- 삭제되면 container_logs.container_id가 NULL이 되므로 삭제/다른 집 이동된 ID를 따로 기록
+-- 문장 단위 트리거라 CASCADE로 함께 삭제된 하위 항목도 한 번의 INSERT로 기록
+-- 오래된 기록은 flask prune-container-tombstones 로 정리 (Config.TREE_SYNC_TOMBSTONE_DAYS)
+CREATE TABLE container_tombstones (
+    house_id VARCHAR(11) NOT NULL,
+    container_id VARCHAR(20) NOT NULL,
+    change_version BIGINT NOT NULL DEFAULT 0,
+    removed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 컨테이너 변경 버전: 커밋될 집 버전을 행에 기록
+CREATE OR REPLACE FUNCTION set_container_change_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- 트리 응답에 없는 컬럼(child_count, path, 메모 등)만 바뀌면 그대로 둠
+    IF TG_OP = 'UPDATE'
+       AND NEW.house_id = OLD.house_id
+       AND NEW.up_container_id IS NOT DISTINCT FROM OLD.up_container_id
+       AND NEW.type_cd = OLD.type_cd
+       AND NEW.name = OLD.name
+       AND NEW.quantity IS NOT DISTINCT FROM OLD.quantity THEN
+        RETURN NEW;
+    END IF;
+
+    -- 문장 끝의 집 버전 증가(bump_house_version)와 같은 행 잠금을 먼저 잡고 읽음
+    -- 잠금은 커밋까지 유지되므로 같은 집의 변경은 커밋 순서대로 번호가 커짐
+    SELECT version + 1 INTO NEW.change_version
+    FROM houses
+    WHERE id = NEW.house_id
+    FOR NO KEY UPDATE;
+
     RETURN NEW;
 END;
 $$ LANGUAGE plpgsql;
 
-CREATE TRIGGER set_container_log_id
-    BEFORE INSERT ON container_logs
+CREATE TRIGGER set_container_change_version
+    BEFORE INSERT OR UPDATE ON containers
     FOR EACH ROW
-    EXECUTE FUNCTION generate_container_log_id();
+    EXECUTE FUNCTION set_container_change_version();
+
+-- 삭제 기록에는 출발 집의 증가된 버전을 기록
+-- (bump_house_version_* 트리거가 이름 순으로 먼저 실행되어 집 행을 잠그고 버전을 올려 둠)
+CREATE OR REPLACE FUNCTION record_container_tombstones()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        -- 집 삭제로 함께 삭제된 컨테이너는 기록하지 않음
+        INSERT INTO container_tombstones (house_id, container_id, change_version)
+        SELECT o.house_id, o.id, h.version
+        FROM old_rows o
+        JOIN houses h ON h.id = o.house_id;
+    ELSE
+        -- 집 간 이동은 출발 집 입장에서 삭제와 같음
+        INSERT INTO container_tombstones (house_id, container_id, change_version)
+        SELECT o.house_id, o.id, h.version
+        FROM old_rows o
+        JOIN new_rows n ON n.id = o.id
+        JOIN houses h ON h.id = o.house_id
+        WHERE n.house_id <> o.house_id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER record_container_tombstones_update
+    AFTER UPDATE ON containers
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_container_tombstones();
+
+CREATE TRIGGER record_container_tombstones_delete
+    AFTER DELETE ON containers
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_container_tombstones();
+
+-- ============================================
+-- 공통코드 변경 알림 (애플리케이션 코드 사전 갱신용)
+-- ============================================
+CREATE OR REPLACE FUNCTION notify_com_code_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('com_code_changed', TG_OP);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER notify_com_code_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON com_code_d
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_com_code_changed();
+
+-- ============================================
+-- 사용자 이름 / 공통코드 변경 버전 (HTTP 캐시 검증용, ETag에 houses.version과 함께 사용)
+-- ============================================
+CREATE TABLE dictionary_versions (
+    name VARCHAR(30) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO dictionary_versions (name) VALUES ('users.name'), ('com_code_d');
+
+CREATE OR REPLACE FUNCTION bump_dictionary_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE dictionary_versions SET version = version + 1 WHERE name = TG_ARGV[0];
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER bump_dictionary_version_user_name
+    AFTER UPDATE OF name ON users
+    FOR EACH ROW
+    WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION bump_dictionary_version('users.name');
+
+CREATE TRIGGER bump_dictionary_version_user_delete
+    AFTER DELETE ON users
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_dictionary_version('users.name');
+
+CREATE TRIGGER bump_dictionary_version_com_code
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON com_code_d
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_dictionary_version('com_code_d');
 
 -- ============================================
 -- 인덱스 생성
@@ -377,10 +1038,20 @@ CREATE INDEX idx_containers_parent ON containers(up_container_id);
 CREATE INDEX idx_containers_type ON containers(type_cd);
 CREATE INDEX idx_containers_owner ON containers(owner_user_id) WHERE owner_user_id IS NOT NULL;
 CREATE INDEX idx_containers_parent_type ON containers(up_container_id, type_cd);
-CREATE INDEX idx_container_logs_container ON container_logs(container_id);
+CREATE INDEX idx_containers_path ON containers(path text_pattern_ops);
+-- 집 전체 트리 변경분 조회 (토큰의 집 버전 이후 변경된 컨테이너 / 삭제 기록)
+CREATE INDEX idx_containers_house_change ON containers(house_id, change_version);
+CREATE INDEX idx_container_tombstones_house ON container_tombstones(house_id, change_version);
+
+-- 컨테이너 검색용 trigram 인덱스 (부분 일치 / 오타 허용 검색)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX idx_containers_name_trgm ON containers USING gin (name gin_trgm_ops);
+CREATE INDEX idx_containers_remk_trgm ON containers USING gin (remk gin_trgm_ops) WHERE remk IS NOT NULL;
+-- 히스토리 조회 정렬(created_at DESC, id DESC)과 일치하는 복합 인덱스 (커서 페이지네이션용)
+CREATE INDEX idx_container_logs_container ON container_logs(container_id, created_at DESC, id DESC);
 CREATE INDEX idx_container_logs_created ON container_logs(created_at);
-CREATE INDEX idx_container_logs_from_house ON container_logs(from_house_id) WHERE from_house_id IS NOT NULL;
-CREATE INDEX idx_container_logs_to_house ON container_logs(to_house_id) WHERE to_house_id IS NOT NULL;
+CREATE INDEX idx_container_logs_from_house ON container_logs(from_house_id, created_at DESC, id DESC) WHERE from_house_id IS NOT NULL;
+CREATE INDEX idx_container_logs_to_house ON container_logs(to_house_id, created_at DESC, id DESC) WHERE to_house_id IS NOT NULL;
 
 -- ============================================
 -- 코멘트
@@ -391,8 +1062,12 @@ COMMENT ON TABLE house_members IS '집 구성원';
 COMMENT ON TABLE house_invitations IS '집 멤버 초대';
 COMMENT ON TABLE containers IS '컨테이너 (영역/박스/물품 통합)';
 COMMENT ON TABLE container_logs IS '컨테이너 이력 (이동, 수정 등)';
+COMMENT ON TABLE container_log_daily IS '집별 일간 활동 집계 (이력 아카이브 후에도 유지)';
+COMMENT ON TABLE container_tombstones IS '삭제/다른 집으로 이동된 컨테이너 기록 (트리 변경분 조회용, 트리거로 관리)';
+COMMENT ON TABLE container_log_outbox IS '컨테이너 이력 기록 대기열 (outbox 모드, container_logs로 옮긴 뒤 삭제)';
 COMMENT ON TABLE com_code_m IS '공통코드 마스터';
 COMMENT ON TABLE com_code_d IS '공통코드 상세';
+COMMENT ON TABLE dictionary_versions IS '사용자 이름 / 공통코드 변경 버전 (트리거로 관리, ETag)';
 
 COMMENT ON COLUMN users.account_status IS '계정 상태 (COM1500001: 활성, COM1500002: 삭제됨, COM1500003: 정지됨)';
 COMMENT ON COLUMN containers.type_cd IS '컨테이너 유형 (COM1200001: 영역, COM1200002: 박스, COM1200003: 물품)';
@@ -400,6 +1075,12 @@ COMMENT ON COLUMN containers.up_container_id IS '부모 컨테이너 (NULL이면
 COMMENT ON COLUMN containers.quantity IS '수량 (물품일 때만 사용)';
 COMMENT ON COLUMN containers.remk IS '메모 (물품일 때만 사용)';
 COMMENT ON COLUMN containers.owner_user_id IS '소유자 (물품일 때만 사용)';
+COMMENT ON COLUMN houses.member_count IS '구성원 수 (트리거로 관리)';
+COMMENT ON COLUMN houses.container_count IS '최상위 영역 수 (트리거로 관리)';
+COMMENT ON COLUMN houses.version IS '컨테이너/구성원 변경 버전 (트리거로 관리, ETag)';
+COMMENT ON COLUMN houses.changed_at IS '마지막 변경 시각 (트리거로 관리, Last-Modified)';
+COMMENT ON COLUMN containers.child_count IS '직속 하위 항목 수 (트리거로 관리)';
+COMMENT ON COLUMN containers.path IS '계층 경로 (/최상위ID/.../자기ID/, 조상/자손 조회용)';
 COMMENT ON COLUMN house_members.seq IS '집 내 구성원 순번 (자동 증가)';
 COMMENT ON COLUMN container_logs.from_house_id IS '출발 집 (집 간 이동 시)';
 COMMENT ON COLUMN container_logs.to_house_id IS '도착 집 (집 간 이동 시)';
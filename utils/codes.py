@@ -0,0 +1,153 @@
+import select
+import threading
+import time
+import psycopg2
+from database import get_db
+from config import Config
+
+# 공통코드(com_code_d) 사전
+# 코드 -> 코드명 매핑을 프로세스 메모리에 올려두고, 조회 쿼리에서 com_code_d JOIN 대신 사용합니다.
+# 갱신 방법: 1) 관리자 reload API  2) LISTEN/NOTIFY (Config.CODE_NOTIFY_ENABLED)
+#           3) 사전에 없는 코드를 만나면 CODE_MISS_RELOAD_INTERVAL 간격으로 자동 재적재
+#           4) ETag 조회 시 DB의 공통코드 버전(dictionary_versions)이 적재한 버전과 다르면 재적재
+
+CODE_NOTIFY_CHANNEL = 'com_code_changed'
+
+_codes = {}
+_version = 0
+_source_version = None  # 적재 시점의 dictionary_versions 'com_code_d' 버전
+_loaded_at = None
+_last_miss_reload = 0.0
+_load_lock = threading.Lock()
+_listener_thread = None
+
+
+def load_codes():
+    """com_code_d 전체를 다시 읽어 사전을 교체 (적재한 코드 수 반환)"""
+    global _codes, _version, _source_version, _loaded_at
+
+    with get_db() as conn:
+        cur = conn.cursor()
+        # 버전을 먼저 읽음 (그 사이 바뀐 코드까지 읽혀도 다음 확인 때 한 번 더 적재할 뿐)
+        cur.execute("SELECT version FROM dictionary_versions WHERE name = 'com_code_d'")
+        row = cur.fetchone()
+        cur.execute("SELECT cd, nm FROM com_code_d")
+        codes = dict(cur.fetchall())
+
+    with _load_lock:
+        # 딕셔너리 자체를 교체하므로 읽는 쪽은 잠금 없이 사용
+        _codes = codes
+        _version += 1
+        _source_version = row[0] if row else None
+        _loaded_at = time.time()
+
+    return len(codes)
+
+
+def _ensure_loaded():
+    if _version == 0:
+        load_codes()
+
+
+def code_name(cd):
+    """코드명 조회 (없는 코드면 None)"""
+    global _last_miss_reload
+
+    if cd is None:
+        return None
+
+    _ensure_loaded()
+    name = _codes.get(cd)
+    if name is None:
+        # 다른 서버/프로세스에서 추가된 코드일 수 있으므로 일정 간격으로만 재적재
+        now = time.monotonic()
+        if now - _last_miss_reload >= Config.CODE_MISS_RELOAD_INTERVAL:
+            _last_miss_reload = now
+            load_codes()
+            name = _codes.get(cd)
+    return name
+
+
+def sync_code_version(source_version):
+    """DB의 공통코드 버전이 적재한 버전과 다르면 재적재 (ETag에 넣은 버전과 응답의 코드명을 맞춤)"""
+    if source_version != _source_version:
+        load_codes()
+
+
+def attach_code_names(rows, fields):
+    """
+    행(딕셔너리 또는 목록)에 코드명 필드 추가
+
+    fields: {코드 컬럼: 코드명 컬럼} 예) {'type_cd': 'type_nm'}
+    """
+    if rows is None:
+        return rows
+
+    for row in ([rows] if isinstance(rows, dict) else rows):
+        for cd_field, nm_field in fields.items():
+            row[nm_field] = code_name(row.get(cd_field))
+    return rows
+
+
+def get_code_dictionary():
+    """(버전, 적재 시각, 코드 사전) 반환"""
+    _ensure_loaded()
+    return _version, _loaded_at, dict(_codes)
+
+
+def init_codes(app):
+    """
+    서버 시작 시 코드 사전 적재 및 (설정 시) 변경 알림 수신 시작
+
+    DB에 연결할 수 없으면 첫 조회 시점에 다시 적재합니다.
+    """
+    try:
+        load_codes()
+    except Exception as e:
+        app.logger.warning('공통코드 사전 적재 실패 (첫 조회 시 재시도): %s', e)
+
+    if Config.CODE_NOTIFY_ENABLED:
+        start_code_listener()
+
+
+def start_code_listener():
+    """com_code_changed 채널 LISTEN 스레드 시작 (프로세스당 1개)"""
+    global _listener_thread
+
+    if _listener_thread is not None and _listener_thread.is_alive():
+        return
+
+    _listener_thread = threading.Thread(target=_listen_loop, name='code-listener', daemon=True)
+    _listener_thread.start()
+
+
+def _listen_loop():
+    # LISTEN은 세션에 묶이므로 풀이 아닌 전용 커넥션 사용
+    while True:
+        conn = None
+        try:
+            conn = psycopg2.connect(
+                host=Config.DB_HOST,
+                port=Config.DB_PORT,
+                database=Config.DB_NAME,
+                user=Config.DB_USER,
+                password=Config.DB_PASSWORD
+            )
+            conn.autocommit = True
+            conn.cursor().execute(f"LISTEN {CODE_NOTIFY_CHANNEL}")
+
+            # 재연결 사이에 놓친 변경이 있을 수 있으므로 연결 직후 한 번 적재
+            load_codes()
+
+            while True:
+                if select.select([conn], [], [], 60) == ([], [], []):
+                    continue
+                conn.poll()
+                if conn.notifies:
+                    conn.notifies.clear()
+                    load_codes()
+        except Exception:
+            time.sleep(5)
+        finally:
+            if conn is not None:
+                conn.close()
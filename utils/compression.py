@@ -0,0 +1,53 @@
+import gzip
+from flask import request
+from config import Config
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip만 사용
+    brotli = None
+
+# 응답 압축 (Accept-Encoding 협상: br > gzip)
+# 스트리밍 응답(집 내보내기 등)과 작은 응답은 압축하지 않습니다.
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/csv', 'text/plain', 'application/x-ndjson')
+
+
+def _choose_encoding():
+    accept = request.accept_encodings
+    if brotli is not None and accept['br']:
+        return 'br'
+    if accept['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress_response(response):
+    if (not Config.COMPRESS_ENABLED
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    data = response.get_data()
+    if len(data) < Config.COMPRESS_MIN_SIZE:
+        return response
+
+    encoding = _choose_encoding()
+    if encoding == 'br':
+        data = brotli.compress(data, quality=Config.COMPRESS_BROTLI_QUALITY)
+    elif encoding == 'gzip':
+        data = gzip.compress(data, compresslevel=Config.COMPRESS_GZIP_LEVEL)
+    else:
+        return response
+
+    response.set_data(data)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_compression(app):
+    app.after_request(compress_response)
@@ -0,0 +1,201 @@
+import csv
+import io
+from collections import defaultdict, deque
+
+# 컨테이너 일괄 등록 요청 파싱 / 검증
+
+AREA_TYPE_CD = 'COM1200001'
+BOX_TYPE_CD = 'COM1200002'
+ITEM_TYPE_CD = 'COM1200003'
+CONTAINER_TYPE_CDS = (AREA_TYPE_CD, BOX_TYPE_CD, ITEM_TYPE_CD)
+
+IMPORT_FIELDS = ('ref', 'parent_ref', 'parent_id', 'type_cd', 'name', 'quantity', 'owner_user_id', 'remk')
+
+
+def parse_import_request(req):
+    """
+    요청 본문을 행 목록으로 변환 (형식 오류면 ValueError)
+
+    - JSON: {"items": [...]} 평면 목록(parent_ref로 연결) 또는 children 중첩 트리
+    - CSV (Content-Type: text/csv): 헤더 ref,parent_ref,parent_id,type_cd,name,quantity,owner_user_id,remk
+    """
+    if req.mimetype in ('text/csv', 'application/csv'):
+        return _parse_csv(req.get_data(as_text=True))
+
+    data = req.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('items'), list):
+        raise ValueError('items 배열이 필요합니다')
+    return _parse_json_items(data['items'])
+
+
+def _parse_json_items(items):
+    rows = []
+    # 깊이 우선(입력 순서 유지)으로 중첩 트리를 평면화
+    stack = [(node, None) for node in reversed(items)]
+    while stack:
+        node, parent_ref = stack.pop()
+        row_no = len(rows) + 1
+
+        if not isinstance(node, dict):
+            rows.append({'row': row_no, 'ref': f'#{row_no}', 'parent_ref': parent_ref,
+                         'invalid': '항목은 객체여야 합니다'})
+            continue
+
+        row = {field: node.get(field) for field in IMPORT_FIELDS}
+        row['row'] = row_no
+        row['ref'] = str(row['ref']) if row['ref'] is not None else f'#{row_no}'
+        if parent_ref is not None:
+            row['parent_ref'] = parent_ref
+        elif row['parent_ref'] is not None:
+            row['parent_ref'] = str(row['parent_ref'])
+        rows.append(row)
+
+        children = node.get('children') or []
+        if not isinstance(children, list):
+            row['invalid'] = 'children은 배열이어야 합니다'
+            continue
+        stack.extend((child, row['ref']) for child in reversed(children))
+
+    return rows
+
+
+def _parse_csv(text):
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames or 'type_cd' not in reader.fieldnames or 'name' not in reader.fieldnames:
+        raise ValueError('CSV 헤더에 type_cd, name 컬럼이 필요합니다')
+
+    rows = []
+    for record in reader:
+        row = {field: (record.get(field) or '').strip() or None for field in IMPORT_FIELDS}
+        row['row'] = reader.line_num
+        if row['ref'] is None:
+            row['ref'] = f'#{reader.line_num}'
+        if row['quantity'] is not None:
+            try:
+                row['quantity'] = int(row['quantity'])
+            except ValueError:
+                row['invalid'] = '수량은 정수여야 합니다'
+        rows.append(row)
+
+    return rows
+
+
+def _validate_row(row, existing_parents, valid_owner_ids):
+    if row.get('invalid'):
+        return row['invalid']
+
+    # ID는 문자열만 허용 (이후 조회/집합 연산에 그대로 쓰임)
+    for field in ('parent_id', 'owner_user_id'):
+        if row[field] is not None and not isinstance(row[field], str):
+            return f'{field}는 문자열이어야 합니다'
+
+    if row['type_cd'] not in CONTAINER_TYPE_CDS:
+        return '올바르지 않은 type_cd 입니다'
+
+    name = row['name']
+    if not isinstance(name, str) or not name.strip():
+        return 'name은 필수입니다'
+    if len(name) > 200:
+        return 'name은 200자 이하여야 합니다'
+
+    if row['parent_ref'] is not None and row['parent_id'] is not None:
+        return 'parent_ref와 parent_id는 함께 지정할 수 없습니다'
+
+    if row['parent_id'] is not None:
+        parent_type_cd = existing_parents.get(row['parent_id'])
+        if parent_type_cd is None:
+            return '부모 컨테이너를 찾을 수 없습니다'
+        if parent_type_cd == ITEM_TYPE_CD:
+            return '물품 안에는 다른 항목을 넣을 수 없습니다'
+
+    if row['type_cd'] == ITEM_TYPE_CD:
+        if row['quantity'] is None:
+            row['quantity'] = 1
+        if isinstance(row['quantity'], bool) or not isinstance(row['quantity'], int):
+            return '수량은 정수여야 합니다'
+        if row['quantity'] < 0:
+            return '수량은 0 이상이어야 합니다'
+        if row['owner_user_id'] is not None and row['owner_user_id'] not in valid_owner_ids:
+            return '존재하지 않는 소유자입니다'
+    else:
+        # 영역/박스는 수량, 소유자 없음
+        row['quantity'] = None
+        row['owner_user_id'] = None
+
+    if row['remk'] is not None and not isinstance(row['remk'], str):
+        return 'remk는 문자열이어야 합니다'
+
+    return None
+
+
+def validate_import_rows(rows, existing_parents, valid_owner_ids):
+    """
+    행 검증 후 (부모가 먼저 오도록 정렬된 유효 행 목록, 오류 목록) 반환
+
+    - existing_parents: {기존 컨테이너 ID: type_cd} (parent_id 로 지정된 부모들)
+    - valid_owner_ids: 존재하는 사용자 ID 집합
+    오류가 있는 행의 하위 행들도 함께 오류 처리됩니다.
+    """
+    errors = {}
+    by_ref = {}
+
+    for row in rows:
+        error = _validate_row(row, existing_parents, valid_owner_ids)
+        if row['ref'] in by_ref:
+            error = error or '중복된 ref 입니다'
+        else:
+            by_ref[row['ref']] = row
+        if error:
+            errors[row['row']] = (row['ref'], error)
+
+    # 배치 내 부모-자식 연결
+    roots = []
+    children = defaultdict(list)
+    for row in rows:
+        if row['row'] in errors:
+            continue
+        parent_ref = row['parent_ref']
+        if parent_ref is None:
+            roots.append(row)
+            continue
+        parent = by_ref.get(parent_ref)
+        if parent is None:
+            errors[row['row']] = (row['ref'], '부모 ref를 찾을 수 없습니다')
+        elif parent['row'] in errors:
+            # 오류 행은 type_cd 등이 없을 수 있으므로 읽지 않음 (아래에서 '부모 행에 오류' 처리)
+            children[parent_ref].append(row)
+        elif parent['type_cd'] == ITEM_TYPE_CD:
+            errors[row['row']] = (row['ref'], '물품 안에는 다른 항목을 넣을 수 없습니다')
+        else:
+            children[parent_ref].append(row)
+
+    # 너비 우선으로 정렬 (부모가 항상 자식보다 먼저 INSERT 되도록)
+    ordered = []
+    queue = deque(roots)
+    while queue:
+        row = queue.popleft()
+        ordered.append(row)
+        queue.extend(children.pop(row['ref'], []))
+
+    # 도달하지 못한 행: 조상 중 오류 행이 있거나 순환 참조
+    failed_rows = set(errors)
+    for rows_left in children.values():
+        for row in rows_left:
+            errors[row['row']] = (row['ref'], _unreachable_reason(row, by_ref, failed_rows))
+
+    error_list = [
+        {'row': row_no, 'ref': ref, 'error': message}
+        for row_no, (ref, message) in sorted(errors.items())
+    ]
+    return ordered, error_list
+
+
+def _unreachable_reason(row, by_ref, failed_rows):
+    seen = set()
+    current = row
+    while current['parent_ref'] is not None and current['ref'] not in seen:
+        seen.add(current['ref'])
+        current = by_ref[current['parent_ref']]
+        if current['row'] in failed_rows:
+            return '부모 행에 오류가 있습니다'
+    return '순환 참조입니다'
@@ -0,0 +1,319 @@
+import logging
+import queue
+import threading
+import time
+import psycopg2
+from psycopg2.extras import execute_values
+from database import get_db
+from config import Config
+
+# 컨테이너 이력(container_logs) 기록
+#
+# Config.CONTAINER_LOG_MODE
+# - 'sync'  : 요청 트랜잭션 안에서 container_logs에 바로 INSERT (기본값)
+# - 'outbox': 요청 트랜잭션 안에서는 인덱스/FK가 없는 container_log_outbox에만 INSERT,
+#             백그라운드 스레드(또는 flush-container-logs 명령)가 모아서 container_logs로 옮김
+# - 'queue' : 커밋 후 프로세스 메모리 큐에 넣고 백그라운드 스레드가 여러 행 INSERT로 기록
+#             (요청 트랜잭션에서는 발생 시각만 조회해 가장 빠르지만 프로세스가 비정상 종료되면 큐에 남은 이력은 유실)
+#
+# outbox / queue 모드는 이력이 조회 API에 보이기까지 FLUSH_INTERVAL 정도 늦을 수 있습니다.
+# 같은 컨테이너의 이력 순서는 created_at(이력 발생 시각)과 단일 flush 순서로 유지됩니다.
+
+logger = logging.getLogger(__name__)
+
+LOG_COLUMNS = (
+    'container_id', 'container_name', 'container_type_cd', 'act_cd',
+    'from_container_id', 'to_container_id',
+    'from_house_id', 'to_house_id',
+    'from_quantity', 'to_quantity', 'from_owner_user_id', 'to_owner_user_id',
+    'from_remk', 'to_remk', 'log_remk', 'created_user', 'updated_user'
+)
+
+# VALUES 목록의 NULL 타입 지정용
+_COLUMN_TYPES = {'from_quantity': 'int', 'to_quantity': 'int', 'created_at': 'timestamp'}
+
+_INSERT_SQL = f"INSERT INTO {{table}} ({', '.join(LOG_COLUMNS)}) VALUES %s"
+
+# 지연 기록 시 참조 대상이 그 사이 삭제되었을 수 있으므로 FK 동작(SET NULL / CASCADE)을 직접 반영
+_FLUSH_SELECT = 'SELECT {columns}, b.created_at, b.created_at FROM {source} WHERE {where} ORDER BY {order}'.format(
+    columns=', '.join(
+        f'(SELECT c.id FROM containers c WHERE c.id = b.{column})'
+        if column in ('container_id', 'from_container_id', 'to_container_id') else f'b.{column}'
+        for column in LOG_COLUMNS
+    ),
+    source='{source}',
+    where=' AND '.join(
+        f'(b.{column} IS NULL OR EXISTS (SELECT 1 FROM houses h WHERE h.id = b.{column}))'
+        for column in ('from_house_id', 'to_house_id')
+    ),
+    order='{order}'
+)
+_FLUSH_INSERT = f"INSERT INTO container_logs ({', '.join(LOG_COLUMNS)}, created_at, updated_at) "
+
+# 여러 프로세스가 동시에 outbox를 옮기지 않도록 (순서 유지)
+_OUTBOX_LOCK_KEY = "hashtext('container_log_outbox')"
+
+_queue = None
+_writer_thread = None
+_start_lock = threading.Lock()
+_stop_event = threading.Event()
+
+# 기록 스레드가 큐에서 꺼냈지만 아직 기록하지 못한 행 (기록한 행은 바로 제거)
+_in_flight = []
+
+# 통계
+_written_count = 0
+_failed_flush_count = 0
+_last_flush_at = None
+
+
+def make_log(**fields):
+    """LOG_COLUMNS 순서의 이력 행 생성 (없는 컬럼은 None)"""
+    unknown = set(fields) - set(LOG_COLUMNS)
+    if unknown:
+        raise ValueError(f'알 수 없는 이력 컬럼: {", ".join(sorted(unknown))}')
+    return tuple(fields.get(column) for column in LOG_COLUMNS)
+
+
+def log_table():
+    """요청 트랜잭션 안에서 이력을 쓸 테이블 (SQL 안에서 직접 INSERT하는 경우용)"""
+    return 'container_log_outbox' if Config.CONTAINER_LOG_MODE == 'outbox' else 'container_logs'
+
+
+def write_logs(cur, rows):
+    """
+    이력 행 기록 (rows: make_log()로 만든 튜플 목록)
+
+    호출한 요청의 트랜잭션이 롤백되면 어느 모드에서든 이력도 남지 않습니다.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+
+    mode = Config.CONTAINER_LOG_MODE
+    if mode == 'queue':
+        # 이력 발생 시각은 다른 모드(CURRENT_TIMESTAMP)와 같이 DB의 트랜잭션 시작 시각을 사용
+        # (앱 서버 시계/시간대와 섞이면 컨테이너별 이력 순서, 커서, 월별 파티션이 어긋남)
+        cur.execute("SELECT LOCALTIMESTAMP AS created_at")
+        row = cur.fetchone()
+        created_at = row['created_at'] if isinstance(row, dict) else row[0]
+        queued = [row + (created_at,) for row in rows]
+        cur.connection.on_commit(lambda: _enqueue(queued))
+        return
+
+    execute_values(
+        cur,
+        _INSERT_SQL.format(table=log_table()),
+        rows,
+        page_size=Config.BULK_INSERT_PAGE_SIZE
+    )
+    if mode == 'outbox':
+        ensure_log_writer()
+
+
+# ============================================
+# 백그라운드 기록 (outbox / queue)
+# ============================================
+
+def _enqueue(rows):
+    ensure_log_writer()
+    for row in rows:
+        # 큐가 가득 차면 기록 스레드가 따라올 때까지 대기 (요청 쪽에 부하를 되돌림)
+        _queue.put(row)
+
+
+def ensure_log_writer():
+    """
+    백그라운드 기록 스레드 시작 (이미 실행 중이면 무시)
+
+    SQL 안에서 log_table()에 직접 INSERT한 경우에도 호출해야 outbox가 옮겨집니다.
+    """
+    global _queue, _writer_thread
+
+    if _writer_thread is not None and _writer_thread.is_alive():
+        return
+
+    with _start_lock:
+        if _queue is None:
+            _queue = queue.Queue(maxsize=Config.CONTAINER_LOG_QUEUE_MAX_SIZE)
+        # 종료 중에는 다시 시작하지 않음 (큐에 남은 행은 flush_pending이 기록)
+        if _stop_event.is_set():
+            return
+        if _writer_thread is not None and _writer_thread.is_alive():
+            return
+        _writer_thread = threading.Thread(target=_writer_loop, name='container-log-writer', daemon=True)
+        _writer_thread.start()
+
+
+def _writer_loop():
+    while not _stop_event.is_set():
+        try:
+            if Config.CONTAINER_LOG_MODE == 'queue':
+                _drain_queue(_in_flight)
+                _write_pending(_in_flight)
+            else:
+                _stop_event.wait(Config.CONTAINER_LOG_FLUSH_INTERVAL)
+                while not _stop_event.is_set() and flush_outbox() >= Config.CONTAINER_LOG_BATCH_SIZE:
+                    pass
+        except Exception as e:
+            # DB 장애 시 기록하지 못한 행은 버리지 않고 잠시 후 다시 시도
+            _record_failure(e)
+            _stop_event.wait(min(Config.CONTAINER_LOG_FLUSH_INTERVAL * 5, 30))
+
+
+def _drain_queue(pending):
+    """큐에서 최대 BATCH_SIZE개를 꺼냄 (첫 행 이후 FLUSH_INTERVAL 동안 더 모음)"""
+    if not pending:
+        # 종료 신호를 확인할 수 있도록 무한정 기다리지 않음
+        try:
+            pending.append(_queue.get(timeout=Config.CONTAINER_LOG_FLUSH_INTERVAL))
+        except queue.Empty:
+            return pending
+
+    deadline = time.monotonic() + Config.CONTAINER_LOG_FLUSH_INTERVAL
+    while len(pending) < Config.CONTAINER_LOG_BATCH_SIZE:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            pending.append(_queue.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return pending
+
+
+def _write_pending(pending):
+    """pending의 행을 기록 (기록했거나 건너뛴 행은 목록에서 제거, 실패 시 남은 행만 유지)"""
+    if not pending:
+        return
+
+    try:
+        _insert_rows(pending)
+        del pending[:]
+    except (psycopg2.IntegrityError, psycopg2.DataError):
+        # 잘못된 행 하나 때문에 배치 전체가 계속 실패하지 않도록 한 행씩 기록
+        while pending:
+            try:
+                _insert_rows(pending[:1])
+            except (psycopg2.IntegrityError, psycopg2.DataError) as e:
+                logger.error('컨테이너 이력 기록 불가 (건너뜀): %s %s', e, pending[0])
+            del pending[0]
+
+
+def _insert_rows(rows):
+    """큐에 모인 행을 한 번의 INSERT ... SELECT FROM (VALUES ...)로 기록"""
+    global _written_count, _last_flush_at
+
+    columns = LOG_COLUMNS + ('created_at', 'seq')
+    template = '(' + ', '.join(
+        f"%s::{_COLUMN_TYPES[column]}" if column in _COLUMN_TYPES else '%s'
+        for column in columns
+    ) + ')'
+    source = f"(VALUES %s) AS b({', '.join(columns)})"
+
+    with get_db() as conn:
+        cur = conn.cursor()
+        execute_values(
+            cur,
+            _FLUSH_INSERT + _FLUSH_SELECT.format(source=source, order='b.seq'),
+            [row + (seq,) for seq, row in enumerate(rows)],
+            template=template,
+            page_size=len(rows)
+        )
+        conn.commit()
+
+    _written_count += len(rows)
+    _last_flush_at = time.time()
+
+
+def flush_outbox(limit=None):
+    """
+    container_log_outbox의 행을 오래된 순서로 container_logs에 옮김 (옮긴 행 수 반환)
+
+    다른 프로세스가 옮기는 중이면 건너뜁니다 (0 반환).
+    """
+    global _written_count, _last_flush_at
+
+    limit = limit or Config.CONTAINER_LOG_BATCH_SIZE
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(f"SELECT pg_try_advisory_xact_lock({_OUTBOX_LOCK_KEY})")
+        if not cur.fetchone()[0]:
+            return 0
+
+        cur.execute(
+            f"""
+            WITH b AS (
+                DELETE FROM container_log_outbox
+                WHERE seq IN (SELECT seq FROM container_log_outbox ORDER BY seq LIMIT %s)
+                RETURNING *
+            ), moved AS (
+                {_FLUSH_INSERT}
+                {_FLUSH_SELECT.format(source='b', order='b.seq')}
+                RETURNING 1
+            )
+            SELECT (SELECT COUNT(*) FROM b)
+            """,
+            (limit,)
+        )
+        count = cur.fetchone()[0]
+        conn.commit()
+
+    if count:
+        _written_count += count
+        _last_flush_at = time.time()
+    return count
+
+
+def flush_pending(timeout=10.0):
+    """
+    종료 시 기록 스레드를 멈추고 남은 이력 기록 (queue 모드)
+
+    기록 스레드가 꺼내 두었던 행(_in_flight)과 큐에 남은 행을 모두 기록합니다.
+    outbox 모드는 남은 행이 DB에 있으므로 스레드만 멈춥니다.
+    """
+    _stop_event.set()
+    if _writer_thread is not None:
+        _writer_thread.join(timeout)
+        if _writer_thread.is_alive():
+            # 스레드가 아직 기록 중이면 같은 행을 두 번 기록하지 않도록 여기서는 건드리지 않음
+            logger.warning('컨테이너 이력 기록 스레드가 %s초 안에 끝나지 않아 남은 이력을 기록하지 못했습니다', timeout)
+            return
+
+    if _queue is None:
+        return
+
+    while True:
+        try:
+            _in_flight.append(_queue.get_nowait())
+        except queue.Empty:
+            break
+
+    while _in_flight:
+        batch = _in_flight[:Config.CONTAINER_LOG_BATCH_SIZE]
+        del _in_flight[:len(batch)]
+        try:
+            _write_pending(batch)
+        except Exception as e:
+            # 기록하지 못한 행은 되돌려 둠 (get_log_writer_stats의 in_flight로 확인)
+            _in_flight[:0] = batch
+            _record_failure(e)
+            return
+
+
+def _record_failure(e):
+    global _failed_flush_count
+    _failed_flush_count += 1
+    logger.warning('컨테이너 이력 기록 실패 (재시도 예정): %s', e)
+
+
+def get_log_writer_stats():
+    return {
+        'mode': Config.CONTAINER_LOG_MODE,
+        'queued': _queue.qsize() if _queue is not None else 0,
+        'in_flight': len(_in_flight),
+        'written': _written_count,
+        'failed_flushes': _failed_flush_count,
+        'last_flush_at': _last_flush_at,
+        'writer_running': _writer_thread is not None and _writer_thread.is_alive()
+    }
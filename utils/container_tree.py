@@ -0,0 +1,184 @@
+import base64
+from datetime import datetime, timedelta, timezone
+from database import get_db
+from config import Config
+from utils.codes import code_name
+
+# 집 전체 컨테이너 트리 동기화 (스냅샷 + 변경분)
+# - 스냅샷: 집의 모든 컨테이너를 컬럼별 배열로 인코딩 (부모는 배열 인덱스, 유형은 types 인덱스)
+# - 변경분: 토큰 이후 바뀐 컨테이너 + container_tombstones의 삭제/다른 집 이동 ID
+#
+# 토큰은 스냅샷 시점의 houses (version, changed_at)을 인코딩한 불투명 문자열입니다.
+# 컨테이너와 삭제 기록에는 트리거가 커밋될 집 버전(change_version)을 기록하고,
+# 집 행 잠금 아래에서 번호를 받으므로 오래 걸린 트랜잭션의 변경도 토큰 버전보다 큰 번호로 조회됩니다.
+# (버전을 읽은 뒤 커밋된 변경은 다음 조회에서 한 번 더 받을 수 있으며, 클라이언트가 덮어씀)
+
+
+def encode_tree_token(version, changed_at):
+    raw = f'{version}|{changed_at.isoformat()}'
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_tree_token(token):
+    """토큰 문자열을 (version, changed_at)으로 변환 (잘못된 토큰이면 ValueError)"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+        version, changed_at = raw.split('|', 1)
+        version, changed_at = int(version), datetime.fromisoformat(changed_at)
+    except Exception:
+        raise ValueError('잘못된 since 값입니다')
+    if changed_at.tzinfo is None:
+        raise ValueError('잘못된 since 값입니다')
+    return version, changed_at
+
+
+def _house_version(cur, house_id):
+    cur.execute("SELECT version, changed_at FROM houses WHERE id = %s", (house_id,))
+    return cur.fetchone()
+
+
+def _encode_types(type_codes):
+    return [{'cd': cd, 'nm': code_name(cd)} for cd in type_codes]
+
+
+def build_tree_snapshot(cur, house_id):
+    """
+    집 전체 트리 스냅샷 (cur: 일반 커서)
+
+    path 순으로 정렬하므로 부모가 항상 자식보다 앞에 옵니다 (parent_indexes는 -1이면 최상위).
+    """
+    # 버전을 먼저 읽어, 그 사이 커밋된 변경은 다음 변경분 조회에서 한 번 더 받도록 함
+    version, changed_at = _house_version(cur, house_id)
+
+    cur.execute(
+        """
+        SELECT id, up_container_id, type_cd, name, quantity
+        FROM containers
+        WHERE house_id = %s
+        ORDER BY path
+        """,
+        (house_id,)
+    )
+
+    positions = {}
+    type_codes = {}
+    ids, parent_indexes, type_indexes, names, quantities = [], [], [], [], []
+    for container_id, parent_id, type_cd, name, quantity in cur:
+        positions[container_id] = len(ids)
+        ids.append(container_id)
+        parent_indexes.append(positions.get(parent_id, -1))
+        type_indexes.append(type_codes.setdefault(type_cd, len(type_codes)))
+        names.append(name)
+        quantities.append(quantity)
+
+    return {
+        'version': version,
+        'token': encode_tree_token(version, changed_at),
+        'count': len(ids),
+        'types': _encode_types(type_codes),
+        'ids': ids,
+        'parent_indexes': parent_indexes,
+        'type_indexes': type_indexes,
+        'names': names,
+        'quantities': quantities
+    }
+
+
+def build_tree_changes(cur, house_id, since_version, since_changed_at):
+    """
+    토큰 이후 변경분 (cur: 일반 커서)
+
+    - changed: 생성/수정/이동된 컨테이너 (부모는 ID로 전달, path 순)
+    - removed: 삭제되었거나 다른 집으로 이동한 컨테이너 ID (하위 항목도 함께 제거)
+    - reset: True면 변경분 대신 스냅샷을 다시 받아야 함 (토큰이 오래되었거나 변경이 너무 많음)
+    """
+    version, changed_at = _house_version(cur, house_id)
+    token = encode_tree_token(version, changed_at)
+    result = {'version': version, 'token': token, 'reset': False}
+
+    if version == since_version:
+        result.update(_empty_changes())
+        return result
+
+    # 삭제 기록(container_tombstones) 보관 기간보다 오래된 토큰은 삭제분을 알 수 없음
+    # 현재 버전보다 큰 토큰은 다른 집의 토큰이거나 잘못된 토큰
+    oldest = datetime.now(timezone.utc) - timedelta(days=Config.TREE_SYNC_TOMBSTONE_DAYS)
+    if since_changed_at < oldest or since_version > version:
+        result['reset'] = True
+        return result
+
+    cur.execute(
+        """
+        SELECT id, up_container_id, type_cd, name, quantity
+        FROM containers
+        WHERE house_id = %s
+          AND change_version > %s
+        ORDER BY path
+        LIMIT %s
+        """,
+        (house_id, since_version, Config.TREE_SYNC_MAX_CHANGES + 1)
+    )
+    rows = cur.fetchall()
+    if len(rows) > Config.TREE_SYNC_MAX_CHANGES:
+        result['reset'] = True
+        return result
+
+    # 다시 이 집으로 돌아온 컨테이너는 제외
+    cur.execute(
+        """
+        SELECT DISTINCT t.container_id
+        FROM container_tombstones t
+        WHERE t.house_id = %s
+          AND t.change_version > %s
+          AND NOT EXISTS (
+              SELECT 1 FROM containers c
+              WHERE c.id = t.container_id AND c.house_id = t.house_id
+          )
+        """,
+        (house_id, since_version)
+    )
+    removed = [row[0] for row in cur.fetchall()]
+
+    type_codes = {}
+    changed = _empty_changes()['changed']
+    for container_id, parent_id, type_cd, name, quantity in rows:
+        changed['ids'].append(container_id)
+        changed['parent_ids'].append(parent_id)
+        changed['type_indexes'].append(type_codes.setdefault(type_cd, len(type_codes)))
+        changed['names'].append(name)
+        changed['quantities'].append(quantity)
+    changed['types'] = _encode_types(type_codes)
+
+    result.update({'changed': changed, 'removed': removed})
+    return result
+
+
+def _empty_changes():
+    return {
+        'changed': {
+            'types': [],
+            'ids': [],
+            'parent_ids': [],
+            'type_indexes': [],
+            'names': [],
+            'quantities': []
+        },
+        'removed': []
+    }
+
+
+def prune_tombstones(days=None):
+    """보관 기간이 지난 삭제 기록 정리 (삭제한 행 수 반환)"""
+    if days is None:
+        days = Config.TREE_SYNC_TOMBSTONE_DAYS
+
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "DELETE FROM container_tombstones WHERE removed_at < CURRENT_TIMESTAMP - %s * INTERVAL '1 day'",
+            (days,)
+        )
+        deleted_count = cur.rowcount
+        conn.commit()
+    return deleted_count
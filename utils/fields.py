@@ -0,0 +1,22 @@
+# 목록 응답 필드 선택 (?fields=id,name,type_nm)
+# 화면에 필요한 필드만 내려보내 응답 크기와 직렬화 시간을 줄입니다. id는 항상 포함됩니다.
+
+
+def parse_fields(args):
+    """fields 쿼리 파라미터를 필드 집합으로 변환 (없으면 None = 전체)"""
+    raw = args.get('fields')
+    if not raw:
+        return None
+
+    fields = {field.strip() for field in raw.split(',') if field.strip()}
+    if not fields:
+        return None
+    fields.add('id')
+    return fields
+
+
+def project(rows, fields):
+    """행 목록에서 선택한 필드만 남김 (fields가 None이면 그대로)"""
+    if fields is None:
+        return rows
+    return [{key: value for key, value in row.items() if key in fields} for row in rows]
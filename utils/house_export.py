@@ -0,0 +1,165 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from psycopg2.extras import RealDictCursor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from utils.codes import code_name
+from utils.user_names import resolve_user_names
+
+# 집 전체 내보내기 (서버 측 커서로 읽어 청크 단위로 직렬화)
+# 행 전체를 메모리에 올리지 않으므로 컨테이너 수와 무관하게 일정한 메모리를 사용합니다.
+
+PATH_SEPARATOR = ' > '
+
+CONTAINER_EXPORT_FIELDS = (
+    'id', 'up_container_id', 'type_cd', 'type_nm', 'name', 'full_path', 'depth',
+    'quantity', 'owner_user_id', 'owner_name', 'remk', 'created_at', 'updated_at'
+)
+
+
+def iter_house_containers(conn, house_id, fetch_size):
+    """
+    집의 컨테이너를 계층 순서(부모 다음에 자손)로 반환
+
+    path를 바이트 순서(COLLATE "C")로 정렬하면 조상이 항상 자손보다 먼저 나오고
+    한 서브트리가 연속으로 나오므로, 현재 조상 이름 스택(깊이만큼)만으로 전체 경로명을 만듭니다.
+    """
+    cur = conn.cursor(name='house_export_containers', cursor_factory=RealDictCursor)
+    cur.itersize = fetch_size
+    cur.execute(
+        """
+        SELECT
+            c.id,
+            c.up_container_id,
+            c.path,
+            c.type_cd,
+            c.name,
+            c.quantity,
+            c.owner_user_id,
+            c.remk,
+            c.created_at,
+            c.updated_at
+        FROM containers c
+        WHERE c.house_id = %s
+        ORDER BY c.path COLLATE "C"
+        """,
+        (house_id,)
+    )
+
+    # (path, name) 조상 스택
+    ancestors = []
+    # 소유자 이름 (소유자 수는 적으므로 처음 나온 ID만 같은 커넥션으로 조회)
+    owner_names = {}
+    names_cur = conn.cursor()
+    try:
+        for row in cur:
+            path = row.pop('path')
+            while ancestors and not path.startswith(ancestors[-1][0]):
+                ancestors.pop()
+
+            row['full_path'] = PATH_SEPARATOR.join([name for _, name in ancestors] + [row['name']])
+            row['depth'] = len(ancestors)
+            row['type_nm'] = code_name(row['type_cd'])
+            owner_user_id = row['owner_user_id']
+            if owner_user_id and owner_user_id not in owner_names:
+                owner_names[owner_user_id] = resolve_user_names([owner_user_id], cur=names_cur).get(owner_user_id)
+            row['owner_name'] = owner_names.get(owner_user_id)
+            ancestors.append((path, row['name']))
+            yield row
+    finally:
+        names_cur.close()
+        cur.close()
+
+
+def iter_house_logs(conn, house_id, fetch_size):
+    """집과 관련된(출발/도착) 컨테이너 히스토리를 오래된 순으로 반환"""
+    cur = conn.cursor(name='house_export_logs', cursor_factory=RealDictCursor)
+    cur.itersize = fetch_size
+    cur.execute(
+        """
+        SELECT
+            cl.id,
+            cl.container_id,
+            cl.container_name,
+            cl.container_type_cd,
+            cl.act_cd,
+            cl.from_container_id,
+            cl.to_container_id,
+            cl.from_house_id,
+            cl.to_house_id,
+            cl.from_owner_user_id,
+            cl.to_owner_user_id,
+            cl.from_quantity,
+            cl.to_quantity,
+            cl.from_remk,
+            cl.to_remk,
+            cl.log_remk,
+            cl.created_at,
+            cl.created_user
+        FROM container_logs cl
+        WHERE cl.from_house_id = %s OR cl.to_house_id = %s
+        ORDER BY cl.created_at, cl.id
+        """,
+        (house_id, house_id)
+    )
+
+    try:
+        for row in cur:
+            row['act_nm'] = code_name(row['act_cd'])
+            yield row
+    finally:
+        cur.close()
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _dumps_line(obj):
+    if orjson is not None:
+        # orjson은 datetime을 ISO 8601로 직접 직렬화
+        return orjson.dumps(obj, default=_json_default).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, default=_json_default)
+
+
+def jsonl_chunks(records, chunk_size):
+    """(record_type, row) 목록을 JSON Lines 청크로 직렬화"""
+    lines = []
+    for record_type, row in records:
+        lines.append(_dumps_line({'type': record_type, **row}))
+        if len(lines) >= chunk_size:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def csv_chunks(rows, fields, chunk_size):
+    """행 목록을 CSV 청크로 직렬화 (엑셀 호환을 위해 BOM 포함)"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction='ignore')
+
+    buffer.write('\ufeff')
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow({
+            key: value.isoformat() if isinstance(value, (datetime, date)) else value
+            for key, value in row.items()
+        })
+        count += 1
+        if count >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            count = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
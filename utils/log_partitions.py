@@ -0,0 +1,118 @@
+import gzip
+import os
+import re
+from datetime import date, timedelta
+from psycopg2 import sql
+from database import get_db
+from config import Config
+
+# container_logs 월별 파티션 관리
+# - 파티션 생성: 이번 달 ~ CONTAINER_LOG_PARTITION_MONTHS_AHEAD개월 뒤까지 미리 생성
+# - 일간 집계: 최근 CONTAINER_LOG_ROLLUP_DAYS일을 다시 집계 (늦게 기록된 이력 반영)
+# - 보관/아카이브: CONTAINER_LOG_RETENTION_MONTHS가 지난 파티션을 CSV.gz로 내보낸 뒤 분리/삭제
+
+PARTITION_NAME = re.compile(r'^container_logs_(\d{4})(\d{2})$')
+
+
+def _add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def ensure_partitions(months_ahead=None):
+    """앞으로 쓸 월별 파티션 생성 (새로 만든 파티션 수 반환)"""
+    if months_ahead is None:
+        months_ahead = Config.CONTAINER_LOG_PARTITION_MONTHS_AHEAD
+
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT ensure_container_log_partitions(%s)", (months_ahead,))
+        created_count = cur.fetchone()[0]
+        conn.commit()
+    return created_count
+
+
+def rollup(from_date, to_date):
+    """[from_date, to_date) 구간 집별 일간 집계 재계산 (집계 행 수 반환)"""
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT rollup_container_logs(%s, %s)", (from_date, to_date))
+        rolled_count = cur.fetchone()[0]
+        conn.commit()
+    return rolled_count
+
+
+def rollup_recent(days=None):
+    """최근 days일(오늘 제외) 재집계"""
+    if days is None:
+        days = Config.CONTAINER_LOG_ROLLUP_DAYS
+    today = date.today()
+    return rollup(today - timedelta(days=days), today)
+
+
+def list_partitions():
+    """[(파티션 이름, 시작 월)] 오래된 순 (default 파티션 제외)"""
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'container_logs'::regclass
+            """
+        )
+        names = [row[0] for row in cur.fetchall()]
+
+    partitions = []
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+def archive_partitions(retention_months=None, archive_dir=None):
+    """
+    보관 기간이 지난 파티션을 아카이브 (아카이브한 파티션 이름 목록 반환)
+
+    파티션마다: 일간 집계 확정 -> CSV.gz 파일로 내보내기 -> 분리(DETACH) 후 삭제
+    파일을 다 쓴 뒤에만 분리/삭제하므로 중간에 실패해도 이력은 DB에 남습니다.
+    """
+    if retention_months is None:
+        retention_months = Config.CONTAINER_LOG_RETENTION_MONTHS
+    if archive_dir is None:
+        archive_dir = Config.CONTAINER_LOG_ARCHIVE_DIR
+    if not retention_months:
+        return []
+
+    cutoff = _add_months(date.today().replace(day=1), -retention_months)
+    os.makedirs(archive_dir, exist_ok=True)
+
+    archived = []
+    for name, month in list_partitions():
+        month_end = _add_months(month, 1)
+        if month_end > cutoff:
+            break
+
+        # 분리 후에는 집계할 수 없으므로 먼저 확정
+        rollup(month, month_end)
+
+        path = os.path.join(archive_dir, f'{name}.csv.gz')
+        with get_db() as conn:
+            cur = conn.cursor()
+            tmp_path = path + '.tmp'
+            with gzip.open(tmp_path, 'wb') as f:
+                cur.copy_expert(
+                    sql.SQL("COPY {} TO STDOUT WITH (FORMAT csv, HEADER)").format(sql.Identifier(name)),
+                    f
+                )
+            os.replace(tmp_path, path)
+
+            cur.execute(sql.SQL("ALTER TABLE container_logs DETACH PARTITION {}").format(sql.Identifier(name)))
+            cur.execute(sql.SQL("DROP TABLE {}").format(sql.Identifier(name)))
+            conn.commit()
+
+        archived.append(name)
+
+    return archived
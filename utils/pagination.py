@@ -0,0 +1,40 @@
+import base64
+from datetime import datetime
+
+# 키셋(커서) 페이지네이션 헬퍼
+# 커서는 마지막 행의 (created_at, id)를 인코딩한 불투명 문자열
+
+
+def encode_cursor(created_at, row_id):
+    raw = f'{created_at.isoformat()}|{row_id}'
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """커서 문자열을 (created_at, id)로 변환 (잘못된 커서면 ValueError)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+        created_at, row_id = raw.split('|', 1)
+        return datetime.fromisoformat(created_at), row_id
+    except Exception:
+        raise ValueError('잘못된 cursor 값입니다')
+
+
+def paginate_logs(rows, limit):
+    """
+    limit + 1개로 조회한 로그 목록을 잘라 (rows, next_cursor) 반환
+
+    각 행의 cursor_created_at(원본 created_at)은 커서 생성에만 쓰고 응답에서 제거합니다.
+    """
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more and rows:
+        next_cursor = encode_cursor(rows[-1]['cursor_created_at'], rows[-1]['id'])
+
+    for row in rows:
+        row.pop('cursor_created_at', None)
+
+    return rows, next_cursor
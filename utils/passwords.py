@@ -0,0 +1,104 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+from config import Config
+
+# 비밀번호 해시/검증 전용 워커 풀
+# bcrypt는 해시 계산 중 GIL을 놓으므로 스레드 풀로 CPU 코어를 활용할 수 있습니다.
+# 동시 작업 수(실행 + 대기)를 제한하여, 로그인이 몰려도 다른 API 요청 스레드가 CPU를 잃지 않게 합니다.
+
+
+class PasswordHashBusyError(Exception):
+    """해시 작업 대기열이 가득 차 작업을 받을 수 없음 (429 응답용)"""
+    pass
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = None
+
+_stats_lock = threading.Lock()
+_stats = {
+    'in_flight': 0,
+    'completed': 0,
+    'rejected': 0,
+    'total_ms': 0.0,
+    'max_ms': 0.0,
+}
+
+
+def _get_executor():
+    global _executor, _slots
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _slots = threading.BoundedSemaphore(
+                    Config.PASSWORD_HASH_WORKERS + Config.PASSWORD_HASH_MAX_QUEUE
+                )
+                _executor = ThreadPoolExecutor(
+                    max_workers=Config.PASSWORD_HASH_WORKERS,
+                    thread_name_prefix='bcrypt'
+                )
+    return _executor
+
+
+def _run(fn, *args):
+    executor = _get_executor()
+
+    if not _slots.acquire(timeout=Config.PASSWORD_HASH_QUEUE_TIMEOUT):
+        with _stats_lock:
+            _stats['rejected'] += 1
+        raise PasswordHashBusyError('요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요')
+
+    started = time.monotonic()
+    with _stats_lock:
+        _stats['in_flight'] += 1
+    try:
+        return executor.submit(fn, *args).result()
+    finally:
+        _slots.release()
+        elapsed_ms = (time.monotonic() - started) * 1000
+        with _stats_lock:
+            _stats['in_flight'] -= 1
+            _stats['completed'] += 1
+            _stats['total_ms'] += elapsed_ms
+            _stats['max_ms'] = max(_stats['max_ms'], elapsed_ms)
+
+
+def hash_password(password):
+    """비밀번호 해시 (Config.BCRYPT_ROUNDS 비용)"""
+    return _run(
+        lambda: bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(Config.BCRYPT_ROUNDS)).decode('utf-8')
+    )
+
+
+def verify_password(password, hashed):
+    """비밀번호 검증"""
+    return _run(lambda: bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8')))
+
+
+def needs_rehash(hashed):
+    """저장된 해시의 비용이 현재 설정과 다른지 확인 ($2b$12$... 형식)"""
+    try:
+        return int(hashed.split('$')[2]) != Config.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+def get_password_pool_stats():
+    """해시 워커 풀 상태 (모니터링용)"""
+    with _stats_lock:
+        completed = _stats['completed']
+        in_flight = _stats['in_flight']
+        return {
+            'workers': Config.PASSWORD_HASH_WORKERS,
+            'max_queue': Config.PASSWORD_HASH_MAX_QUEUE,
+            'in_flight': in_flight,
+            'queued': max(in_flight - Config.PASSWORD_HASH_WORKERS, 0),
+            'completed': completed,
+            'rejected': _stats['rejected'],
+            'duration_ms_avg': round(_stats['total_ms'] / completed, 2) if completed else 0.0,
+            'duration_ms_max': round(_stats['max_ms'], 2),
+        }
@@ -0,0 +1,141 @@
+import time
+from config import Config
+from utils.container_logs import log_table, ensure_log_writer
+
+# 컨테이너 서브트리 이동
+# - 순환 검사: 새 부모의 path(조상 체인)에 이동 대상이 포함되는지 한 번의 조회로 확인
+# - 이동: 대상과 모든 자손의 house_id / path를 한 문장으로 갱신 (up_container_id는 대상만 변경)
+# - 로그: 대상 로그 + (집 간 이동 시) 자손별 이동 로그를 같은 문장에서 일괄 INSERT
+#         (outbox 모드면 container_log_outbox, 그 외에는 container_logs에 기록)
+
+ITEM_TYPE_CD = 'COM1200003'
+MOVE_ACT_CD = 'COM1300003'
+
+
+class SubtreeMoveError(Exception):
+    """이동할 수 없는 요청 (status_code로 응답 코드 전달)"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def move_subtree(cur, house_id, container_id, to_house_id, new_parent_id, user_id,
+                 log_remk=None, log_root=True):
+    """
+    컨테이너를 자손과 함께 이동 (커밋은 호출자가 수행)
+
+    - cur: RealDictCursor
+    - new_parent_id: None이면 to_house_id의 최상위로 이동
+    - log_root: False면 대상 컨테이너의 로그는 호출자가 직접 기록
+    반환: {'container', 'from_parent_id', 'moved_count', 'logged_count', 'elapsed_ms'}
+    """
+    started = time.monotonic()
+
+    # 대상과 새 부모를 잠근 뒤 최신 path로 검사 (동시 이동으로 순환이 생기는 것 방지)
+    ids = [container_id] if new_parent_id is None else [container_id, new_parent_id]
+    cur.execute(
+        """
+        SELECT id, house_id, up_container_id, type_cd, name, path
+        FROM containers
+        WHERE id = ANY(%s)
+        ORDER BY id
+        FOR UPDATE
+        """,
+        (ids,)
+    )
+    rows = {row['id']: row for row in cur.fetchall()}
+
+    container = rows.get(container_id)
+    if not container or container['house_id'] != house_id:
+        raise SubtreeMoveError('컨테이너를 찾을 수 없습니다', 404)
+
+    new_parent_path = '/'
+    if new_parent_id is not None:
+        parent = rows.get(new_parent_id)
+        if not parent or parent['house_id'] != to_house_id:
+            raise SubtreeMoveError('목적지 부모 컨테이너를 찾을 수 없습니다', 404)
+        # 물품은 물품 안에 들어갈 수 없음
+        if parent['type_cd'] == ITEM_TYPE_CD:
+            raise SubtreeMoveError('물품 안에는 다른 항목을 넣을 수 없습니다')
+        # 새 부모가 자기 자신이거나 자손이면 순환 참조
+        if parent['path'].startswith(container['path']):
+            raise SubtreeMoveError('자기 자신의 하위로 이동할 수 없습니다')
+        new_parent_path = parent['path']
+
+    old_path = container['path']
+    new_path = f'{new_parent_path}{container_id}/'
+    house_changed = to_house_id != house_id
+    log_descendants = house_changed and Config.MOVE_LOG_DESCENDANTS
+
+    if log_remk is None:
+        log_remk = f"{'같은 집 내' if not house_changed else '집 간'} 이동"
+
+    # 한 문장으로 서브트리 전체 이동 + 로그 일괄 기록
+    # (path 트리거는 up_container_id가 바뀐 대상 행에서만 동작)
+    cur.execute(
+        """
+        WITH moved AS (
+            UPDATE containers c
+            SET house_id = %(to_house_id)s,
+                up_container_id = CASE WHEN c.id = %(container_id)s
+                                       THEN %(new_parent_id)s
+                                       ELSE c.up_container_id END,
+                path = %(new_path)s || substr(c.path, length(%(old_path)s) + 1),
+                updated_at = CURRENT_TIMESTAMP,
+                updated_user = %(user_id)s
+            WHERE c.path LIKE %(old_path_pattern)s
+            RETURNING c.id, c.name, c.type_cd, c.up_container_id, c.updated_at
+        ),
+        logged AS (
+            INSERT INTO {log_table}
+            (container_id, container_name, container_type_cd, act_cd,
+             from_container_id, to_container_id, from_house_id, to_house_id,
+             log_remk, created_user, updated_user)
+            SELECT
+                m.id, m.name, m.type_cd, %(act_cd)s,
+                CASE WHEN m.id = %(container_id)s THEN %(from_parent_id)s ELSE m.up_container_id END,
+                m.up_container_id,
+                %(house_id)s, %(to_house_id)s,
+                CASE WHEN m.id = %(container_id)s THEN %(log_remk)s ELSE %(descendant_log_remk)s END,
+                %(user_id)s, %(user_id)s
+            FROM moved m
+            WHERE (m.id = %(container_id)s AND %(log_root)s)
+               OR (m.id <> %(container_id)s AND %(log_descendants)s)
+            RETURNING 1
+        )
+        SELECT
+            m.id, m.name, m.updated_at,
+            (SELECT COUNT(*) FROM moved) AS moved_count,
+            (SELECT COUNT(*) FROM logged) AS logged_count
+        FROM moved m
+        WHERE m.id = %(container_id)s
+        """.format(log_table=log_table()),
+        {
+            'house_id': house_id,
+            'to_house_id': to_house_id,
+            'container_id': container_id,
+            'new_parent_id': new_parent_id,
+            'from_parent_id': container['up_container_id'],
+            'new_path': new_path,
+            'old_path': old_path,
+            'old_path_pattern': old_path + '%',
+            'user_id': user_id,
+            'act_cd': MOVE_ACT_CD,
+            'log_remk': log_remk,
+            'descendant_log_remk': f"{container['name']}와(과) 함께 집 간 이동",
+            'log_root': log_root,
+            'log_descendants': log_descendants,
+        }
+    )
+    result = cur.fetchone()
+    if result['logged_count'] and Config.CONTAINER_LOG_MODE == 'outbox':
+        ensure_log_writer()
+
+    return {
+        'container': {'id': result['id'], 'name': result['name'], 'updated_at': result['updated_at']},
+        'from_parent_id': container['up_container_id'],
+        'moved_count': result['moved_count'],
+        'logged_count': result['logged_count'],
+        'elapsed_ms': round((time.monotonic() - started) * 1000, 2),
+    }
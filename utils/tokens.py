@@ -0,0 +1,104 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import jwt
+from config import Config
+
+# JWT 발급 / 검증
+# - 서명 키는 kid(키 ID)별로 관리하여, 새 키로 발급하면서 기존 키로 발급된 토큰도 계속 검증 (키 교체)
+# - 검증된 토큰은 만료 시각까지 LRU 캐시에 보관하여 매 요청 서명 검증을 생략
+#   (캐시 적중 시에도 서명한 키가 아직 JWT_SIGNING_KEYS에 그대로 있는지 확인하므로 키를 폐기하면 즉시 거부)
+
+ACCESS_TOKEN_TYPE = 'access'
+REFRESH_TOKEN_TYPE = 'refresh'
+
+# sha256(토큰) -> (user_id, exp, kid, 서명 키)
+_verified_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _token_kid(token):
+    # kid가 없는 토큰(키 교체 기능 이전 발급)은 default 키로 검증
+    return jwt.get_unverified_header(token).get('kid') or 'default'
+
+
+def _signing_key(kid):
+    key = Config.JWT_SIGNING_KEYS.get(kid)
+    if key is None:
+        raise jwt.InvalidTokenError('알 수 없는 서명 키입니다')
+    return key
+
+
+def _encode(user_id, token_type, expires_in):
+    kid = Config.JWT_ACTIVE_KID
+    return jwt.encode(
+        {
+            'user_id': user_id,
+            'typ': token_type,
+            'exp': datetime.utcnow() + timedelta(seconds=expires_in)
+        },
+        _signing_key(kid),
+        algorithm='HS256',
+        headers={'kid': kid}
+    )
+
+
+def issue_tokens(user_id):
+    """로그인 응답용 토큰 발급 ({'token': ...} + 설정 시 refresh_token)"""
+    tokens = {'token': _encode(user_id, ACCESS_TOKEN_TYPE, Config.JWT_ACCESS_TOKEN_EXPIRES)}
+    if Config.JWT_REFRESH_TOKEN_ENABLED:
+        tokens['refresh_token'] = _encode(user_id, REFRESH_TOKEN_TYPE, Config.JWT_REFRESH_TOKEN_EXPIRES)
+    return tokens
+
+
+def _decode(token, token_type):
+    data = jwt.decode(token, _signing_key(_token_kid(token)), algorithms=['HS256'])
+
+    # typ이 없는 토큰은 기존 발급 방식의 access 토큰
+    if data.get('typ', ACCESS_TOKEN_TYPE) != token_type:
+        raise jwt.InvalidTokenError('토큰 종류가 올바르지 않습니다')
+    return data
+
+
+def verify_access_token(token):
+    """
+    access 토큰 검증 후 user_id 반환
+
+    만료 시 jwt.ExpiredSignatureError, 그 외 오류 시 jwt.InvalidTokenError
+    """
+    cache_key = hashlib.sha256(token.encode('utf-8')).digest()
+    now = time.time()
+
+    if Config.JWT_CACHE_MAX_SIZE > 0:
+        with _cache_lock:
+            cached = _verified_cache.get(cache_key)
+            if cached:
+                user_id, exp, kid, key = cached
+                if Config.JWT_SIGNING_KEYS.get(kid) != key:
+                    # 서명 키가 폐기/교체됨 -> 아래에서 다시 검증 (거부됨)
+                    del _verified_cache[cache_key]
+                elif exp > now:
+                    _verified_cache.move_to_end(cache_key)
+                    return user_id
+                else:
+                    del _verified_cache[cache_key]
+                    raise jwt.ExpiredSignatureError('Signature has expired')
+
+    data = _decode(token, ACCESS_TOKEN_TYPE)
+    user_id = data['user_id']
+
+    if Config.JWT_CACHE_MAX_SIZE > 0 and 'exp' in data:
+        kid = _token_kid(token)
+        with _cache_lock:
+            _verified_cache[cache_key] = (user_id, data['exp'], kid, Config.JWT_SIGNING_KEYS.get(kid))
+            while len(_verified_cache) > Config.JWT_CACHE_MAX_SIZE:
+                _verified_cache.popitem(last=False)
+
+    return user_id
+
+
+def verify_refresh_token(token):
+    """refresh 토큰 검증 후 user_id 반환 (재발급 시에만 쓰므로 캐시하지 않음)"""
+    return _decode(token, REFRESH_TOKEN_TYPE)['user_id']
@@ -0,0 +1,122 @@
+import threading
+import time
+from collections import OrderedDict
+from database import get_db
+from config import Config
+
+# 사용자 표시 이름 조회
+# 조회 응답의 owner_name / creator_name 등을 users JOIN 대신 채웁니다.
+# 이름은 자주 바뀌지 않으므로 프로세스 메모리에 TTL 캐시로 두고,
+# 캐시에 없는 ID만 모아 한 번의 쿼리(id = ANY)로 조회합니다.
+# 이름 변경은 USER_NAME_CACHE_TTL 이내에 반영되고, ETag 조회에서는 DB의 이름 변경 버전
+# (dictionary_versions 'users.name')이 바뀌면 캐시를 비워 바로 반영됩니다.
+
+_cache = OrderedDict()  # user_id -> (name, expires_at)
+_cache_lock = threading.Lock()
+_source_version = None  # 캐시를 비운 시점의 이름 변경 버전
+_generation = 0         # 캐시를 비울 때마다 증가 (비우기 전에 조회한 이름은 저장하지 않음)
+
+# 이력(container_logs) 응답의 사용자 이름 필드
+LOG_USER_NAME_FIELDS = {
+    'from_owner_user_id': 'from_owner_name',
+    'to_owner_user_id': 'to_owner_name',
+    'created_user': 'creator_name'
+}
+
+
+def resolve_user_names(user_ids, cur=None):
+    """
+    사용자 ID 목록 -> {user_id: name} (없는 사용자는 결과에서 제외)
+
+    cur: 이미 커넥션을 사용 중이면 그 커서로 조회 (풀에서 커넥션을 하나 더 빌리지 않도록)
+    """
+    user_ids = {user_id for user_id in user_ids if user_id}
+    if not user_ids:
+        return {}
+
+    names = {}
+    missing = []
+    now = time.monotonic()
+
+    with _cache_lock:
+        generation = _generation
+        for user_id in user_ids:
+            cached = _cache.get(user_id)
+            if cached and cached[1] > now:
+                _cache.move_to_end(user_id)
+                if cached[0] is not None:
+                    names[user_id] = cached[0]
+            else:
+                missing.append(user_id)
+
+    if missing:
+        fetched = _fetch_names(missing, cur)
+        names.update(fetched)
+        _store({user_id: fetched.get(user_id) for user_id in missing}, generation)
+
+    return names
+
+
+def _fetch_names(user_ids, cur=None):
+    sql = "SELECT id, name FROM users WHERE id = ANY(%s)"
+    if cur is not None:
+        cur.execute(sql, (user_ids,))
+        rows = cur.fetchall()
+    else:
+        with get_db() as conn:
+            own_cur = conn.cursor()
+            own_cur.execute(sql, (user_ids,))
+            rows = own_cur.fetchall()
+
+    # 일반 커서(튜플)와 RealDictCursor 모두 지원
+    return dict((row['id'], row['name']) if isinstance(row, dict) else row for row in rows)
+
+
+def _store(names, generation):
+    if Config.USER_NAME_CACHE_TTL <= 0:
+        return
+
+    expires_at = time.monotonic() + Config.USER_NAME_CACHE_TTL
+    with _cache_lock:
+        if generation != _generation:
+            return
+        for user_id, name in names.items():
+            # 없는 사용자(None)도 캐시해서 같은 ID를 반복 조회하지 않음
+            _cache[user_id] = (name, expires_at)
+            _cache.move_to_end(user_id)
+        while len(_cache) > Config.USER_NAME_CACHE_MAX_SIZE:
+            _cache.popitem(last=False)
+
+
+def sync_user_name_version(source_version):
+    """DB의 이름 변경 버전이 마지막으로 본 버전과 다르면 캐시를 비움 (ETag에 넣은 버전과 응답의 이름을 맞춤)"""
+    global _source_version, _generation
+
+    if source_version == _source_version:
+        return
+    with _cache_lock:
+        if source_version != _source_version:
+            _cache.clear()
+            _generation += 1
+            _source_version = source_version
+
+
+def attach_user_names(rows, fields, cur=None):
+    """
+    행(딕셔너리 또는 목록)에 사용자 이름 필드 추가 (여러 필드의 ID를 모아 한 번에 조회)
+
+    fields: {사용자 ID 컬럼: 이름 컬럼} 예) {'owner_user_id': 'owner_name'}
+    """
+    if rows is None:
+        return rows
+
+    row_list = [rows] if isinstance(rows, dict) else rows
+    names = resolve_user_names(
+        (row.get(id_field) for row in row_list for id_field in fields),
+        cur=cur
+    )
+    for row in row_list:
+        for id_field, name_field in fields.items():
+            row[name_field] = names.get(row.get(id_field))
+    return rows
+
@@ -0,0 +1,2 @@
+# WSGI 진입점 (gunicorn -c gunicorn.conf.py wsgi:app)
+from App import app